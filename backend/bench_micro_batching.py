@@ -0,0 +1,64 @@
+import os
+import sys
+import django
+
+# Setup Django environment
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.test.utils import override_settings
+from ml_service.registry import registry
+from ml_service.predict import predict_job, micro_batcher
+from bench_predict_latency import sample_profiles
+
+# predict_job throughput against the number of concurrent request threads,
+# with and without micro-batching. The prediction cache is disabled and every
+# request uses a distinct profile, so each one really runs the model.
+
+
+def run(concurrency, requests_per_thread, profiles):
+    def client(offset):
+        for i in range(requests_per_thread):
+            result = predict_job(profiles[(offset * requests_per_thread + i) % len(profiles)])
+            if 'error' in result:
+                raise RuntimeError(result['error'])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return concurrency * requests_per_thread / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="predict_job throughput vs concurrency, with and without micro-batching")
+    parser.add_argument('--concurrency', default='1,2,4,8,16,32')
+    parser.add_argument('--requests', type=int, default=20, help="requests per thread")
+    parser.add_argument('--window-ms', type=float, default=5)
+    parser.add_argument('--max-rows', type=int, default=64)
+    args = parser.parse_args()
+
+    if registry.get() is None:
+        print(f"No model at {registry.model_path}. Run ml_service/train.py first.")
+        return
+    levels = [int(level) for level in args.concurrency.split(',')]
+    profiles = sample_profiles(max(levels) * args.requests, seed=7)
+
+    print(f"window {args.window_ms} ms, max {args.max_rows} rows, {args.requests} requests per thread")
+    print(f"{'threads':>7s} {'direct req/s':>13s} {'batched req/s':>14s} {'speedup':>8s}")
+    for level in levels:
+        with override_settings(ML_PREDICTION_CACHE_SIZE=0, ML_MICRO_BATCHING=False):
+            direct = run(level, args.requests, profiles)
+        with override_settings(ML_PREDICTION_CACHE_SIZE=0, ML_MICRO_BATCHING=True,
+                               ML_BATCH_WINDOW_MS=args.window_ms, ML_BATCH_MAX_ROWS=args.max_rows):
+            batched = run(level, args.requests, profiles)
+        print(f"{level:7d} {direct:13.1f} {batched:14.1f} {batched / direct:7.2f}x")
+    print(f"batcher: {micro_batcher.stats()}")
+
+
+if __name__ == '__main__':
+    main()
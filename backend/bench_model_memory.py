@@ -0,0 +1,92 @@
+import os
+import sys
+import django
+
+# Setup Django environment
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+import argparse
+import json
+from django.test.utils import override_settings
+from ml_service.registry import registry
+from ml_service.predict import predict_job
+
+# Measures resident memory per gunicorn-style worker for the job predictor.
+# Linux only: reads /proc/self/smaps_rollup.
+#
+#   lazy     - every forked worker loads the model itself, no mmap (old behaviour)
+#   preload  - the parent loads with mmap_mode='r' before forking (gunicorn.conf.py)
+#
+# Pss splits shared pages between the processes that map them, so it is the
+# number that shows what a worker really costs.
+
+SAMPLE_PROFILE = {
+    'degree': 'B.Tech',
+    'specialization': 'Computer Science',
+    'skills': 'Python, Django, SQL, Docker',
+    'certifications': 'AWS Certified Developer'
+}
+
+
+def memory_usage():
+    usage = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('Rss', 'Pss', 'Private_Dirty'):
+                usage[key] = int(value.split()[0]) // 1024
+    return usage
+
+
+def run_workers(workers, preload):
+    if preload:
+        registry.get()
+
+    pipes = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            # Warm the worker the way a real request does
+            predict_job(SAMPLE_PROFILE)
+            with os.fdopen(write_fd, 'w') as out:
+                out.write(json.dumps(memory_usage()))
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append((pid, read_fd))
+
+    # Read every report before reaping, so all workers are alive (and sharing) while they measure
+    reports = []
+    for pid, read_fd in pipes:
+        with os.fdopen(read_fd) as f:
+            reports.append(json.loads(f.read()))
+    for pid, _ in pipes:
+        os.waitpid(pid, 0)
+    registry.reset()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident memory per worker for the job predictor")
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    if not os.path.exists(registry.model_path):
+        print(f"No model at {registry.model_path}. Run ml_service/train.py first.")
+        return
+
+    print(f"Model: {registry.model_path} ({os.path.getsize(registry.model_path) / 1e6:.1f} MB), {args.workers} workers")
+    scenarios = [('lazy', False, None), ('preload', True, 'r')]
+    for name, preload, mmap_mode in scenarios:
+        with override_settings(ML_MODEL_MMAP_MODE=mmap_mode):
+            reports = run_workers(args.workers, preload)
+        avg = {key: sum(r[key] for r in reports) / len(reports) for key in reports[0]}
+        print(f"{name:8s} per worker: Rss {avg['Rss']:.0f} MB, Pss {avg['Pss']:.0f} MB, Private_Dirty {avg['Private_Dirty']:.0f} MB "
+              f"| total Pss {sum(r['Pss'] for r in reports)} MB")
+
+
+if __name__ == '__main__':
+    main()
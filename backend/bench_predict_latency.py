@@ -0,0 +1,131 @@
+import os
+import sys
+import django
+
+# Setup Django environment
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+import argparse
+import random
+import time
+import numpy as np
+import pandas as pd
+from ml_service.registry import registry
+from ml_service.forest import CompiledForest, FOREST_FILENAME
+from ml_service.predict import ROLE_SKILLS_MAPPING, _input_row
+
+# Single-row inference latency of the job predictor, per inference path.
+# Every path is checked against the sklearn pipeline before it is timed.
+# Also compares the pickled forest with its array-backed export, in size and
+# in whole-batch predict_proba time.
+
+DEGREES = ['B.Tech', 'M.Tech', 'B.Sc', 'BCA', 'MCA', 'B.E', 'M.Sc']
+SPECIALIZATIONS = ['Computer Science', 'Information Technology', 'Electronics', 'Data Science', 'Design']
+
+
+def sample_profiles(count, seed=42):
+    rng = random.Random(seed)
+    skill_pool = sorted({skill for skills in ROLE_SKILLS_MAPPING.values() for skill in skills})
+    return [{
+        'degree': rng.choice(DEGREES),
+        'specialization': rng.choice(SPECIALIZATIONS),
+        'skills': ", ".join(rng.sample(skill_pool, rng.randint(2, 8))),
+        'certifications': rng.choice(['', 'AWS Certified Developer', 'Google Data Analytics'])
+    } for _ in range(count)]
+
+
+def time_per_call(func, profiles, repeat):
+    timings = []
+    for _ in range(repeat):
+        for profile in profiles:
+            start = time.perf_counter()
+            func(profile)
+            timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+    return np.percentile(timings, 50), np.percentile(timings, 99), timings.mean()
+
+
+def inference_paths(loaded):
+    pipeline = loaded.pipeline
+
+    def sklearn_pipeline(profile):
+        return pipeline.predict_proba(pd.DataFrame([_input_row(profile)]))[0]
+    paths = [('sklearn pipeline (pandas)', sklearn_pipeline)]
+
+    if loaded.features is not None:
+        features, classifier = loaded.features, loaded.classifier
+
+        def compiled_features(profile):
+            return classifier.predict_proba(features.transform([profile]))[0]
+        paths.append(('compiled features', compiled_features))
+
+        forest = compiled_forest(loaded)
+        if forest is not None:
+            def compiled_engine(profile):
+                return forest.predict_proba(features.transform([profile]))[0]
+            paths.append(('compiled features + forest', compiled_engine))
+    return paths
+
+
+def compiled_forest(loaded):
+    # Loaded by the registry only with ML_INFERENCE_ENGINE='compiled'
+    if loaded.forest is not None:
+        return loaded.forest
+    if loaded.classifier is None:
+        return None
+    return CompiledForest.from_classifier(loaded.classifier, loaded.version)
+
+
+def file_size_mb(path):
+    return os.path.getsize(path) / 1e6 if os.path.exists(path) else float('nan')
+
+
+def compare_forest(loaded, profiles, repeat):
+    forest = compiled_forest(loaded)
+    if forest is None or loaded.features is None:
+        return
+    classifier = loaded.classifier
+    print(f"\nForest: {len(forest.roots)} trees, {forest.n_nodes} nodes")
+    print(f"  pickle {file_size_mb(loaded.path):.1f} MB on disk, "
+          f"exported arrays {forest.nbytes / 1e6:.1f} MB "
+          f"({file_size_mb(os.path.join(loaded.artifact_dir, FOREST_FILENAME)):.1f} MB on disk)")
+
+    X = loaded.features.transform(profiles)
+    print(f"  batch of {len(profiles)}, best of {repeat}:")
+    for name, engine in (('sklearn', classifier), ('compiled', forest)):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            engine.predict_proba(X)
+            timings.append(time.perf_counter() - start)
+        print(f"    {name:10s} {min(timings) * 1000:9.1f} ms")
+    print(f"    identical  {np.array_equal(classifier.predict_proba(X), forest.predict_proba(X))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-row latency of the job predictor inference paths")
+    parser.add_argument('--profiles', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    loaded = registry.get()
+    if loaded is None:
+        print(f"No model at {registry.model_path}. Run ml_service/train.py first.")
+        return
+    profiles = sample_profiles(args.profiles)
+    paths = inference_paths(loaded)
+
+    reference = [paths[0][1](profile) for profile in profiles]
+    print(f"Model version {loaded.version}, {args.profiles} profiles x {args.repeat}")
+    print(f"{'path':28s} {'p50 ms':>8s} {'p99 ms':>8s} {'mean ms':>8s}  identical")
+    for name, func in paths:
+        identical = all(np.array_equal(func(profile), expected) for profile, expected in zip(profiles, reference))
+        p50, p99, mean = time_per_call(func, profiles, args.repeat)
+        print(f"{name:28s} {p50:8.3f} {p99:8.3f} {mean:8.3f}  {identical}")
+    compare_forest(loaded, profiles, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import django
+
+# Setup Django environment
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+import argparse
+import threading
+import time
+import numpy as np
+from django.db import connection
+from django.test.utils import override_settings
+from ml_service.registry import registry
+from ml_service.predict import predict_job
+from ml_service.jobs import start_training_job
+from users.models import TrainingJob
+from bench_predict_latency import sample_profiles
+
+# Prediction latency in a web worker while a full retrain runs, per
+# ML_TRAINING_EXECUTOR: 'thread' fits inside this process, 'subprocess' in a
+# niced `manage.py train_worker`. Requests arrive at a fixed rate and are timed
+# from when they were due, so time spent waiting for the CPU or the GIL counts.
+# The prediction cache is disabled so each request runs the model.
+
+
+def measure(profiles, rate, until):
+    latencies = []
+    interval = 1.0 / rate
+    due = time.perf_counter()
+    i = 0
+    with override_settings(ML_PREDICTION_CACHE_SIZE=0, ML_MICRO_BATCHING=False):
+        while not until():
+            now = time.perf_counter()
+            if now < due:
+                time.sleep(due - now)
+            result = predict_job(profiles[i % len(profiles)])
+            if 'error' in result:
+                raise RuntimeError(result['error'])
+            latencies.append(time.perf_counter() - due)
+            due += interval
+            i += 1
+    return np.array(latencies) * 1000
+
+
+def summary(label, latencies, seconds):
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{label:>22s} {len(latencies):8d} {p50:9.2f} {p99:9.2f} {latencies.max():9.2f} {seconds:8.1f}")
+
+
+def during_retrain(executor, profiles, rate):
+    with override_settings(ML_TRAINING_EXECUTOR=executor):
+        job, created = start_training_job('full')
+    if not created:
+        raise RuntimeError(f"Training job {job.job_id} is already running")
+    start = time.perf_counter()
+    done = threading.Event()
+
+    def watch():
+        try:
+            while not TrainingJob.objects.filter(pk=job.job_id, active=None).exists():
+                time.sleep(0.2)
+        finally:
+            connection.close()
+            done.set()
+    threading.Thread(target=watch, daemon=True).start()
+    latencies = measure(profiles, rate, done.is_set)
+    job.refresh_from_db()
+    if job.status != 'done':
+        raise RuntimeError(f"Training job {job.job_id} ended {job.status}: {job.message}")
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="prediction latency during a retrain, per training executor")
+    parser.add_argument('--rate', type=float, default=50, help="requests per second")
+    parser.add_argument('--idle-seconds', type=float, default=10)
+    parser.add_argument('--executors', default='thread,subprocess')
+    args = parser.parse_args()
+
+    if registry.get() is None:
+        print(f"No model at {registry.model_path}. Run ml_service/train.py first.")
+        return
+    profiles = sample_profiles(2000, seed=7)
+    print(f"{args.rate:.0f} req/s, {os.cpu_count()} cores, train_worker nice {django.conf.settings.ML_TRAINING_NICE}")
+    print(f"{'':>22s} {'requests':>8s} {'p50 ms':>9s} {'p99 ms':>9s} {'max ms':>9s} {'seconds':>8s}")
+    end = time.perf_counter() + args.idle_seconds
+    summary('idle', measure(profiles, args.rate, lambda: time.perf_counter() > end), args.idle_seconds)
+    for executor in args.executors.split(','):
+        latencies, seconds = during_retrain(executor, profiles, args.rate)
+        summary(f"retrain ({executor})", latencies, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import django
+
+# Setup Django environment
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+import argparse
+import json
+import resource
+import time
+import pandas as pd
+from django.db import connections
+from users.models import TrainingData
+from ml_service.dataset import TRAINING_COLUMNS, load_training_frame, concat_training_frames
+
+# Peak RSS of assembling the training DataFrame from TrainingData, per loader,
+# each in a freshly forked process. Linux only (ru_maxrss in KB).
+#
+#   values   - .values() into a list of dicts, then a DataFrame (old train_model)
+#   stream   - keyset chunks into categorical columns (ml_service/dataset.py)
+#
+# With --encode the fitted ColumnTransformer is applied too, to compare peak
+# memory with the size of the sparse matrix the classifier is trained on.
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def assemble(loader, chunk_size):
+    if loader == 'values':
+        df = pd.DataFrame(list(TrainingData.objects.all().values(*TRAINING_COLUMNS)))
+        df['text_features'] = df['skills'] + " " + df['certifications']
+        return df
+    return concat_training_frames([load_training_frame(chunk_size)])
+
+
+def encode(df):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import OneHotEncoder
+    preprocessor = ColumnTransformer(transformers=[
+        ('cat', OneHotEncoder(handle_unknown='ignore'), ['degree', 'specialization']),
+        ('text', TfidfVectorizer(stop_words='english', max_features=1000), 'text_features')
+    ])
+    X = preprocessor.fit_transform(df[['degree', 'specialization', 'text_features']])
+    return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1e6
+
+
+def measure(loader, chunk_size, with_encode):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    df = assemble(loader, chunk_size)
+    result = {
+        'rows': len(df),
+        'seconds': round(time.perf_counter() - start, 1),
+        'baseline_mb': round(baseline),
+        'peak_mb': round(peak_rss_mb()),
+        'frame_mb': round(df.memory_usage(deep=True).sum() / 1e6),
+    }
+    if with_encode:
+        result['matrix_mb'] = round(encode(df))
+        result['peak_with_encode_mb'] = round(peak_rss_mb())
+    return result
+
+
+def run_forked(loader, chunk_size, with_encode):
+    # Each loader gets its own process so ru_maxrss is not shared between them
+    connections.close_all()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        with os.fdopen(write_fd, 'w') as out:
+            out.write(json.dumps(measure(loader, chunk_size, with_encode)))
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        result = json.loads(f.read())
+    os.waitpid(pid, 0)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of training data assembly per loader")
+    parser.add_argument('--loaders', default='values,stream')
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument('--encode', action='store_true', help="also fit the feature preprocessor")
+    args = parser.parse_args()
+
+    print(f"TrainingData rows: {TrainingData.objects.count()}")
+    for loader in args.loaders.split(','):
+        print(f"{loader:8s} {run_forked(loader, args.chunk_size, args.encode)}")
+
+
+if __name__ == '__main__':
+    main()
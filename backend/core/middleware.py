@@ -1,3 +1,7 @@
+from django.conf import settings
+from ml_service.timing import collect_request_spans, server_timing_header
+
+
 class COOPMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -6,3 +10,22 @@ class COOPMiddleware:
         response = self.get_response(request)
         response['Cross-Origin-Opener-Policy'] = 'unsafe-none'
         return response
+
+
+class ServerTimingMiddleware:
+    """
+    With ML_SERVER_TIMING on, reports the prediction stages timed during the
+    request (see ml_service/timing.py) in a Server-Timing header, which
+    browser dev tools show next to the request.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.ML_SERVER_TIMING:
+            return self.get_response(request)
+        with collect_request_spans() as spans:
+            response = self.get_response(request)
+        if spans:
+            response['Server-Timing'] = server_timing_header(spans)
+        return response
@@ -53,6 +53,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'core.middleware.COOPMiddleware',
+    'core.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -92,6 +93,11 @@ database_url = os.getenv('DATABASE_URL')
 if database_url:
     DATABASES['default'] = dj_database_url.config(default=database_url, conn_max_age=600)
 
+# Tests build their schema from the models, unmanaged ones included: the
+# hand-written SQL in migration 0018 only applies to the original database
+DATABASES['default']['TEST'] = {'MIGRATE': False}
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -116,6 +122,75 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# --- ML SERVICE ---
+
+# Where train_model publishes the job predictor and workers load it from
+ML_MODEL_DIR = os.getenv('ML_MODEL_DIR', os.path.join(BASE_DIR, 'ml_models'))
+# TrainingData rows fetched per query when train_model streams the table
+ML_TRAINING_CHUNK_SIZE = int(os.getenv('ML_TRAINING_CHUNK_SIZE', '20000'))
+# A snapshot written by `manage.py export_training_snapshot`: when set, full
+# trainings read TrainingData from this file instead of the table
+ML_TRAINING_SNAPSHOT = os.getenv('ML_TRAINING_SNAPSHOT', '')
+# TrainingData as train_model encodes it, kept between trainings so only new
+# rows are tokenized (ml_service/feature_cache.py); empty disables it
+ML_FEATURE_CACHE_DIR = os.getenv('ML_FEATURE_CACHE_DIR', os.path.join(ML_MODEL_DIR, 'feature_cache'))
+# A training job or upload whose worker sent no heartbeat for this many seconds
+# is failed and stops blocking new ones; heartbeats are sent every ..._HEARTBEAT
+ML_TRAINING_JOB_LEASE = int(os.getenv('ML_TRAINING_JOB_LEASE', '120'))
+ML_TRAINING_JOB_HEARTBEAT = int(os.getenv('ML_TRAINING_JOB_HEARTBEAT', '10'))
+# Where retrain jobs run: 'subprocess' starts `manage.py train_worker --once`
+# per job, 'worker' leaves them to a long-running `manage.py train_worker`,
+# 'thread' fits inside the web worker that received the request
+ML_TRAINING_EXECUTOR = os.getenv('ML_TRAINING_EXECUTOR', 'subprocess')
+# Cores train_worker gives the forest fit (-1: all of them)
+ML_TRAINING_N_JOBS = int(os.getenv('ML_TRAINING_N_JOBS', '-1'))
+# Niceness train_worker runs at, so web workers win when both want the CPU
+ML_TRAINING_NICE = int(os.getenv('ML_TRAINING_NICE', '10'))
+# Training data CSV uploads larger than this are ingested by a background
+# worker (see ML_TRAINING_EXECUTOR) from a copy kept in ML_UPLOAD_DIR
+ML_UPLOAD_SYNC_MAX_BYTES = int(os.getenv('ML_UPLOAD_SYNC_MAX_BYTES', str(1024 * 1024)))
+ML_UPLOAD_DIR = os.getenv('ML_UPLOAD_DIR', os.path.join(MEDIA_ROOT, 'training_uploads'))
+# CSV rows validated and inserted per transaction
+ML_UPLOAD_CHUNK_ROWS = int(os.getenv('ML_UPLOAD_CHUNK_ROWS', '20000'))
+# Rejected rows reported individually per upload (all are counted)
+ML_UPLOAD_MAX_REJECTS = int(os.getenv('ML_UPLOAD_MAX_REJECTS', '1000'))
+# Trained versions kept under ML_MODEL_DIR/versions/ for rollback
+ML_MODEL_KEEP_VERSIONS = int(os.getenv('ML_MODEL_KEEP_VERSIONS', '10'))
+# Seconds between checks for a newly published model in each worker
+ML_MODEL_CHECK_INTERVAL = float(os.getenv('ML_MODEL_CHECK_INTERVAL', '5'))
+# joblib mmap_mode for model arrays ('r' shares them across workers, '' disables)
+ML_MODEL_MMAP_MODE = os.getenv('ML_MODEL_MMAP_MODE', 'r') or None
+# Load the model in the gunicorn master before forking (see gunicorn.conf.py)
+ML_PRELOAD_MODEL = os.getenv('ML_PRELOAD_MODEL', 'True') == 'True'
+# Skip pandas/ColumnTransformer at inference with the compiled feature extractor
+ML_FAST_FEATURES = os.getenv('ML_FAST_FEATURES', 'True') == 'True'
+# Classifier engine behind the compiled features: 'sklearn' or 'compiled'
+# (the forest flattened into node arrays: same probabilities, faster for single
+# requests and micro-batches, see ml_service/forest.py)
+ML_INFERENCE_ENGINE = os.getenv('ML_INFERENCE_ENGINE', 'sklearn')
+# LRU prediction cache entries per worker (0 disables the cache)
+ML_PREDICTION_CACHE_SIZE = int(os.getenv('ML_PREDICTION_CACHE_SIZE', '10000'))
+# Most frequent training profiles to pre-compute when a new model is loaded
+ML_CACHE_WARM_PROFILES = int(os.getenv('ML_CACHE_WARM_PROFILES', '500'))
+# Micro-batch concurrent predict requests within a worker (needs gunicorn threads)
+ML_MICRO_BATCHING = os.getenv('ML_MICRO_BATCHING', 'False') == 'True'
+# How long the first request of a micro-batch waits for others, and the row cap
+ML_BATCH_WINDOW_MS = float(os.getenv('ML_BATCH_WINDOW_MS', '5'))
+ML_BATCH_MAX_ROWS = int(os.getenv('ML_BATCH_MAX_ROWS', '64'))
+# Keep a per-user CurrentPrediction row fresh in the background, so predict and
+# dashboard reads skip the model (see ml_service/materialize.py)
+ML_MATERIALIZE_PREDICTIONS = os.getenv('ML_MATERIALIZE_PREDICTIONS', 'True') == 'True'
+ML_MATERIALIZE_BATCH_SIZE = int(os.getenv('ML_MATERIALIZE_BATCH_SIZE', '500'))
+# The worker rebuilding the rows of a new model version is replaced by another
+# one if it sends no heartbeat (one per batch) for this many seconds
+ML_MATERIALIZE_LEASE = int(os.getenv('ML_MATERIALIZE_LEASE', '120'))
+# Per-stage latency histograms of the prediction pipeline (admin/model/timings/)
+ML_STAGE_TIMING = os.getenv('ML_STAGE_TIMING', 'True') == 'True'
+# Debug flag: also return each request's stage timings in a Server-Timing header
+ML_SERVER_TIMING = os.getenv('ML_SERVER_TIMING', 'False') == 'True'
+# Maximum rows accepted by the batch prediction endpoint
+ML_BATCH_MAX_SIZE = int(os.getenv('ML_BATCH_MAX_SIZE', '5000'))
+
 # --- API & REACT CONFIGURATION ---
 
 # 1. CORS: Allow React (Port 5173) to talk to Django
@@ -127,6 +202,8 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
     'content-type',
     'authorization',
 ]
+# Lets the frontend read the next/prev page cursors of list endpoints
+CORS_EXPOSE_HEADERS = ['Link']
 # If you want to be specific:
 cors_allowed_origins_env = os.getenv('CORS_ALLOWED_ORIGINS')
 if cors_allowed_origins_env:
@@ -143,4 +220,16 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'users.authentication.CustomJWTAuthentication',
     )
-}
\ No newline at end of file
+}
+# 4. List endpoints are keyset paginated (users/pagination.py): rows per page
+# by default, and the most a client can ask for with ?page_size=
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', '100'))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '500'))
+
+# 5. Logging: background ML work (ml_service) reports to the console
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'loggers': {'ml_service': {'handlers': ['console'], 'level': os.getenv('ML_LOG_LEVEL', 'INFO')}},
+}
@@ -0,0 +1,14 @@
+from django.apps import apps
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Creates tables for the unmanaged models (certification, adminlogs) as
+    well, which exist in the real database but not in a new test one.
+    """
+
+    def setup_databases(self, **kwargs):
+        for model in apps.get_models():
+            model._meta.managed = True
+        return super().setup_databases(**kwargs)
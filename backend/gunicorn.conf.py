@@ -0,0 +1,28 @@
+"""
+Gunicorn settings, picked up automatically when gunicorn starts from backend/.
+
+The app is imported once in the master and the job predictor is loaded there
+before workers are forked. sklearn copies tree nodes into its own buffers on
+unpickle, so memory mapping alone cannot share them; loading before the fork
+lets every worker share those pages copy-on-write instead of holding a
+private copy of the forest.
+"""
+import os
+
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+# More than one thread per worker lets ML_MICRO_BATCHING group concurrent predictions
+threads = int(os.getenv('WEB_THREADS', '1'))
+preload_app = True
+
+
+def when_ready(server):
+    from django.conf import settings
+    if not settings.ML_PRELOAD_MODEL:
+        return
+    from ml_service.registry import registry
+    try:
+        loaded = registry.get()
+        if loaded is None:
+            server.log.info("No trained model to preload")
+    except Exception as e:
+        server.log.warning(f"Model preload failed, workers will load it lazily: {e}")
@@ -0,0 +1,129 @@
+import os
+import time
+import threading
+from concurrent.futures import Future
+from django.conf import settings
+
+
+class _Pending:
+    def __init__(self, loaded, user_profile):
+        self.loaded = loaded
+        self.user_profile = user_profile
+        self.future = Future()
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-profile predictions for up to ML_BATCH_WINDOW_MS,
+    or until ML_BATCH_MAX_ROWS are waiting, and runs them as one predict_proba
+    on a background thread. Each caller blocks on its own future.
+
+    Requests with the same key (the prediction cache key: normalized profile
+    plus model version) share one row, whether they arrive while it is still
+    waiting or while its batch is already running.
+    """
+
+    def __init__(self, predict_rows, window_ms=None, max_rows=None):
+        self._predict_rows = predict_rows
+        self._window_ms = window_ms
+        self._max_rows = max_rows
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._inflight = {}
+        self._first_at = None
+        self._worker = None
+        self._worker_pid = None
+        self.batches = 0
+        self.rows = 0
+        self.coalesced = 0
+
+    @property
+    def window(self):
+        window_ms = self._window_ms if self._window_ms is not None else settings.ML_BATCH_WINDOW_MS
+        return window_ms / 1000.0
+
+    @property
+    def max_rows(self):
+        return self._max_rows if self._max_rows is not None else settings.ML_BATCH_MAX_ROWS
+
+    def _ensure_worker(self):
+        # Threads do not survive a fork, so a preloaded gunicorn master's
+        # worker thread has to be restarted in each child
+        if self._worker is None or self._worker_pid != os.getpid() or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='prediction-micro-batcher', daemon=True)
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def predict(self, loaded, key, user_profile, timeout=30):
+        """
+        Top roles for one profile, computed together with whatever else arrives
+        within the batching window.
+        """
+        with self._cond:
+            entry = self._pending.get(key) or self._inflight.get(key)
+            if entry is None:
+                entry = _Pending(loaded, user_profile)
+                if not self._pending:
+                    self._first_at = time.monotonic()
+                self._pending[key] = entry
+                self._ensure_worker()
+                self._cond.notify()
+            else:
+                self.coalesced += 1
+        return entry.future.result(timeout)
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = self._first_at + self.window
+            while len(self._pending) < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            keys = list(self._pending)[:self.max_rows]
+            batch = {key: self._pending.pop(key) for key in keys}
+            self._inflight.update(batch)
+            self._first_at = time.monotonic() if self._pending else None
+            return batch
+
+    def _execute(self, batch):
+        # Requests that raced a model reload may carry different snapshots
+        groups = {}
+        for key, entry in batch.items():
+            groups.setdefault(id(entry.loaded), []).append((key, entry))
+
+        for group in groups.values():
+            loaded = group[0][1].loaded
+            try:
+                results = self._predict_rows(loaded, [entry.user_profile for _, entry in group])
+                for (_, entry), top_roles in zip(group, results):
+                    entry.future.set_result(top_roles)
+            except Exception as e:
+                for _, entry in group:
+                    if not entry.future.done():
+                        entry.future.set_exception(e)
+
+        with self._cond:
+            for key in batch:
+                self._inflight.pop(key, None)
+            self.batches += 1
+            self.rows += len(batch)
+
+    def _run(self):
+        while True:
+            self._execute(self._take_batch())
+
+    def stats(self):
+        with self._cond:
+            return {
+                'window_ms': self.window * 1000,
+                'max_rows': self.max_rows,
+                'batches': self.batches,
+                'rows': self.rows,
+                'coalesced': self.coalesced,
+                'avg_batch_size': round(self.rows / self.batches, 2) if self.batches else None,
+                'pending': len(self._pending),
+            }
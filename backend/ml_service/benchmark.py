@@ -0,0 +1,115 @@
+import os
+import time
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
+
+# Candidate models for the benchmark_models command. Kept free of Django so
+# candidates can be fitted in worker processes.
+
+FEATURE_COLUMNS = ['degree', 'specialization', 'text_features']
+FAMILIES = ('forest', 'logistic', 'sgd', 'hgb')
+
+
+def to_dense(X):
+    # HistGradientBoostingClassifier does not take sparse input
+    return X.toarray() if sp.issparse(X) else X
+
+
+def candidate_grid(families, trees, depths, max_features):
+    """
+    Candidate specs: every family for every TF-IDF size, with tree counts and
+    depth limits crossed where the family has them. A depth of None is
+    unlimited.
+    """
+    specs = []
+    for size in max_features:
+        for family in families:
+            if family == 'forest':
+                specs += [{'family': family, 'max_features': size, 'trees': n, 'depth': depth}
+                          for n in trees for depth in depths]
+            elif family == 'hgb':
+                specs += [{'family': family, 'max_features': size, 'depth': depth} for depth in depths]
+            elif family in FAMILIES:
+                specs.append({'family': family, 'max_features': size})
+            else:
+                raise ValueError(f"Unknown model family {family!r}; expected one of {', '.join(FAMILIES)}")
+    for spec in specs:
+        spec['name'] = candidate_name(spec)
+    return specs
+
+
+def candidate_name(spec):
+    parts = [spec['family']]
+    if 'trees' in spec:
+        parts.append(f"{spec['trees']}t")
+    if 'depth' in spec:
+        parts.append(f"d{spec['depth'] or 'max'}")
+    parts.append(f"tfidf{spec['max_features']}")
+    return "-".join(parts)
+
+
+def build_candidate(spec, feature_config, random_state=42):
+    """
+    The pipeline for a candidate spec: train_model's preprocessor, with the
+    spec's TF-IDF size, and the spec's classifier.
+    """
+    preprocessor = ColumnTransformer(transformers=[
+        ('cat', OneHotEncoder(handle_unknown='ignore'), feature_config['categorical_features']),
+        ('text', TfidfVectorizer(**dict(feature_config['tfidf'], max_features=spec['max_features'])), 'text_features')
+    ])
+    steps = [('preprocessor', preprocessor)]
+    family = spec['family']
+    if family == 'forest':
+        classifier = RandomForestClassifier(n_estimators=spec['trees'], max_depth=spec['depth'], random_state=random_state)
+    elif family == 'logistic':
+        classifier = LogisticRegression(max_iter=1000, random_state=random_state)
+    elif family == 'sgd':
+        classifier = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=random_state)
+    else:
+        steps.append(('dense', FunctionTransformer(to_dense, accept_sparse=True)))
+        classifier = HistGradientBoostingClassifier(max_depth=spec['depth'], early_stopping=False, random_state=random_state)
+    steps.append(('classifier', classifier))
+    return Pipeline(steps=steps)
+
+
+def fit_candidate(spec, feature_config, X_train, y_train, weights, X_test, y_test, test_weights, artifact_dir):
+    """
+    Fits one candidate and scores it on the held-out rows. The fitted
+    pipeline is saved as train_model publishes it, to artifact_dir, so its
+    size is that of a deployed version.
+    """
+    pipeline = build_candidate(spec, feature_config)
+    start = time.perf_counter()
+    pipeline.fit(X_train, y_train, classifier__sample_weight=weights)
+    fit_seconds = time.perf_counter() - start
+    accuracy = accuracy_score(y_test, pipeline.predict(X_test), sample_weight=test_weights)
+    path = os.path.join(artifact_dir, f"{spec['name']}.pkl")
+    joblib.dump(pipeline, path, compress=0)
+    return dict(spec, fit_seconds=fit_seconds, accuracy=accuracy, artifact_bytes=os.path.getsize(path), path=path)
+
+
+def inference_latency(pipeline, X, batch_size):
+    """
+    (median and p99 seconds of predict_proba on one row, seconds per row of
+    predict_proba on batch_size rows) over the rows of X.
+    """
+    pipeline.predict_proba(X.iloc[:1])
+    single = []
+    for i in range(len(X)):
+        row = X.iloc[i:i + 1]
+        start = time.perf_counter()
+        pipeline.predict_proba(row)
+        single.append(time.perf_counter() - start)
+    batch = X.iloc[np.arange(batch_size) % len(X)]
+    start = time.perf_counter()
+    pipeline.predict_proba(batch)
+    per_row = (time.perf_counter() - start) / batch_size
+    return float(np.median(single)), float(np.percentile(single, 99)), per_row
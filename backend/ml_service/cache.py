@@ -0,0 +1,147 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from django.conf import settings
+
+WARM_FILENAME = 'job_predictor.warm.json'
+
+
+def _normalize_list(value):
+    """
+    'Python, sql ,Git' -> ['git', 'python', 'sql']. Order and case do not change
+    the TF-IDF features or the missing-skills check, so they must not change the key.
+    """
+    if not isinstance(value, str):
+        return []
+    return sorted(item.strip().lower() for item in value.split(',') if item.strip())
+
+
+def normalize_profile(user_profile):
+    """
+    Canonical form of a profile. Degree and specialization stay as they are:
+    the one-hot encoder is case sensitive.
+    """
+    return {
+        'degree': user_profile.get('degree', ''),
+        'specialization': user_profile.get('specialization', ''),
+        'skills': ", ".join(_normalize_list(user_profile.get('skills'))),
+        'certifications': ", ".join(_normalize_list(user_profile.get('certifications'))),
+    }
+
+
+class PredictionCache:
+    """
+    Bounded LRU of predict_job results, keyed by a hash of the normalized
+    profile and the model version. The cache empties itself when the registry
+    serves a new version, so a stale prediction is never returned.
+    """
+
+    def __init__(self, maxsize=None):
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        if self._maxsize is not None:
+            return self._maxsize
+        return settings.ML_PREDICTION_CACHE_SIZE
+
+    @staticmethod
+    def key(user_profile, version):
+        canonical = json.dumps([normalize_profile(user_profile), version], sort_keys=True)
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+    def sync(self, version):
+        """
+        Drops every entry if the model version changed. Returns True when it did.
+        """
+        if version == self._version:
+            return False
+        with self._lock:
+            if version == self._version:
+                return False
+            self._entries.clear()
+            self._version = version
+            return True
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        maxsize = self.maxsize
+        if maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'version': self._version,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+def frequent_profiles(df, limit):
+    """
+    The most common normalized (degree, specialization, skills, certifications)
+    combinations of a training DataFrame, most frequent first.
+    """
+    if df.empty or limit <= 0:
+        return []
+    normalized = df[['degree', 'specialization']].copy()
+    normalized['skills'] = df['skills'].map(lambda value: ", ".join(_normalize_list(value)))
+    normalized['certifications'] = df['certifications'].map(lambda value: ", ".join(_normalize_list(value)))
+    # observed=True: value_counts() would expand categorical columns into
+    # every combination of their categories
+    counts = normalized.groupby(list(normalized.columns), observed=True, sort=False).size()
+    counts = counts.sort_values(ascending=False, kind='stable').head(limit)
+    return [dict(zip(counts.index.names, values)) for values in counts.index]
+
+
+def export_warm_profiles(profiles, model_dir, version):
+    path = os.path.join(model_dir, WARM_FILENAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': version, 'profiles': profiles}, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_warm_profiles(model_dir, version):
+    try:
+        with open(os.path.join(model_dir, WARM_FILENAME)) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return data['profiles'] if data.get('version') == version else []
+
+
+prediction_cache = PredictionCache()
@@ -0,0 +1,179 @@
+import datetime
+from array import array
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from users.models import TrainingData, JobPlacement, Predictionhistory
+from .profiles import load_user_profiles
+
+# Columns of a training frame before text_features is derived
+TRAINING_COLUMNS = ['degree', 'specialization', 'skills', 'certifications', 'target_job_role']
+
+
+class _DictionaryColumn:
+    """
+    A string column kept as int32 codes plus one copy of each distinct value.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.codes = array('i')
+
+    def extend(self, values):
+        index = self.index
+        setdefault = index.setdefault
+        # len(index) is evaluated before a new value is inserted: its code
+        self.codes.extend([setdefault(value, len(index)) for value in values])
+
+    def categorical(self):
+        return pd.Categorical.from_codes(np.frombuffer(self.codes, dtype=np.int32), categories=list(self.index))
+
+
+def stream_training_rows(chunk_size=None, after_id=0, up_to_id=None):
+    """
+    TrainingData rows as (training_id, *TRAINING_COLUMNS) tuples, in primary
+    key order, one chunk at a time. after_id and up_to_id bound the ids read.
+
+    Chunks are keyset queries on training_id rather than one streamed cursor:
+    MySQL drivers buffer a whole result set client side, so this is what
+    bounds memory on every backend.
+    """
+    chunk_size = chunk_size or settings.ML_TRAINING_CHUNK_SIZE
+    last_id = after_id
+    while True:
+        rows = TrainingData.objects.filter(training_id__gt=last_id)
+        if up_to_id is not None:
+            rows = rows.filter(training_id__lte=up_to_id)
+        chunk = list(rows.order_by('training_id').values_list('training_id', *TRAINING_COLUMNS)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1][0]
+
+
+def load_training_frame(chunk_size=None, after_id=0, up_to_id=None):
+    """
+    TrainingData as a DataFrame of categorical columns, built chunk by
+    chunk so no list of row dicts or per-row strings ever exists.
+    """
+    columns = {name: _DictionaryColumn() for name in TRAINING_COLUMNS}
+    for chunk in stream_training_rows(chunk_size, after_id, up_to_id):
+        for column, values in zip(columns.values(), list(zip(*chunk))[1:]):
+            column.extend(values)
+    return pd.DataFrame({name: column.categorical() for name, column in columns.items()})
+
+
+def training_watermark():
+    """
+    How far a training run reads: the newest TrainingData and JobPlacement
+    ids and the time admin corrections are read up to. Stored in the version
+    metadata so an incremental run can read only what came after.
+    """
+    return {
+        'training_id': TrainingData.objects.aggregate(last=Max('training_id'))['last'] or 0,
+        'placement_id': JobPlacement.objects.aggregate(last=Max('placement_id'))['last'] or 0,
+        'corrected_at': timezone.now().isoformat(),
+    }
+
+
+def placement_labels(watermark, since=None):
+    """
+    JobPlacement rows up to the watermark, after since when given.
+    """
+    placements = JobPlacement.objects.filter(placement_id__lte=watermark['placement_id'])
+    if since:
+        placements = placements.filter(placement_id__gt=since['placement_id'])
+    return placements
+
+
+def feedback_labels(watermark, since=None):
+    """
+    Flagged predictions with an admin corrected role. With since, only the
+    ones corrected between the two watermarks.
+    """
+    feedback = (
+        Predictionhistory.objects.filter(is_flagged=True).exclude(corrected_role__isnull=True).exclude(corrected_role__exact='')
+        # Rows corrected before corrected_at was recorded have none
+        .exclude(corrected_at__gt=datetime.datetime.fromisoformat(watermark['corrected_at']))
+    )
+    if since:
+        feedback = feedback.filter(corrected_at__gt=datetime.datetime.fromisoformat(since['corrected_at']))
+    return feedback
+
+
+def labelled_profiles_frame(labels, role_field):
+    """
+    Training rows for a queryset of rows with a user and a role: each user's
+    profile as predict_job sees it, labelled with the row's role_field. Four
+    queries however many rows there are; users without education are skipped.
+    """
+    # The labelled users go to load_user_profiles as a subquery, not an id list
+    profiles = load_user_profiles(labels.values('user_id'))
+    rows = [
+        dict(profiles[user_id], target_job_role=role)
+        for user_id, role in labels.values_list('user_id', role_field)
+        if user_id in profiles
+    ]
+    return pd.DataFrame(rows, columns=TRAINING_COLUMNS)
+
+
+def _text_features(skills, certifications):
+    """
+    skills + " " + certifications for two categoricals, concatenating each
+    distinct pair once instead of once per row.
+    """
+    pairs = skills.codes.astype(np.int64) * len(certifications.categories) + certifications.codes
+    unique_pairs, codes = np.unique(pairs, return_inverse=True)
+    skill_values = skills.categories[unique_pairs // len(certifications.categories)]
+    cert_values = certifications.categories[unique_pairs % len(certifications.categories)]
+    categories = [f"{skill} {cert}" for skill, cert in zip(skill_values, cert_values)]
+    # Distinct pairs can still concatenate to the same text
+    categories, remap = np.unique(np.array(categories, dtype=object), return_inverse=True)
+    return pd.Categorical.from_codes(remap[codes], categories=categories)
+
+
+def _unordered_codes(values):
+    """
+    Codes of a categorical column of comma separated lists under which lists
+    with the same items in a different order are equal.
+    """
+    canonical = [", ".join(sorted(filter(None, (item.strip() for item in value.split(','))))) for value in values.categories]
+    codes, _ = pd.factorize(pd.Index(canonical, dtype=object))
+    return codes[values.codes]
+
+
+def duplicate_groups(df):
+    """
+    A group number for each row of a training frame, shared by rows that
+    are duplicates of each other: same degree, specialization, role, and
+    skills and certifications up to the order they are listed in (the model
+    sees them as a bag of words).
+    """
+    keys = pd.DataFrame({
+        'degree': df['degree'].array.codes,
+        'specialization': df['specialization'].array.codes,
+        'skills': _unordered_codes(df['skills'].array),
+        'certifications': _unordered_codes(df['certifications'].array),
+        'target_job_role': df['target_job_role'].array.codes,
+    })
+    return keys.groupby(list(keys.columns), sort=False).ngroup().to_numpy()
+
+
+def concat_training_frames(frames):
+    """
+    Concatenates training frames (categorical or plain object columns) into
+    one categorical frame and derives text_features, as train_model feeds to
+    the pipeline.
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=TRAINING_COLUMNS + ['text_features'])
+    df = pd.DataFrame({
+        name: union_categoricals([pd.Categorical(frame[name]) for frame in frames], ignore_order=True)
+        for name in TRAINING_COLUMNS
+    })
+    df['text_features'] = _text_features(df['skills'].array, df['certifications'].array)
+    return df
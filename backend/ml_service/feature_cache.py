@@ -0,0 +1,278 @@
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import sklearn
+from pandas.api.types import union_categoricals
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.preprocessing import OneHotEncoder
+from users.models import TrainingData
+from .dataset import TRAINING_COLUMNS, load_training_frame, _text_features
+
+logger = logging.getLogger(__name__)
+
+COUNTS_FILENAME = 'text_counts.npz'
+COLUMNS_FILENAME = 'columns.npz'
+META_FILENAME = 'meta.json'
+
+# TfidfVectorizer options split by where they apply: tokenizing (done once
+# per row and cached) and weighting (derived from the cached counts)
+_ANALYSIS_PARAMS = ('input', 'encoding', 'decode_error', 'strip_accents', 'lowercase', 'preprocessor',
+                    'tokenizer', 'analyzer', 'stop_words', 'token_pattern', 'ngram_range')
+_WEIGHTING_PARAMS = ('norm', 'use_idf', 'smooth_idf', 'sublinear_tf')
+# Options the derivation from counts does not replicate, with the value it assumes
+_FIXED_PARAMS = {'min_df': 1, 'max_df': 1.0, 'vocabulary': None, 'dtype': np.float64}
+
+
+def config_hash(config):
+    """
+    Identifies the encoding a cache was built with; the sklearn version is
+    part of it since tokenizing (e.g. the stop word list) can change with it.
+    """
+    text = json.dumps(dict(config, sklearn=sklearn.__version__), sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _tfidf_params(config):
+    return TfidfVectorizer(**config['tfidf']).get_params()
+
+
+def supports(config):
+    """
+    Whether a feature configuration can be fitted from cached counts.
+    """
+    params = _tfidf_params(config)
+    return all(params[name] == value for name, value in _FIXED_PARAMS.items()) and not callable(params['analyzer'])
+
+
+def _concat_columns(frames):
+    return pd.DataFrame({
+        name: union_categoricals([pd.Categorical(frame[name]) for frame in frames], ignore_order=True)
+        for name in TRAINING_COLUMNS
+    })
+
+
+def _vstack_counts(parts, n_terms):
+    widened = []
+    for counts in parts:
+        counts = counts.tocsr(copy=True)
+        counts.resize((counts.shape[0], n_terms))
+        widened.append(counts)
+    return sp.vstack(widened, format='csr', dtype=np.int32)
+
+
+class TrainingFeatureCache:
+    """
+    TrainingData as train_model encodes it, persisted between trainings:
+    the token counts of every row's text_features (CSR, one column per term
+    of an append-only vocabulary), the row's other columns as dictionary
+    codes, and the training_id watermark they cover.
+
+    A retrain reads the cache and tokenizes only the rows added since.
+    TF-IDF weights, max_features and the one-hot columns depend on all rows,
+    so they are derived from the counts each time (fit_cached_features).
+    The cache starts over when the feature configuration or sklearn version
+    changes, or when rows it covers were deleted.
+    """
+
+    def __init__(self, cache_dir, config):
+        self.cache_dir = cache_dir
+        self.config = config
+        self.config_hash = config_hash(config)
+        params = _tfidf_params(config)
+        self._counter = CountVectorizer(**{name: params[name] for name in _ANALYSIS_PARAMS}, dtype=np.int32)
+        self.terms = []
+        self._term_index = {}
+
+    def _path(self, filename):
+        return os.path.join(self.cache_dir, filename)
+
+    def count_text(self, texts):
+        """
+        Token counts of a categorical text column, tokenizing each distinct
+        text once. New terms are appended to the vocabulary.
+        """
+        texts = pd.Categorical(texts)
+        try:
+            distinct = self._counter.fit_transform(list(texts.categories))
+        except ValueError:
+            # Every text was empty or stop words only
+            return sp.csr_matrix((len(texts), len(self.terms)), dtype=np.int32)
+        setdefault = self._term_index.setdefault
+        columns = np.array([setdefault(term, len(self._term_index)) for term in self._counter.get_feature_names_out()])
+        self.terms.extend(list(self._term_index)[len(self.terms):])
+        distinct = sp.csr_matrix((distinct.data, columns[distinct.indices], distinct.indptr),
+                                 shape=(distinct.shape[0], len(self.terms)))
+        return distinct[texts.codes]
+
+    def append_text(self, counts, texts):
+        """
+        counts with rows for more texts appended, for rows that are not
+        cached (placements and corrections are relabelled on every run).
+        """
+        extra = self.count_text(texts)
+        return _vstack_counts([counts, extra], len(self.terms))
+
+    def load(self):
+        """
+        (frame, counts, training_id) of the cache, or None if there is none
+        usable for this configuration.
+        """
+        try:
+            with open(self._path(META_FILENAME)) as f:
+                meta = json.load(f)
+            if meta['config_hash'] != self.config_hash:
+                return None
+            counts = sp.load_npz(self._path(COUNTS_FILENAME)).tocsr()
+            with np.load(self._path(COLUMNS_FILENAME)) as codes:
+                frame = pd.DataFrame({
+                    name: pd.Categorical.from_codes(codes[name], categories=meta['dictionaries'][name])
+                    for name in TRAINING_COLUMNS
+                })
+        except (OSError, ValueError, KeyError):
+            return None
+        # Files of two different saves, if one was interrupted
+        if counts.shape != (meta['rows'], len(meta['terms'])) or len(frame) != meta['rows']:
+            return None
+        self.terms = list(meta['terms'])
+        self._term_index = {term: i for i, term in enumerate(self.terms)}
+        return frame, counts, meta['training_id']
+
+    def save(self, frame, counts, training_id):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pid = os.getpid()
+        tmp_path = self._path(f"{COUNTS_FILENAME}.{pid}.tmp.npz")
+        sp.save_npz(tmp_path, counts, compressed=False)
+        os.replace(tmp_path, self._path(COUNTS_FILENAME))
+        tmp_path = self._path(f"{COLUMNS_FILENAME}.{pid}.tmp.npz")
+        np.savez(tmp_path, **{name: frame[name].cat.codes.to_numpy(np.int32) for name in TRAINING_COLUMNS})
+        os.replace(tmp_path, self._path(COLUMNS_FILENAME))
+        # Written last: until it is replaced, load() rejects the new files
+        meta = {
+            'config_hash': self.config_hash,
+            'training_id': training_id,
+            'rows': counts.shape[0],
+            'terms': self.terms,
+            'dictionaries': {name: list(frame[name].cat.categories) for name in TRAINING_COLUMNS},
+        }
+        tmp_path = self._path(f"{META_FILENAME}.{pid}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path(META_FILENAME))
+
+    def update(self, up_to_id):
+        """
+        TrainingData rows up to up_to_id as (frame, counts): those covered by
+        the cache read from disk, the rest loaded and tokenized, after which
+        the cache is saved to cover them all.
+        """
+        cached = self.load()
+        if cached is not None:
+            frame, counts, training_id = cached
+            if TrainingData.objects.filter(training_id__lte=training_id).count() != len(frame):
+                logger.info("Feature cache is out of date (rows were deleted); re-encoding all rows.")
+                cached = None
+        if cached is None:
+            self.terms, self._term_index = [], {}
+            frame, counts, training_id = None, None, 0
+
+        new_frame = load_training_frame(after_id=training_id, up_to_id=up_to_id)
+        logger.info("Feature cache: %d cached rows, %d to encode.", 0 if frame is None else len(frame), len(new_frame))
+        if new_frame.empty and frame is not None:
+            return frame, counts
+        new_counts = self.count_text(_text_features(new_frame['skills'].array, new_frame['certifications'].array))
+        if frame is not None:
+            new_frame = _concat_columns([frame, new_frame])
+            new_counts = _vstack_counts([counts, new_counts], len(self.terms))
+        self.save(new_frame, new_counts, max(training_id, up_to_id))
+        return new_frame, new_counts
+
+
+def _one_hot(frame, columns, fit_rows):
+    """
+    One-hot columns of a categorical frame computed from its codes, plus
+    the categories an OneHotEncoder fitted on fit_rows would have.
+    """
+    blocks = []
+    categories = []
+    for column in columns:
+        values = frame[column].array
+        codes = values.codes
+        present = np.unique(codes[fit_rows] if fit_rows is not None else codes)
+        present = present[present >= 0]
+        names = np.asarray(values.categories, dtype=object)[present]
+        order = np.argsort(names, kind='stable')
+        position = np.full(len(values.categories), -1)
+        position[present[order]] = np.arange(len(present))
+        columns_of_rows = position[codes]
+        # handle_unknown='ignore': values not seen in fit_rows get no column
+        known = np.flatnonzero(columns_of_rows >= 0)
+        blocks.append(sp.csr_matrix(
+            (np.ones(len(known)), (known, columns_of_rows[known])), shape=(len(frame), len(present))
+        ))
+        categories.append(names[order])
+    return sp.hstack(blocks, format='csr'), categories
+
+
+def fit_cached_features(frame, counts, terms, config, fit_rows=None, rows=None):
+    """
+    What fitting train_model's ColumnTransformer on the rows fit_rows (all
+    rows when None) of frame and transforming the rows rows (all when None)
+    would return, from the cached token counts instead of the text:
+    (fitted preprocessor, X).
+
+    The preprocessor is a real ColumnTransformer, fitted on one row per
+    category and then given the vocabulary and IDF computed here, so it
+    transforms new profiles exactly as the full fit would.
+    """
+    params = _tfidf_params(config)
+    categorical_features = config['categorical_features']
+    X_cat, categories = _one_hot(frame, categorical_features, fit_rows)
+
+    # Vocabulary as CountVectorizer builds it: the terms of the fitted rows in
+    # alphabetical order, cut to the max_features most frequent
+    fitted = counts[fit_rows] if fit_rows is not None else counts
+    if params['binary']:
+        fitted = fitted.copy()
+        fitted.data[:] = 1
+    doc_freq = np.bincount(fitted.indices, minlength=len(terms))
+    term_freq = np.bincount(fitted.indices, weights=fitted.data, minlength=len(terms))
+    present = np.flatnonzero(doc_freq)
+    selected = present[np.argsort(np.asarray(terms, dtype=object)[present], kind='stable')]
+    if params['max_features'] is not None and len(selected) > params['max_features']:
+        keep = (-term_freq[selected]).argsort()[:params['max_features']]
+        selected = selected[np.sort(keep)]
+
+    text_counts = counts[:, selected].astype(np.float64)
+    if params['binary']:
+        text_counts.data[:] = 1
+    tfidf = TfidfTransformer(**{name: params[name] for name in _WEIGHTING_PARAMS})
+    tfidf.fit(text_counts[fit_rows] if fit_rows is not None else text_counts)
+    if rows is not None:
+        X_cat, text_counts = X_cat[rows], text_counts[rows]
+    X = sp.hstack([X_cat, tfidf.transform(text_counts)], format='csr')
+
+    preprocessor = ColumnTransformer(transformers=[
+        ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features),
+        ('text', TfidfVectorizer(**config['tfidf']), 'text_features')
+    ])
+    # One row per category of the longest column; the vocabulary is replaced below
+    n_rows = max(1, max(len(values) for values in categories))
+    seed = pd.DataFrame({
+        column: [values[min(i, len(values) - 1)] if len(values) else '' for i in range(n_rows)]
+        for column, values in zip(categorical_features, categories)
+    })
+    seed['text_features'] = [" ".join(np.asarray(terms, dtype=object)[selected])] + [''] * (n_rows - 1)
+    preprocessor.fit(seed)
+    vectorizer = preprocessor.named_transformers_['text']
+    vectorizer.vocabulary_ = {terms[column]: i for i, column in enumerate(selected)}
+    vectorizer.idf_ = tfidf.idf_
+    # Dense or sparse output is decided on the density of the real matrix
+    preprocessor.sparse_output_ = X.nnz < preprocessor.sparse_threshold * X.shape[0] * X.shape[1]
+    if not preprocessor.sparse_output_:
+        X = X.toarray()
+    return preprocessor, X
@@ -0,0 +1,152 @@
+import os
+import re
+import math
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+FEATURES_FILENAME = 'job_predictor.features.pkl'
+
+
+class CompiledFeatures:
+    """
+    The fitted ColumnTransformer of the job predictor reduced to plain lookups:
+    an index map per categorical column, the TF-IDF vocabulary and IDF vector.
+
+    transform() turns profile dicts straight into the sparse rows the classifier
+    was trained on, without building a DataFrame or going through sklearn's
+    input validation. The values are bit-for-bit those of the pipeline.
+    """
+
+    def __init__(self, category_indexes, vocabulary, idf, text_offset, token_pattern, n_features, version=None):
+        self.category_indexes = category_indexes  # [(column, {category: output column})]
+        self.vocabulary = vocabulary              # term -> position in idf
+        self.idf = idf
+        self.text_offset = text_offset
+        self.token_pattern = re.compile(token_pattern)
+        self.n_features = n_features
+        self.version = version
+
+    @classmethod
+    def from_pipeline(cls, pipeline, version=None):
+        """
+        Compiles the preprocessor of a trained pipeline, or returns None when it
+        uses options the compiled path does not replicate.
+        """
+        if not isinstance(pipeline, Pipeline) or 'preprocessor' not in pipeline.named_steps:
+            return None
+        preprocessor = pipeline.named_steps['preprocessor']
+        if not isinstance(preprocessor, ColumnTransformer):
+            return None
+
+        category_indexes = []
+        text = None
+        offset = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == 'drop':
+                continue
+            if isinstance(transformer, OneHotEncoder):
+                if (transformer.handle_unknown != 'ignore' or transformer.drop_idx_ is not None
+                        or getattr(transformer, '_infrequent_enabled', False)):
+                    return None
+                for column, categories in zip(columns, transformer.categories_):
+                    category_indexes.append((column, {category: offset + i for i, category in enumerate(categories)}))
+                    offset += len(categories)
+            elif isinstance(transformer, TfidfVectorizer):
+                if (text is not None or columns != 'text_features' or transformer.analyzer != 'word'
+                        or tuple(transformer.ngram_range) != (1, 1) or not transformer.lowercase
+                        or transformer.strip_accents or transformer.preprocessor or transformer.tokenizer
+                        or transformer.binary or transformer.norm != 'l2' or not transformer.use_idf
+                        or transformer.sublinear_tf):
+                    return None
+                text = (transformer.vocabulary_, np.asarray(transformer.idf_, dtype=np.float64), offset, transformer.token_pattern)
+                offset += len(transformer.vocabulary_)
+            else:
+                return None
+
+        if text is None or offset != getattr(pipeline.named_steps['classifier'], 'n_features_in_', offset):
+            return None
+        vocabulary, idf, text_offset, token_pattern = text
+        return cls(category_indexes, dict(vocabulary), idf, text_offset, token_pattern, offset, version)
+
+    def _row(self, user_profile):
+        indices = []
+        values = []
+        for column, index in self.category_indexes:
+            position = index.get(user_profile.get(column, ''))
+            if position is not None:
+                indices.append(position)
+                values.append(1.0)
+
+        # Same analyzer as the TfidfVectorizer: lowercase, token_pattern, unigrams.
+        # Stop words never made it into the vocabulary, so skipping them is implicit.
+        text = (user_profile.get('skills', '') + " " + user_profile.get('certifications', '')).lower()
+        counts = {}
+        for token in self.token_pattern.findall(text):
+            term = self.vocabulary.get(token)
+            if term is not None:
+                counts[term] = counts.get(term, 0) + 1
+
+        if counts:
+            terms = sorted(counts)
+            weights = [counts[term] * self.idf[term] for term in terms]
+            # Accumulate in column order like sklearn's l2 normalizer so the
+            # result matches to the last bit
+            norm = 0.0
+            for weight in weights:
+                norm += weight * weight
+            norm = math.sqrt(norm)
+            for term, weight in zip(terms, weights):
+                indices.append(self.text_offset + term)
+                values.append(weight / norm)
+        return indices, values
+
+    def transform(self, user_profiles):
+        """
+        CSR matrix with one row per profile, as the pipeline's preprocessor would produce.
+        """
+        indptr = [0]
+        indices = []
+        values = []
+        for user_profile in user_profiles:
+            row_indices, row_values = self._row(user_profile)
+            indices.extend(row_indices)
+            values.extend(row_values)
+            indptr.append(len(indices))
+        return sp.csr_matrix(
+            (np.array(values, dtype=np.float64), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+            shape=(len(user_profiles), self.n_features)
+        )
+
+
+def export_features(pipeline, model_dir, version):
+    """
+    Written by train_model next to the pickle. Returns None for pipelines the
+    compiled path does not support.
+    """
+    features = CompiledFeatures.from_pipeline(pipeline, version)
+    if features is None:
+        return None
+    path = os.path.join(model_dir, FEATURES_FILENAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(features, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_features(model_dir, version, pipeline):
+    """
+    The exported extractor if it belongs to this model version, otherwise one
+    compiled from the pipeline itself (older artifacts, or a publish in progress).
+    """
+    try:
+        features = joblib.load(os.path.join(model_dir, FEATURES_FILENAME))
+        if features.version == version:
+            return features
+    except Exception:
+        pass
+    return CompiledFeatures.from_pipeline(pipeline, version)
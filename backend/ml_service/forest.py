@@ -0,0 +1,162 @@
+import os
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+
+FOREST_FILENAME = 'job_predictor.forest.pkl'
+
+# Rows evaluated per traversal, bounding the dense (rows x features) buffer
+CHUNK_ROWS = 1024
+# Up to about this many rows the vectorized traversal beats sklearn's; past it
+# sklearn's per-row Cython loop wins, so large batches stay on sklearn
+SMALL_BATCH_ROWS = 128
+
+
+class CompiledForest:
+    """
+    Every tree of a fitted forest flattened into one set of contiguous node
+    arrays: feature, threshold, left/right child and the normalized leaf
+    distribution. Child indexes are global, so a (row, tree) pair is just a
+    node index, and all of them advance one level per vectorized step.
+
+    Traversal keeps only the (row, tree) pairs that have not reached a leaf
+    yet. predict_proba() returns exactly what sklearn's does.
+    """
+
+    def __init__(self, feature, threshold, left, right, is_leaf, value, roots, classes, n_features, version=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.is_leaf = is_leaf
+        self.value = value          # (n_nodes, n_classes), each tree's leaf proba
+        self.roots = roots          # root node of each tree, in estimator order
+        self.classes_ = classes
+        self.n_features = n_features
+        self.version = version
+
+    @classmethod
+    def from_classifier(cls, classifier, version=None):
+        """
+        Flattens a fitted single-output forest, or returns None for estimators
+        the engine does not replicate.
+        """
+        if not isinstance(classifier, (RandomForestClassifier, ExtraTreesClassifier)):
+            return None
+        if getattr(classifier, 'n_outputs_', 1) != 1 or not hasattr(classifier, 'estimators_'):
+            return None
+
+        n_classes = len(classifier.classes_)
+        features, thresholds, lefts, rights, leaves, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        for estimator in classifier.estimators_:
+            tree = estimator.tree_
+            if tree.n_classes[0] != n_classes:
+                return None
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold).astype(np.float64))
+            lefts.append(np.where(is_leaf, 0, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, 0, tree.children_right + offset).astype(np.int32))
+            leaves.append(is_leaf)
+
+            # Same normalization DecisionTreeClassifier.predict_proba applies
+            # to the leaf it lands on, done once per node here
+            proba = np.ascontiguousarray(tree.value[:, 0, :n_classes], dtype=np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(proba / normalizer)
+
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            np.concatenate(features), np.concatenate(thresholds),
+            np.concatenate(lefts), np.concatenate(rights), np.concatenate(leaves),
+            np.concatenate(values), np.array(roots, dtype=np.int32),
+            classifier.classes_, classifier.n_features_in_, version
+        )
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right, self.is_leaf, self.value, self.roots))
+
+    def apply(self, X):
+        """
+        Leaf node reached by every (row, tree), for a dense float32 batch.
+        """
+        n_rows, n_trees = X.shape[0], len(self.roots)
+        flat_X = np.ascontiguousarray(X).ravel()
+        # Offset of each (row, tree) pair's row in flat_X
+        row_offsets = np.repeat(np.arange(n_rows, dtype=np.int64) * X.shape[1], n_trees)
+        nodes = np.tile(self.roots, n_rows)
+        active = np.flatnonzero(~self.is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            # float32 input against float64 thresholds, promoted the same way
+            # sklearn's tree compares them
+            go_left = flat_X[row_offsets[active] + self.feature[current]] <= self.threshold[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[~self.is_leaf[current]]
+        return nodes.reshape(n_rows, n_trees)
+
+    def _predict_chunk(self, X):
+        leaf_values = self.value[self.apply(X)]
+        proba = np.zeros((X.shape[0], self.value.shape[1]), dtype=np.float64)
+        # Summed tree by tree in estimator order, then averaged, like
+        # ForestClassifier.predict_proba with n_jobs=None
+        for tree in range(len(self.roots)):
+            proba += leaf_values[:, tree]
+        proba /= len(self.roots)
+        return proba
+
+    def predict_proba(self, X):
+        """
+        Class probabilities for a sparse or dense feature matrix, in classes_ order.
+        """
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, but the model expects {self.n_features}")
+        chunks = []
+        for start in range(0, X.shape[0], CHUNK_ROWS):
+            chunk = X[start:start + CHUNK_ROWS]
+            chunk = chunk.toarray() if sp.issparse(chunk) else np.asarray(chunk)
+            chunks.append(self._predict_chunk(chunk.astype(np.float32, copy=False)))
+        if not chunks:
+            return np.zeros((0, len(self.classes_)), dtype=np.float64)
+        return np.concatenate(chunks)
+
+
+def export_forest(classifier, model_dir, version):
+    """
+    Written by train_model next to the pickle. Stored uncompressed so workers
+    can memory map the node arrays. Returns None for unsupported classifiers.
+    """
+    forest = CompiledForest.from_classifier(classifier, version)
+    if forest is None:
+        return None
+    path = os.path.join(model_dir, FOREST_FILENAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(forest, tmp_path, compress=0)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_forest(model_dir, version, classifier, mmap_mode=None):
+    """
+    The exported forest if it belongs to this model version, otherwise one
+    flattened from the classifier itself.
+    """
+    try:
+        forest = joblib.load(os.path.join(model_dir, FOREST_FILENAME), mmap_mode=mmap_mode)
+        if forest.version == version:
+            return forest
+    except Exception:
+        pass
+    return CompiledForest.from_classifier(classifier, version)
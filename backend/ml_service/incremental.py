@@ -0,0 +1,84 @@
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer
+
+# Stored in the version metadata; incremental training only extends models
+# of this kind and starts a new one from all rows otherwise
+INCREMENTAL_LEARNER = 'sgd_hashing'
+FEATURE_COLUMNS = ['degree', 'specialization', 'text_features']
+
+# Hashing needs no vocabulary fitted to the data, so a degree or skill first
+# seen in a later increment still gets a column
+_category_hasher = FeatureHasher(n_features=2 ** 10, input_type='string', alternate_sign=False)
+
+
+def hash_categories(X):
+    """
+    One hashed 'column=value' feature per categorical column of each row.
+    """
+    return _category_hasher.transform(
+        [f"degree={degree}", f"specialization={specialization}"]
+        for degree, specialization in zip(X['degree'], X['specialization'])
+    )
+
+
+def build_incremental_pipeline():
+    """
+    Pipeline with a stateless preprocessor and a classifier that supports
+    partial_fit. Takes the same DataFrame columns as the full rebuild's, so
+    predict_job serves either.
+    """
+    preprocessor = ColumnTransformer(transformers=[
+        ('cat', FunctionTransformer(hash_categories, accept_sparse=True), ['degree', 'specialization']),
+        ('text', HashingVectorizer(n_features=2 ** 18, stop_words='english', alternate_sign=False), 'text_features')
+    ])
+    classifier = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+    return Pipeline(steps=[('preprocessor', preprocessor), ('classifier', classifier)])
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def partial_fit_frame(pipeline, df, classes, chunk_rows, seed=42):
+    """
+    One pass of partial_fit over a training frame, in shuffled chunks so
+    rows clustered by insertion order do not skew the updates.
+    """
+    preprocessor = pipeline.named_steps['preprocessor']
+    if not hasattr(preprocessor, 'transformers_'):
+        # Nothing is learned from the data; fitting only sets up the columns
+        preprocessor.fit(df[FEATURE_COLUMNS].head(1))
+    classifier = pipeline.named_steps['classifier']
+    shuffled = df.iloc[np.random.default_rng(seed).permutation(len(df))]
+    for chunk in _chunks(shuffled, chunk_rows):
+        X = preprocessor.transform(chunk[FEATURE_COLUMNS])
+        classifier.partial_fit(X, np.asarray(chunk['target_job_role'], dtype=object), classes=classes)
+
+
+def frame_accuracy(pipeline, df, chunk_rows):
+    """
+    Accuracy of the pipeline on a labelled frame, predicted chunk by chunk.
+    """
+    if df.empty:
+        return None
+    correct = 0
+    for chunk in _chunks(df, chunk_rows):
+        predicted = pipeline.predict(chunk[FEATURE_COLUMNS])
+        correct += accuracy_score(np.asarray(chunk['target_job_role'], dtype=object), predicted, normalize=False)
+    return float(correct / len(df))
+
+
+def unknown_roles(pipeline, df):
+    """
+    Roles in the frame the classifier has no output for. partial_fit cannot
+    add classes, so these need a rebuild.
+    """
+    known = set(pipeline.named_steps['classifier'].classes_)
+    return sorted(set(df['target_job_role']) - known)
@@ -0,0 +1,300 @@
+import os
+import csv
+import uuid
+import logging
+import datetime
+import threading
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from users.models import TrainingData, TrainingJob, TrainingUpload
+from .jobs import _spawn_worker, _worker_name
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement; ML_UPLOAD_CHUNK_ROWS rows are committed at a time
+INSERT_BATCH = 5000
+
+# Accepted CSV headers (compared lower-cased, spaces as underscores) per field
+COLUMN_ALIASES = {
+    'degree': 'degree',
+    'specialization': 'specialization',
+    'skills': 'skills',
+    'certifications': 'certifications',
+    'job_role': 'target_job_role',
+    'target_job_role': 'target_job_role',
+}
+REQUIRED_FIELDS = ['degree', 'specialization', 'skills', 'target_job_role']
+LIST_FIELDS = ('skills', 'certifications')
+MAX_LENGTHS = {field: TrainingData._meta.get_field(field).max_length for field in REQUIRED_FIELDS}
+
+
+class UploadError(Exception):
+    """
+    The file cannot be ingested at all, e.g. a required column is missing.
+    """
+
+
+def _decoded_lines(binary_lines, counter):
+    # Undecodable bytes become U+FFFD so only their row is rejected
+    for line in binary_lines:
+        counter[0] += len(line)
+        yield line.decode('utf-8', errors='replace')
+
+
+def _column_map(header):
+    """
+    Field name per column index of the header row.
+    """
+    if header and header[0].startswith('\ufeff'):
+        header[0] = header[0][1:]
+    columns = {}
+    for index, name in enumerate(header or []):
+        field = COLUMN_ALIASES.get(name.strip().lower().replace(' ', '_'))
+        if field and field not in columns.values():
+            columns[index] = field
+    missing = [field for field in REQUIRED_FIELDS if field not in columns.values()]
+    if missing:
+        raise UploadError(f"Missing columns: {', '.join(missing)}. Expected Degree, Specialization, Skills, "
+                          f"Certifications and Job_Role.")
+    return columns
+
+
+def _normalize_list(value):
+    items = []
+    seen = set()
+    for item in value.split(','):
+        item = " ".join(item.split())
+        if item and item.lower() not in seen:
+            seen.add(item.lower())
+            items.append(item)
+    return ", ".join(items)
+
+
+def normalize_row(columns, row, width):
+    """
+    A CSV row as TrainingData field values, or ValueError with the reason
+    it is rejected.
+    """
+    if len(row) != width:
+        raise ValueError(f"{len(row)} fields, the header has {width}")
+    values = {'certifications': ''}
+    for index, field in columns.items():
+        value = row[index]
+        if '\ufffd' in value:
+            raise ValueError(f"{field} is not valid UTF-8")
+        values[field] = _normalize_list(value) if field in LIST_FIELDS else " ".join(value.split())
+    for field in REQUIRED_FIELDS:
+        if not values[field]:
+            raise ValueError(f"{field} is empty")
+        max_length = MAX_LENGTHS[field]
+        if max_length and len(values[field]) > max_length:
+            raise ValueError(f"{field} is longer than {max_length} characters")
+    return values
+
+
+def read_header(binary_lines):
+    """
+    Checks the header row of a CSV upload, raising UploadError if it lacks
+    a required column.
+    """
+    reader = csv.reader(_decoded_lines(binary_lines, [0]))
+    _column_map(next(reader, None))
+
+
+def ingest_csv(binary_lines, size, progress=None, chunk_rows=None, max_rejects=None):
+    """
+    Streams a training data CSV (an iterable of byte lines, such as an open
+    file) into TrainingData: rows are validated and normalized, and every
+    chunk_rows rows are inserted in one transaction. Rejected rows are
+    skipped and reported with their line number.
+
+    progress(percent, rows_inserted, rows_rejected, rejects) is called
+    after each committed chunk. Returns the same counts as a dict.
+    """
+    chunk_rows = chunk_rows or settings.ML_UPLOAD_CHUNK_ROWS
+    max_rejects = settings.ML_UPLOAD_MAX_REJECTS if max_rejects is None else max_rejects
+    bytes_read = [0]
+    reader = csv.reader(_decoded_lines(binary_lines, bytes_read))
+    try:
+        header = next(reader, None)
+    except csv.Error as e:
+        raise UploadError(f"Cannot read the header row: {e}")
+    columns = _column_map(header)
+    result = {'rows_inserted': 0, 'rows_rejected': 0, 'rejects': []}
+
+    def reject(line, error):
+        result['rows_rejected'] += 1
+        if len(result['rejects']) < max_rejects:
+            result['rejects'].append({'line': line, 'error': error})
+
+    def commit(chunk):
+        with transaction.atomic():
+            TrainingData.objects.bulk_create(chunk, batch_size=INSERT_BATCH)
+        result['rows_inserted'] += len(chunk)
+        if progress:
+            progress(min(100, bytes_read[0] * 100 // max(size, 1)), result['rows_inserted'],
+                     result['rows_rejected'], result['rejects'])
+
+    chunk = []
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            # e.g. a NUL byte; the reader carries on from the next line
+            reject(reader.line_num, str(e))
+            continue
+        if not row:
+            continue
+        try:
+            chunk.append(TrainingData(**normalize_row(columns, row, len(header))))
+        except ValueError as e:
+            reject(reader.line_num, str(e))
+            continue
+        if len(chunk) >= chunk_rows:
+            commit(chunk)
+            chunk = []
+    commit(chunk)
+    return result
+
+
+def store_training_upload(file, requested_by=None):
+    """
+    Copies an uploaded CSV under ML_UPLOAD_DIR, where it outlives the
+    request, and queues it as a TrainingUpload.
+    """
+    os.makedirs(settings.ML_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(settings.ML_UPLOAD_DIR, f"{uuid.uuid4().hex}.csv")
+    with open(path, 'wb') as f:
+        for data in file.chunks():
+            f.write(data)
+    return TrainingUpload.objects.create(
+        file_name=file.name[:255], stored_path=path, size=file.size, requested_by=requested_by
+    )
+
+
+def _remove_stored(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def expire_stale_uploads():
+    """
+    Fails uploads whose worker stopped sending heartbeats, e.g. because the
+    process was killed. They are not queued again: the chunks committed so
+    far stay inserted and would be added twice.
+    """
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.ML_TRAINING_JOB_LEASE)
+    stale = TrainingUpload.objects.filter(status='processing', heartbeat_at__lt=cutoff)
+    expired = 0
+    for upload_id, stored_path in stale.values_list('upload_id', 'stored_path'):
+        if stale.filter(pk=upload_id).update(
+            status='failed', finished_at=timezone.now(), message='Upload worker stopped responding'
+        ):
+            _remove_stored(stored_path)
+            expired += 1
+    return expired
+
+
+def claim_training_upload():
+    """
+    The oldest queued upload, marked as taken by this process, or None.
+    """
+    expire_stale_uploads()
+    upload = TrainingUpload.objects.filter(status='queued').order_by('upload_id').first()
+    if upload is None:
+        return None
+    claimed = TrainingUpload.objects.filter(pk=upload.pk, status='queued').update(
+        status='processing', worker=_worker_name(), started_at=timezone.now(), heartbeat_at=timezone.now()
+    )
+    return upload if claimed else None
+
+
+def _heartbeat(upload_id, stop):
+    # Keeps the lease while a chunk is read and inserted. Training jobs queued
+    # meanwhile wait for this worker to finish the upload, so their lease is
+    # kept as well instead of expiring as never picked up
+    try:
+        while not stop.wait(settings.ML_TRAINING_JOB_HEARTBEAT):
+            TrainingUpload.objects.filter(pk=upload_id, status='processing').update(heartbeat_at=timezone.now())
+            TrainingJob.objects.filter(active=True, status='queued', worker='').update(heartbeat_at=timezone.now())
+    finally:
+        connection.close()
+
+
+def run_training_upload(upload):
+    """
+    Ingests a claimed upload, recording progress and rejects on its row.
+    Stops if the upload was expired meanwhile.
+    """
+    current = TrainingUpload.objects.filter(pk=upload.pk, status='processing')
+
+    def progress(percent, rows_inserted, rows_rejected, rejects):
+        if not current.update(
+            progress=percent, rows_inserted=rows_inserted, rows_rejected=rows_rejected, rejects=rejects,
+            heartbeat_at=timezone.now()
+        ):
+            raise UploadError('The upload expired after its worker stopped responding')
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(upload.pk, stop), name='upload-heartbeat', daemon=True)
+    heartbeat.start()
+    logger.info("Training upload %s (%s) started", upload.upload_id, upload.file_name)
+    try:
+        with open(upload.stored_path, 'rb') as f:
+            result = ingest_csv(f, upload.size, progress)
+        current.update(
+            status='done', progress=100, finished_at=timezone.now(),
+            message=f"{result['rows_inserted']} records added, {result['rows_rejected']} rows rejected", **result
+        )
+    except Exception as e:
+        logger.exception("Training upload %s failed", upload.upload_id)
+        # Chunks committed before the failure stay inserted; their count is on the row
+        current.update(status='failed', finished_at=timezone.now(), message=str(e))
+    finally:
+        stop.set()
+        heartbeat.join()
+        _remove_stored(upload.stored_path)
+    logger.info("Training upload %s finished", upload.upload_id)
+
+
+def start_training_upload(upload):
+    """
+    Hands a queued upload to the executor set by ML_TRAINING_EXECUTOR, as
+    start_training_job does for training jobs.
+    """
+    if settings.ML_TRAINING_EXECUTOR == 'subprocess':
+        _spawn_worker()
+    elif settings.ML_TRAINING_EXECUTOR == 'thread':
+        def run():
+            try:
+                claimed = claim_training_upload()
+                if claimed is not None:
+                    run_training_upload(claimed)
+            finally:
+                connection.close()
+        threading.Thread(target=run, name=f'training-upload-{upload.upload_id}').start()
+    # 'worker': a running `manage.py train_worker` claims it
+
+
+def upload_status(upload):
+    return {
+        'upload_id': upload.upload_id,
+        'file_name': upload.file_name,
+        'size': upload.size,
+        'status': upload.status,
+        'progress': upload.progress,
+        'rows_inserted': upload.rows_inserted,
+        'rows_rejected': upload.rows_rejected,
+        'rejects': upload.rejects,
+        'requested_by': upload.requested_by_id,
+        'worker': upload.worker,
+        'created_at': upload.created_at,
+        'started_at': upload.started_at,
+        'finished_at': upload.finished_at,
+        'message': upload.message,
+    }
@@ -0,0 +1,242 @@
+import os
+import sys
+import socket
+import datetime
+import logging
+import threading
+import subprocess
+from django.conf import settings
+from django.db import IntegrityError, transaction, connection
+from django.utils import timezone
+from users.models import TrainingJob, Adminlogs
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingCancelled(Exception):
+    """
+    Raised inside train_model at its next progress report once the job was
+    cancelled (or its lease given to another worker).
+    """
+
+
+def _worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def expire_stale_jobs():
+    """
+    Fails active jobs whose worker stopped sending heartbeats, e.g. because
+    the process was killed, or that no worker picked up, so they no longer
+    hold the lock.
+    """
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.ML_TRAINING_JOB_LEASE)
+    stale = TrainingJob.objects.filter(active=True, heartbeat_at__lt=cutoff)
+    return (
+        stale.filter(worker='').update(
+            active=None, status='failed', finished_at=timezone.now(), message='No training worker picked up the job'
+        )
+        + stale.update(
+            active=None, status='failed', finished_at=timezone.now(), message='Training worker stopped responding'
+        )
+    )
+
+
+def create_training_job(mode, requested_by=None):
+    """
+    Queues a training job unless one is already queued or running. Returns
+    (job, created): the new job, or the one that holds the lock.
+    """
+    expire_stale_jobs()
+    while True:
+        try:
+            with transaction.atomic():
+                job = TrainingJob.objects.create(
+                    mode=mode, requested_by=requested_by, active=True, heartbeat_at=timezone.now()
+                )
+            return job, True
+        except IntegrityError:
+            job = TrainingJob.objects.filter(active=True).first()
+            # Otherwise it finished in between; try again
+            if job is not None:
+                return job, False
+
+
+def claim_training_job():
+    """
+    The queued job, marked as taken by this process, or None. The
+    conditional UPDATE keeps two polling workers from both taking it.
+    """
+    expire_stale_jobs()
+    job = TrainingJob.objects.filter(active=True, status='queued', worker='').first()
+    if job is None:
+        return None
+    claimed = TrainingJob.objects.filter(pk=job.pk, worker='').update(worker=_worker_name(), heartbeat_at=timezone.now())
+    return job if claimed else None
+
+
+def cancel_training_job(job_id):
+    """
+    Asks a queued or running job to stop at its next progress report.
+    Returns False if it has already finished.
+    """
+    return TrainingJob.objects.filter(pk=job_id, active=True).update(cancel_requested=True) > 0
+
+
+class JobProgress:
+    """
+    Passed to train_model as its progress callback: each call records the
+    stage and percentage on the job row, in one UPDATE that also checks the
+    job was not cancelled.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+    def __call__(self, status, percent):
+        updated = TrainingJob.objects.filter(pk=self.job_id, active=True, cancel_requested=False).update(
+            status=status, progress=percent, heartbeat_at=timezone.now()
+        )
+        if not updated:
+            raise TrainingCancelled()
+
+
+def _heartbeat(job_id, stop):
+    # Keeps the lease while train_model is inside one long sklearn call
+    try:
+        while not stop.wait(settings.ML_TRAINING_JOB_HEARTBEAT):
+            TrainingJob.objects.filter(pk=job_id, active=True).update(heartbeat_at=timezone.now())
+    finally:
+        connection.close()
+
+
+def _finish(job, status, message, **fields):
+    # Only if the job still holds the lock (it was not expired meanwhile)
+    TrainingJob.objects.filter(pk=job.pk, active=True).update(
+        active=None, status=status, message=message, finished_at=timezone.now(), **fields
+    )
+    if job.requested_by_id:
+        Adminlogs.objects.create(
+            admin_id=job.requested_by_id,
+            target_user_id=job.requested_by_id,  # Self-referencing for system actions
+            action_type=f'TRAINING_{"COMPLETED" if status == "done" else status.upper()}',
+            timestamp=timezone.now()
+        )
+
+
+def run_training_job(job_id, n_jobs=None):
+    """
+    Runs a queued job to the end in the calling thread. n_jobs is passed to
+    the forest fit.
+    """
+    from ml_service.train import train_model
+
+    job = TrainingJob.objects.get(pk=job_id)
+    # Unclaimed, or claimed by this process (train_worker, the thread executor)
+    started = TrainingJob.objects.filter(pk=job_id, worker__in=['', _worker_name()]).update(
+        worker=_worker_name(), started_at=timezone.now(), heartbeat_at=timezone.now()
+    )
+    if not started:
+        logger.warning("Training job %s is claimed by another worker; not running it", job_id)
+        return
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(job_id, stop), name='training-heartbeat', daemon=True)
+    heartbeat.start()
+    try:
+        logger.info("Training job %s (%s) started", job_id, job.mode)
+        result = train_model(job.mode, progress=JobProgress(job_id), n_jobs=n_jobs)
+        if result.get('status') == 'success':
+            _finish(job, 'done', result['message'], progress=100,
+                    version=result.get('version'), accuracy=result.get('accuracy'))
+        else:
+            _finish(job, 'failed', result.get('message'))
+    except TrainingCancelled:
+        _finish(job, 'cancelled', 'Cancelled by an admin')
+    except Exception as e:
+        logger.exception("Training job %s failed", job_id)
+        _finish(job, 'failed', str(e))
+    finally:
+        stop.set()
+        heartbeat.join()
+    logger.info("Training job %s finished", job_id)
+
+
+def lower_priority():
+    """
+    Gives the calling process the CPU priority ML_TRAINING_NICE, so web
+    workers win when both want the same core.
+    """
+    nice = settings.ML_TRAINING_NICE
+    os.setpriority(os.PRIO_PROCESS, 0, nice)
+    # With autogroup scheduling (Linux desktops and many servers) a session
+    # competes as a group and the process nice value only counts inside it,
+    # so the group's nice is set as well. Only by a session leader: otherwise
+    # the group is the shell or supervisor session that started the process
+    if os.getsid(0) != os.getpid():
+        return
+    try:
+        with open('/proc/self/autogroup', 'w') as f:
+            f.write(str(nice))
+    except OSError:
+        pass
+
+
+def _spawn_worker():
+    """
+    Starts `manage.py train_worker --once` in its own session, so the fit
+    has its own process, memory and cores and outlives a worker restart.
+    train_worker lowers its own priority as it starts.
+    """
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'train_worker', '--once'],
+        cwd=settings.BASE_DIR, stdin=subprocess.DEVNULL, start_new_session=True
+    )
+    # Reaped in the background so it does not linger as a zombie
+    threading.Thread(target=process.wait, name='training-worker-reaper', daemon=True).start()
+
+
+def start_training_job(mode, requested_by=None):
+    """
+    Single-flight retrain: queues a job and hands it to the executor set by
+    ML_TRAINING_EXECUTOR, or returns the job already in progress. Returns
+    (job, created).
+    """
+    job, created = create_training_job(mode, requested_by)
+    if not created:
+        return job, created
+    if settings.ML_TRAINING_EXECUTOR == 'subprocess':
+        _spawn_worker()
+    elif settings.ML_TRAINING_EXECUTOR == 'thread':
+        # In the web worker itself, as before train_worker existed. Claimed
+        # first, as claim_training_job does, so a polling train_worker skips it
+        claimed = TrainingJob.objects.filter(pk=job.pk, worker='').update(
+            worker=_worker_name(), heartbeat_at=timezone.now()
+        )
+        if claimed:
+            def run():
+                try:
+                    run_training_job(job.job_id)
+                finally:
+                    connection.close()
+            threading.Thread(target=run, name=f'training-job-{job.job_id}').start()
+    # 'worker': a running `manage.py train_worker` claims it
+    return job, created
+
+
+def job_status(job):
+    return {
+        'job_id': job.job_id,
+        'mode': job.mode,
+        'status': job.status,
+        'progress': job.progress,
+        'cancel_requested': job.cancel_requested,
+        'requested_by': job.requested_by_id,
+        'worker': job.worker,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'heartbeat_at': job.heartbeat_at,
+        'version': job.version,
+        'accuracy': job.accuracy,
+        'message': job.message,
+    }
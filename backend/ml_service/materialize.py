@@ -0,0 +1,229 @@
+import os
+import json
+import datetime
+import logging
+import threading
+from django.conf import settings
+from django.db import connection, close_old_connections, transaction
+from django.utils import timezone
+from users.models import CurrentPrediction, PredictionRebuild
+from .registry import registry
+from .jobs import _worker_name
+from .profiles import load_user_profiles
+from .predict import predict_jobs
+
+logger = logging.getLogger(__name__)
+
+
+def save_current_predictions(predictions_by_user, version):
+    """
+    Upserts one CurrentPrediction row per user: {user_id: top roles}.
+    """
+    rows = [
+        CurrentPrediction(user_id=user_id, predictions=json.dumps(predictions), model_version=version, is_stale=False)
+        for user_id, predictions in predictions_by_user.items()
+    ]
+    if not rows:
+        return
+    # MySQL upserts on any unique key and rejects an explicit target
+    unique_fields = ['user'] if connection.features.supports_update_conflicts_with_target else None
+    CurrentPrediction.objects.bulk_create(
+        rows, batch_size=1000, update_conflicts=True, unique_fields=unique_fields,
+        update_fields=['predictions', 'model_version', 'is_stale', 'updated_at']
+    )
+
+
+def refresh_user_predictions(user_ids):
+    """
+    Recomputes the materialized predictions of these users with one
+    predict_proba. Users who no longer have education lose their row.
+    Returns the number of rows written.
+    """
+    user_ids = list(user_ids)
+    profiles = load_user_profiles(user_ids)
+    gone = [user_id for user_id in user_ids if user_id not in profiles]
+    if gone:
+        CurrentPrediction.objects.filter(user_id__in=gone).delete()
+    if not profiles:
+        return 0
+
+    result = predict_jobs(list(profiles.values()))
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+    save_current_predictions(
+        {user_id: row['predictions'] for user_id, row in zip(profiles, result['results'])},
+        result['model_version']
+    )
+    return len(profiles)
+
+
+def claim_rebuild(version):
+    """
+    True if this process is to recompute the rows of other model versions
+    now that version is served. The first process to see the version claims
+    the single PredictionRebuild row with a conditional UPDATE; a claim whose
+    heartbeat lapsed before it finished is taken over.
+    """
+    PredictionRebuild.objects.get_or_create(pk=1)
+    now = timezone.now()
+    cutoff = now - datetime.timedelta(seconds=settings.ML_MATERIALIZE_LEASE)
+    rebuild = PredictionRebuild.objects.filter(pk=1)
+    return bool(
+        rebuild.exclude(version=version).update(
+            version=version, worker=_worker_name(), heartbeat_at=now, finished_at=None
+        )
+        or rebuild.filter(version=version, finished_at=None, heartbeat_at__lt=cutoff).update(
+            worker=_worker_name(), heartbeat_at=now
+        )
+    )
+
+
+def rebuild_pending(version):
+    """
+    True while another process is still rebuilding the rows for version.
+    """
+    return PredictionRebuild.objects.filter(pk=1, version=version, finished_at=None).exists()
+
+
+def mark_stale(user_id):
+    """
+    Called when a user's skills, certifications or education change. Reads
+    ignore the row from now on, and it is recomputed once the change commits.
+    """
+    CurrentPrediction.objects.filter(user_id=user_id).update(is_stale=True)
+    transaction.on_commit(lambda: prediction_refresher.enqueue([user_id]))
+
+
+def current_prediction(user_id):
+    """
+    The materialized prediction for this user if it is up to date with the
+    served model version, else None. A single primary key lookup.
+    """
+    loaded = registry.get()
+    if loaded is None:
+        return None
+    prediction_refresher.follow_version(loaded.version)
+    predictions = CurrentPrediction.objects.filter(
+        user_id=user_id, model_version=loaded.version, is_stale=False
+    ).values_list('predictions', flat=True).first()
+    if predictions is None:
+        return None
+    return {"predictions": json.loads(predictions), "model_version": loaded.version}
+
+
+class PredictionRefresher:
+    """
+    Background thread that keeps CurrentPrediction rows fresh: users queued by
+    the profile signals are refreshed in batches, and when a new model version
+    is served every row computed with another version is recomputed, walking
+    them by user_id. That rebuild runs in the one process that claims it (see
+    claim_rebuild); the others only check back every ML_MATERIALIZE_LEASE
+    seconds, to take it over if the claimant died.
+    """
+
+    def __init__(self, batch_size=None):
+        self._batch_size = batch_size
+        self._cond = threading.Condition()
+        self._user_ids = set()
+        self._version = None
+        self._outdated = False
+        self._watching = None
+        self._worker = None
+        self._worker_pid = None
+        self.refreshed = 0
+        self.failed = 0
+
+    @property
+    def batch_size(self):
+        return self._batch_size or settings.ML_MATERIALIZE_BATCH_SIZE
+
+    def _ensure_worker(self):
+        # Same as MicroBatcher: the thread does not survive a gunicorn fork
+        if self._worker is None or self._worker_pid != os.getpid() or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='prediction-refresher', daemon=True)
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def enqueue(self, user_ids):
+        with self._cond:
+            self._user_ids.update(user_ids)
+            self._ensure_worker()
+            self._cond.notify()
+
+    def follow_version(self, version):
+        """
+        Schedules the rebuild of all outdated rows the first time this worker
+        sees a model version, if no other process has claimed it.
+        """
+        if version == self._version:
+            return
+        with self._cond:
+            if version == self._version:
+                return
+            self._version = version
+            self._outdated = True
+            self._ensure_worker()
+            self._cond.notify()
+
+    def _refresh(self, user_ids):
+        try:
+            self.refreshed += refresh_user_predictions(user_ids)
+        except Exception:
+            self.failed += len(user_ids)
+            logger.exception("Prediction refresh failed for %d users", len(user_ids))
+
+    def _refresh_outdated(self, version):
+        if not claim_rebuild(version):
+            # Another process rebuilds them: watch its lease until it is done
+            self._watching = version if rebuild_pending(version) else None
+            return
+        self._watching = None
+        claim = PredictionRebuild.objects.filter(pk=1, version=version, worker=_worker_name())
+        last_user_id = 0
+        while version == self._version:
+            user_ids = list(
+                CurrentPrediction.objects.filter(user_id__gt=last_user_id).exclude(model_version=version)
+                .order_by('user_id').values_list('user_id', flat=True)[:self.batch_size]
+            )
+            if not user_ids:
+                claim.update(finished_at=timezone.now())
+                logger.info("Materialized predictions refreshed for model version %s", version)
+                return
+            self._refresh(user_ids)
+            last_user_id = user_ids[-1]
+            if not claim.update(heartbeat_at=timezone.now()):
+                # Lease lapsed and another process took the rebuild over
+                return
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._user_ids and not self._outdated:
+                    timeout = settings.ML_MATERIALIZE_LEASE if self._watching == self._version else None
+                    if not self._cond.wait(timeout):
+                        # Check whether the rebuild finished or its claimant died
+                        self._outdated = True
+                outdated, self._outdated = self._outdated, False
+                version = self._version
+                user_ids = sorted(self._user_ids)[:self.batch_size]
+                self._user_ids.difference_update(user_ids)
+            close_old_connections()
+            try:
+                if user_ids:
+                    self._refresh(user_ids)
+                if outdated:
+                    self._refresh_outdated(version)
+            finally:
+                close_old_connections()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'version': self._version,
+                'queued': len(self._user_ids),
+                'refreshed': self.refreshed,
+                'failed': self.failed,
+            }
+
+
+prediction_refresher = PredictionRefresher()
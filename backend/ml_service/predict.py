@@ -1,8 +1,15 @@
-import joblib
-import os
+import copy
+import logging
+import threading
 import pandas as pd
 from django.conf import settings
+from .registry import registry
+from .cache import prediction_cache, load_warm_profiles
+from .batching import MicroBatcher
+from .forest import SMALL_BATCH_ROWS
+from .timing import span, untimed
 
+logger = logging.getLogger(__name__)
 
 # Define required skills for each role (Extend this list as needed)
 ROLE_SKILLS_MAPPING = {
@@ -43,58 +50,150 @@ ROLE_SKILLS_MAPPING = {
     "data science stack": ["Python", "Pandas", "NumPy", "Scikit-learn", "SQL", "Matplotlib"],
 }
 
+def _input_row(user_profile):
+    """
+    Feature columns the pipeline was trained on, for one profile.
+    """
+    text_features = user_profile.get('skills', '') + " " + user_profile.get('certifications', '')
+    return {
+        'degree': user_profile.get('degree', ''),
+        'specialization': user_profile.get('specialization', ''),
+        'text_features': text_features
+    }
+
+def _rank_roles(probabilities, top_indices, classes, user_skills_str):
+    """
+    Top roles with confidence and the skills the user is missing for each.
+    """
+    top_roles = []
+    user_skills_list = [s.strip().lower() for s in user_skills_str.split(',') if s.strip()]
+
+    for idx in top_indices:
+        role = classes[idx]
+        required_skills = ROLE_SKILLS_MAPPING.get(role, [])
+        
+        # Calculate missing skills
+        missing_skills = [
+            skill for skill in required_skills 
+            if skill.lower() not in user_skills_list
+        ]
+
+        top_roles.append({
+            "role": role,
+            "confidence": round(float(probabilities[idx]) * 100, 2),
+            "missing_skills": missing_skills
+        })
+    return top_roles
+
+def _predict_proba(loaded, user_profiles):
+    """
+    Class probabilities for each profile from one loaded model snapshot.
+    """
+    with span('features'):
+        if loaded.features is not None and settings.ML_FAST_FEATURES:
+            # Compiled extractor: profile dicts straight to sparse feature rows
+            clf = loaded.classifier
+            if (loaded.forest is not None and settings.ML_INFERENCE_ENGINE == 'compiled'
+                    and len(user_profiles) <= SMALL_BATCH_ROWS):
+                # Same probabilities, evaluated over the flattened node arrays
+                clf = loaded.forest
+            input_data = loaded.features.transform(user_profiles)
+        else:
+            # Prepare input dataframe
+            clf = loaded.pipeline
+            input_data = pd.DataFrame([_input_row(profile) for profile in user_profiles])
+    with span('predict_proba'):
+        probabilities = clf.predict_proba(input_data)
+    return probabilities, clf.classes_
+
+def _predict_rows(loaded, user_profiles):
+    """
+    Top 3 roles for every profile, computed with a single predict_proba.
+    """
+    probabilities, classes = _predict_proba(loaded, user_profiles)
+    with span('rank'):
+        top_indices = probabilities.argsort(axis=1)[:, -3:][:, ::-1]
+        return [
+            _rank_roles(row, row_top, classes, profile.get('skills', ''))
+            for row, row_top, profile in zip(probabilities, top_indices, user_profiles)
+        ]
+
+micro_batcher = MicroBatcher(_predict_rows)
+
+def _warm_cache(loaded):
+    """
+    Pre-computes the most frequent training profiles exported by train_model
+    for this model version, so popular profiles hit the cache from the start.
+    """
+    profiles = load_warm_profiles(loaded.artifact_dir, loaded.version)
+    if not profiles:
+        return
+    try:
+        # Timed as one cache_warm stage, not as requests' features/predict_proba/rank
+        with span('cache_warm'), untimed():
+            top_roles_list = _predict_rows(loaded, profiles)
+        for profile, top_roles in zip(profiles, top_roles_list):
+            prediction_cache.put(prediction_cache.key(profile, loaded.version), top_roles)
+        logger.info("Prediction cache warmed with %d profiles for model version %s", len(profiles), loaded.version)
+    except Exception:
+        logger.exception("Prediction cache warm-up failed")
+
 def predict_job(user_profile):
     """
     Predicts job role based on user profile.
     user_profile: dict containing 'degree', 'specialization', 'skills', 'certifications'
     """
-    model_path = os.path.join(settings.BASE_DIR, 'ml_models', 'job_predictor.pkl')
-    
-    if not os.path.exists(model_path):
-        return {"error": "Model not found. Please train the model first."}
-    
     try:
-        clf = joblib.load(model_path)
-        
-        # Prepare input dataframe
-        user_skills_str = user_profile.get('skills', '')
-        text_features = user_skills_str + " " + user_profile.get('certifications', '')
-        
-        input_data = pd.DataFrame([{
-            'degree': user_profile.get('degree', ''),
-            'specialization': user_profile.get('specialization', ''),
-            'text_features': text_features
-        }])
-        
-        # Predict
-        probabilities = clf.predict_proba(input_data)[0]
-        classes = clf.classes_
-        
-        # Get top 3 predictions
-        top_indices = probabilities.argsort()[-3:][::-1]
-        top_roles = []
-        
-        user_skills_list = [s.strip().lower() for s in user_skills_str.split(',') if s.strip()]
-
-        for idx in top_indices:
-            role = classes[idx]
-            required_skills = ROLE_SKILLS_MAPPING.get(role, [])
-            
-            # Calculate missing skills
-            missing_skills = [
-                skill for skill in required_skills 
-                if skill.lower() not in user_skills_list
-            ]
-
-            top_roles.append({
-                "role": role,
-                "confidence": round(float(probabilities[idx]) * 100, 2),
-                "missing_skills": missing_skills
-            })
+        with span('model_load'):
+            loaded = registry.get()
+        if loaded is None:
+            return {"error": "Model not found. Please train the model first."}
+
+        # A new model version empties the cache and warms it in the background
+        if prediction_cache.sync(loaded.version):
+            threading.Thread(target=_warm_cache, args=(loaded,), daemon=True).start()
+
+        with span('cache'):
+            cache_key = prediction_cache.key(user_profile, loaded.version)
+            top_roles = prediction_cache.get(cache_key)
+        if top_roles is None:
+            if settings.ML_MICRO_BATCHING:
+                # Share one predict_proba with concurrent requests; the stages
+                # themselves are timed on the batcher thread
+                with span('batch_wait'):
+                    top_roles = micro_batcher.predict(loaded, cache_key, user_profile)
+            else:
+                top_roles = _predict_rows(loaded, [user_profile])[0]
+            prediction_cache.put(cache_key, top_roles)
         
         return {
-            "predictions": top_roles
+            "predictions": copy.deepcopy(top_roles),
+            "model_version": loaded.version
         }
         
     except Exception as e:
         return {"error": str(e)}
+
+def predict_jobs(user_profiles):
+    """
+    Batch version of predict_job.
+    Assembles features for all profiles and runs a single predict_proba,
+    returning {"results": [{"predictions": [...]}, ...]} in input order.
+    """
+    try:
+        with span('model_load'):
+            loaded = registry.get()
+        if loaded is None:
+            return {"error": "Model not found. Please train the model first."}
+        if not user_profiles:
+            return {"results": [], "model_version": loaded.version}
+
+        results = [{"predictions": top_roles} for top_roles in _predict_rows(loaded, user_profiles)]
+
+        return {
+            "results": results,
+            "model_version": loaded.version
+        }
+
+    except Exception as e:
+        return {"error": str(e)}
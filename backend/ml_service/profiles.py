@@ -0,0 +1,75 @@
+from users.models import Education, Skill, Certification
+from users.utils import EncryptionUtil
+
+
+def load_user_profiles(user_ids):
+    """
+    Builds predict_job profiles for many users in three queries, whatever the
+    number of users. Mirrors PredictJobView: the first education row (by id)
+    with its specialization decrypted, and all skills and certifications
+    joined with ", ".
+
+    user_ids may also be a values('user_id') queryset, which is sent as a
+    subquery instead of a list of ids.
+
+    Returns {user_id: profile}. Users without education are left out.
+    """
+    if not hasattr(user_ids, 'query'):
+        user_ids = list(user_ids)
+    profiles = {}
+
+    educations = Education.objects.filter(user_id__in=user_ids).order_by('user_id', 'education_id').values_list('user_id', 'degree', 'specialization')
+    for user_id, degree, specialization in educations:
+        # First row per user wins, same as education_set.first()
+        if user_id not in profiles:
+            profiles[user_id] = {
+                'degree': degree, 'specialization': EncryptionUtil.decrypt(specialization) or '',
+                'skills': [], 'certifications': [],
+            }
+
+    skills = Skill.objects.filter(user_id__in=user_ids).order_by('skill_id').values_list('user_id', 'skill_name')
+    for user_id, skill_name in skills:
+        if user_id in profiles:
+            profiles[user_id]['skills'].append(skill_name)
+
+    certifications = Certification.objects.filter(user_id__in=user_ids).order_by('cert_id').values_list('user_id', 'cert_name')
+    for user_id, cert_name in certifications:
+        if user_id in profiles:
+            profiles[user_id]['certifications'].append(cert_name)
+
+    for profile in profiles.values():
+        profile['skills'] = ", ".join(profile['skills'])
+        profile['certifications'] = ", ".join(profile['certifications'])
+    return profiles
+
+
+PROFILE_TEXT_FIELDS = ('degree', 'specialization')
+PROFILE_LIST_FIELDS = ('skills', 'certifications')
+
+
+def clean_profile(profile):
+    """
+    A client supplied profile as the strings predict_job expects. Missing or
+    null fields become '', numbers their text, and skills or certifications
+    given as a list are joined with ", ".
+
+    Raises ValueError naming the first field that cannot be read as text.
+    """
+    if not isinstance(profile, dict):
+        raise ValueError('Each profile must be an object')
+
+    def text(name, value):
+        if value is None:
+            return ''
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f'{name} must be text')
+        return str(value).strip()
+
+    cleaned = {name: text(name, profile.get(name)) for name in PROFILE_TEXT_FIELDS}
+    for name in PROFILE_LIST_FIELDS:
+        value = profile.get(name)
+        if isinstance(value, list):
+            cleaned[name] = ", ".join(item for item in (text(name, entry) for entry in value) if item)
+        else:
+            cleaned[name] = text(name, value)
+    return cleaned
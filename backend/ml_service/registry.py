@@ -0,0 +1,289 @@
+import os
+import json
+import shutil
+import time
+import datetime
+import logging
+import threading
+import joblib
+from django.conf import settings
+from .features import load_features
+from .forest import load_forest
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILENAME = 'job_predictor.pkl'
+VERSION_FILENAME = 'job_predictor.version.json'
+# Versioned layout: <ML_MODEL_DIR>/versions/<version>/ holds every artifact of
+# one trained model plus its metadata; CURRENT names the one being served
+VERSIONS_DIRNAME = 'versions'
+CURRENT_FILENAME = 'CURRENT'
+METADATA_FILENAME = 'metadata.json'
+
+
+def new_model_version():
+    """
+    Version stamp for a freshly trained model, e.g. '20260118T093012.418305Z'.
+    Microseconds, so two trainings finishing in the same second do not share
+    a version directory.
+    """
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%S.%fZ')
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_version_stamp(model_dir, version, **metadata):
+    """
+    Version stamp of the flat (unversioned) layout, written after the pickle
+    is dumped so a new stamp always points at a complete artifact.
+    """
+    stamp = dict(metadata, version=version)
+    with open(os.path.join(model_dir, VERSION_FILENAME), 'w') as f:
+        json.dump(stamp, f)
+    return stamp
+
+
+def version_dir(model_dir, version):
+    return os.path.join(model_dir, VERSIONS_DIRNAME, version)
+
+
+def staging_dir(model_dir, version):
+    """
+    Empty directory to write a new version into. Hidden from list_versions
+    until publish_version renames it into place.
+    """
+    path = os.path.join(model_dir, VERSIONS_DIRNAME, f".{version}.{os.getpid()}.tmp")
+    os.makedirs(path)
+    return path
+
+
+def write_metadata(artifact_dir, version, **metadata):
+    """
+    Sidecar describing one version: row counts, accuracy, training time.
+    """
+    metadata = dict(metadata, version=version)
+    _write_atomic(os.path.join(artifact_dir, METADATA_FILENAME), json.dumps(metadata))
+    return metadata
+
+
+def read_metadata(artifact_dir):
+    try:
+        with open(os.path.join(artifact_dir, METADATA_FILENAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def read_current_version(model_dir):
+    try:
+        with open(os.path.join(model_dir, CURRENT_FILENAME)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def publish_version(model_dir, version, staged_dir=None):
+    """
+    Points CURRENT at a version, moving a freshly staged directory into place
+    first. Both steps are renames, so workers see either the old version or
+    the complete new one. Also how a rollback re-publishes an older version.
+    """
+    path = version_dir(model_dir, version)
+    if staged_dir is not None:
+        # rename() would silently replace an empty directory of that name
+        if os.path.exists(path):
+            raise ValueError(f"Model version {version} already exists")
+        os.rename(staged_dir, path)
+    if not os.path.exists(os.path.join(path, MODEL_FILENAME)):
+        raise ValueError(f"Model version {version} does not exist")
+    _write_atomic(os.path.join(model_dir, CURRENT_FILENAME), version)
+    return path
+
+
+def list_versions(model_dir):
+    """
+    Published versions, newest first, each with its metadata.
+    """
+    root = os.path.join(model_dir, VERSIONS_DIRNAME)
+    if not os.path.isdir(root):
+        return []
+    current = read_current_version(model_dir)
+    versions = []
+    for name in sorted(os.listdir(root), reverse=True):
+        path = os.path.join(root, name)
+        if name.startswith('.') or not os.path.exists(os.path.join(path, MODEL_FILENAME)):
+            continue
+        versions.append(dict(read_metadata(path), version=name, current=name == current))
+    return versions
+
+
+def prune_versions(model_dir, keep):
+    """
+    Deletes all but the newest `keep` versions, never the current one.
+    Workers still mapping a deleted file keep their pages until they reload.
+    """
+    removed = []
+    for info in list_versions(model_dir)[keep:]:
+        if not info['current']:
+            shutil.rmtree(version_dir(model_dir, info['version']), ignore_errors=True)
+            removed.append(info['version'])
+    return removed
+
+
+class LoadedModel:
+    """
+    Snapshot of one loaded artifact. A request keeps the snapshot it started
+    with, so a reload never swaps the pipeline out from under it.
+    """
+
+    def __init__(self, pipeline, version, path, signature, features=None, forest=None):
+        self.pipeline = pipeline
+        self.version = version
+        # Compiled feature extractor and bare classifier for the pandas-free path
+        self.features = features
+        self.classifier = pipeline.named_steps['classifier'] if features is not None else None
+        # Array-backed forest, only loaded when ML_INFERENCE_ENGINE is 'compiled'
+        self.forest = forest
+        self.path = path
+        self.artifact_dir = os.path.dirname(path)
+        self.signature = signature
+        self.loaded_at = datetime.datetime.now(datetime.timezone.utc)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of the job predictor.
+
+    The artifact is deserialized once per worker. Every ML_MODEL_CHECK_INTERVAL
+    seconds one request reads the CURRENT pointer and stats the artifact and,
+    if train_model published a new version (or an admin rolled back), loads it
+    and swaps the reference. Other requests never wait on a
+    reload while a model is already loaded - they keep using the current one.
+    """
+
+    def __init__(self, model_dir=None, check_interval=None):
+        self._model_dir = model_dir
+        self._check_interval = check_interval
+        self._current = None
+        self._last_check = 0.0
+        self._load_lock = threading.Lock()
+
+    @property
+    def model_dir(self):
+        return self._model_dir or settings.ML_MODEL_DIR
+
+    @property
+    def check_interval(self):
+        if self._check_interval is not None:
+            return self._check_interval
+        return settings.ML_MODEL_CHECK_INTERVAL
+
+    def _artifact(self):
+        """
+        (version, directory) currently published: the version CURRENT points
+        at, or (None, model_dir) for the flat layout of older deployments.
+        """
+        version = read_current_version(self.model_dir)
+        if version:
+            return version, version_dir(self.model_dir, version)
+        return None, self.model_dir
+
+    @property
+    def model_path(self):
+        return os.path.join(self._artifact()[1], MODEL_FILENAME)
+
+    def _read_stamp(self):
+        try:
+            with open(os.path.join(self.model_dir, VERSION_FILENAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _artifact_signature(self):
+        """
+        (version, mtime, size, directory) of the published artifact, or None if
+        there is none. Flat-layout models without a version stamp fall back to
+        their mtime.
+        """
+        version, artifact_dir = self._artifact()
+        try:
+            stat = os.stat(os.path.join(artifact_dir, MODEL_FILENAME))
+        except OSError:
+            return None
+        if not version:
+            version = self._read_stamp().get('version')
+        if not version:
+            version = datetime.datetime.fromtimestamp(
+                stat.st_mtime, datetime.timezone.utc
+            ).strftime('%Y%m%dT%H%M%S.%fZ')
+        return (version, stat.st_mtime_ns, stat.st_size, artifact_dir)
+
+    def _load(self, signature):
+        version, _, _, artifact_dir = signature
+        model_path = os.path.join(artifact_dir, MODEL_FILENAME)
+        # Arrays stored uncompressed in the pickle are mapped read-only, so
+        # every worker shares the page-cache copy instead of a private one.
+        pipeline = joblib.load(model_path, mmap_mode=settings.ML_MODEL_MMAP_MODE)
+        features = load_features(artifact_dir, version, pipeline)
+        forest = None
+        if features is not None and settings.ML_INFERENCE_ENGINE == 'compiled':
+            forest = load_forest(artifact_dir, version, pipeline.named_steps['classifier'],
+                                 mmap_mode=settings.ML_MODEL_MMAP_MODE)
+        loaded = LoadedModel(pipeline, version, model_path, signature, features, forest)
+        logger.info("[pid %d] Loaded model version %s from %s", os.getpid(), loaded.version, loaded.path)
+        return loaded
+
+    def get(self):
+        """
+        Returns the current LoadedModel, or None if no model has been trained yet.
+        """
+        current = self._current
+        if current is not None and time.monotonic() - self._last_check < self.check_interval:
+            return current
+
+        # Only one thread checks and reloads. With a model already loaded, the
+        # rest carry on with it instead of queueing behind the load.
+        if not self._load_lock.acquire(blocking=current is None):
+            return current
+        try:
+            current = self._current
+            self._last_check = time.monotonic()
+            signature = self._artifact_signature()
+            if signature is None or (current is not None and signature == current.signature):
+                return current
+            try:
+                self._current = self._load(signature)
+            except Exception:
+                if current is None:
+                    raise
+                # Keep serving the old model; the next check retries the load.
+                logger.exception("[pid %d] Model reload failed, keeping version %s", os.getpid(), current.version)
+            return self._current
+        finally:
+            self._load_lock.release()
+
+    def info(self):
+        """
+        What this worker is serving, for the admin model status endpoint.
+        """
+        current = self._current
+        return {
+            'pid': os.getpid(),
+            'loaded': current is not None,
+            'version': current.version if current else None,
+            'loaded_at': current.loaded_at.isoformat() if current else None,
+            'path': current.path if current else None,
+        }
+
+    def reset(self):
+        with self._load_lock:
+            self._current = None
+            self._last_check = 0.0
+
+
+registry = ModelRegistry()
@@ -0,0 +1,166 @@
+import io
+import os
+import json
+import hashlib
+import zipfile
+import numpy as np
+import pandas as pd
+from django.utils import timezone
+from .dataset import TRAINING_COLUMNS, _DictionaryColumn, stream_training_rows
+
+# A TrainingData snapshot is a zip file of:
+#   chunks/<n>/training_id.npy   int64 ids of chunk n
+#   chunks/<n>/<column>.npy      int32 dictionary codes of each string column
+#   dictionaries/<column>.json   the distinct values of each column, by code
+#   manifest.json                row counts, ids and the sha256 of every member
+# Members are written one chunk at a time as TrainingData is streamed, and
+# the manifest last, so an interrupted export leaves no valid snapshot.
+SNAPSHOT_FORMAT = 1
+MANIFEST_MEMBER = 'manifest.json'
+
+
+class SnapshotError(Exception):
+    """
+    The file is not a snapshot this version can read, or a member does not
+    match its checksum.
+    """
+
+
+def _npy_bytes(values):
+    buffer = io.BytesIO()
+    np.save(buffer, values, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def export_snapshot(path, chunk_size=None):
+    """
+    Writes every TrainingData row to a snapshot at path, reading the table
+    in keyset chunks. Returns the manifest.
+    """
+    columns = {name: _DictionaryColumn() for name in TRAINING_COLUMNS}
+    manifest = {'format': SNAPSHOT_FORMAT, 'columns': TRAINING_COLUMNS, 'rows': 0, 'training_id': 0,
+                'chunks': [], 'dictionaries': {}, 'created_at': timezone.now().isoformat()}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            def write(member, data):
+                archive.writestr(member, data)
+                return hashlib.sha256(data).hexdigest()
+
+            for n, chunk in enumerate(stream_training_rows(chunk_size)):
+                values = list(zip(*chunk))
+                prefix = f"chunks/{n:05d}"
+                files = {f"{prefix}/training_id.npy": write(f"{prefix}/training_id.npy", _npy_bytes(np.array(values[0], dtype=np.int64)))}
+                for (name, column), column_values in zip(columns.items(), values[1:]):
+                    start = len(column.codes)
+                    column.extend(column_values)
+                    member = f"{prefix}/{name}.npy"
+                    files[member] = write(member, _npy_bytes(np.frombuffer(column.codes, dtype=np.int32)[start:]))
+                manifest['chunks'].append({'rows': len(chunk), 'first_id': chunk[0][0], 'last_id': chunk[-1][0], 'files': files})
+                manifest['rows'] += len(chunk)
+                manifest['training_id'] = chunk[-1][0]
+            for name, column in columns.items():
+                member = f"dictionaries/{name}.json"
+                manifest['dictionaries'][name] = {
+                    'member': member, 'sha256': write(member, json.dumps(list(column.index)).encode())
+                }
+            archive.writestr(MANIFEST_MEMBER, json.dumps(manifest, indent=1))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return manifest
+
+
+class TrainingSnapshot:
+    """
+    Reads a snapshot written by export_snapshot, checking every member
+    against the sha256 in the manifest as it is read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            self._archive = zipfile.ZipFile(path)
+            data = self._archive.read(MANIFEST_MEMBER)
+            self.manifest = json.loads(data)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            raise SnapshotError(f"{path} is not a TrainingData snapshot: {e}")
+        if self.manifest.get('format') != SNAPSHOT_FORMAT or self.manifest.get('columns') != TRAINING_COLUMNS:
+            raise SnapshotError(f"{path} has snapshot format {self.manifest.get('format')} "
+                                f"with columns {self.manifest.get('columns')}; expected format {SNAPSHOT_FORMAT}")
+        # Identifies the snapshot in model metadata
+        self.checksum = hashlib.sha256(data).hexdigest()
+
+    def close(self):
+        self._archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read(self, member, sha256):
+        try:
+            data = self._archive.read(member)
+        except (KeyError, zipfile.BadZipFile) as e:
+            raise SnapshotError(f"{self.path}: cannot read {member}: {e}")
+        if hashlib.sha256(data).hexdigest() != sha256:
+            raise SnapshotError(f"{self.path}: {member} does not match its checksum")
+        return data
+
+    def _array(self, member, files):
+        return np.load(io.BytesIO(self._read(member, files[member])), allow_pickle=False)
+
+    def dictionaries(self):
+        return {
+            name: json.loads(self._read(entry['member'], entry['sha256']))
+            for name, entry in self.manifest['dictionaries'].items()
+        }
+
+    def chunks(self):
+        """
+        (training ids, {column: codes}) of each chunk, in id order.
+        """
+        for n, chunk in enumerate(self.manifest['chunks']):
+            prefix = f"chunks/{n:05d}"
+            files = chunk['files']
+            yield self._array(f"{prefix}/training_id.npy", files), {
+                name: self._array(f"{prefix}/{name}.npy", files) for name in TRAINING_COLUMNS
+            }
+
+    def verify(self):
+        """
+        Reads every member, raising SnapshotError at the first bad one.
+        """
+        self.dictionaries()
+        for _ in self.chunks():
+            pass
+
+    def rows(self):
+        """
+        TrainingData rows as (training_id, *TRAINING_COLUMNS) tuples, one
+        list per chunk.
+        """
+        dictionaries = {name: np.array(values, dtype=object) for name, values in self.dictionaries().items()}
+        for ids, codes in self.chunks():
+            yield list(zip(ids.tolist(), *(dictionaries[name][codes[name]] for name in TRAINING_COLUMNS)))
+
+    def frame(self):
+        """
+        The snapshot as load_training_frame returns TrainingData: a frame of
+        categorical columns, built from the codes without decoding a row.
+        """
+        dictionaries = self.dictionaries()
+        codes = {name: [] for name in TRAINING_COLUMNS}
+        for _, chunk in self.chunks():
+            for name in TRAINING_COLUMNS:
+                codes[name].append(chunk[name])
+        return pd.DataFrame({
+            name: pd.Categorical.from_codes(
+                np.concatenate(codes[name]) if codes[name] else np.array([], dtype=np.int32),
+                categories=dictionaries[name]
+            )
+            for name in TRAINING_COLUMNS
+        })
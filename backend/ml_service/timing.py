@@ -0,0 +1,130 @@
+import time
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+from django.conf import settings
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open ended
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Spans of the request being handled, when ServerTimingMiddleware collects them
+_request_spans = contextvars.ContextVar('prediction_request_spans', default=None)
+# Set while work that is not serving a request runs, e.g. cache warm-up
+_untimed = contextvars.ContextVar('prediction_untimed', default=False)
+
+
+class StageHistograms:
+    """
+    In-process latency histogram per named stage: count, total, max and
+    fixed log-scale buckets, so recording a span is a bisect and an add.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def record(self, name, elapsed_ms):
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                              'buckets': [0] * (len(BUCKETS_MS) + 1)}
+            stage['count'] += 1
+            stage['total_ms'] += elapsed_ms
+            stage['max_ms'] = max(stage['max_ms'], elapsed_ms)
+            stage['buckets'][bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+
+    @staticmethod
+    def _percentile(stage, fraction):
+        # Upper bound of the bucket holding the percentile (max for the open bucket)
+        rank = fraction * stage['count']
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, stage['buckets']):
+            seen += count
+            if seen >= rank:
+                return round(min(bound, stage['max_ms']), 3)
+        return round(stage['max_ms'], 3)
+
+    def snapshot(self):
+        with self._lock:
+            stages = {name: dict(stage, buckets=list(stage['buckets'])) for name, stage in self._stages.items()}
+        return {
+            name: {
+                'count': stage['count'],
+                'mean_ms': round(stage['total_ms'] / stage['count'], 3),
+                'p50_ms': self._percentile(stage, 0.5),
+                'p90_ms': self._percentile(stage, 0.9),
+                'p99_ms': self._percentile(stage, 0.99),
+                'max_ms': round(stage['max_ms'], 3),
+                'buckets': {
+                    (f"le_{bound}" if i < len(BUCKETS_MS) else 'inf'): count
+                    for i, (bound, count) in enumerate(zip(BUCKETS_MS + (None,), stage['buckets']))
+                },
+            }
+            for name, stage in sorted(stages.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+
+stage_timings = StageHistograms()
+
+
+@contextmanager
+def span(name):
+    """
+    Times the enclosed block as one prediction pipeline stage.
+    """
+    spans = _request_spans.get()
+    if _untimed.get() or (not settings.ML_STAGE_TIMING and spans is None):
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if settings.ML_STAGE_TIMING:
+            stage_timings.record(name, elapsed_ms)
+        if spans is not None:
+            spans.append((name, elapsed_ms))
+
+
+@contextmanager
+def untimed():
+    """
+    Leaves the spans inside the block out of the histograms and the
+    request's spans, so background work does not skew the stage latencies.
+    """
+    token = _untimed.set(True)
+    try:
+        yield
+    finally:
+        _untimed.reset(token)
+
+
+@contextmanager
+def collect_request_spans():
+    """
+    Gathers the spans recorded by this request's thread. Spans recorded on
+    the micro-batcher or refresher threads only reach the histograms.
+    """
+    spans = []
+    token = _request_spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _request_spans.reset(token)
+
+
+def server_timing_header(spans):
+    """
+    Server-Timing value for a list of (name, ms), repeated stages summed.
+    """
+    totals = {}
+    for name, elapsed_ms in spans:
+        totals[name] = totals.get(name, 0.0) + elapsed_ms
+    return ", ".join(f"{name};dur={elapsed_ms:.3f}" for name, elapsed_ms in totals.items())
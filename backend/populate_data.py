@@ -1,157 +1,134 @@
 import os
 import django
 import sys
-import random
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
 # Setup Django environment
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 django.setup()
 
+from django.db import connection, transaction
+from django.utils import timezone
 from users.models import TrainingData
+from users.seed_data import ARCHETYPES
+
+ROLES = list(ARCHETYPES)
+FIELDS = ['degrees', 'specializations', 'skills', 'certifications']
+# Each row takes 3-8 skills and 0-3 certifications, capped at what the archetype has
+COUNT_RANGES = {'skills': (3, 8), 'certifications': (0, 3)}
+
+
+def _tables():
+    """
+    Per field: every archetype's values in one flat array, with the offset
+    and number of values of each role.
+    """
+    tables = {}
+    for field in FIELDS:
+        lengths = np.array([len(ARCHETYPES[role][field]) for role in ROLES])
+        values = np.array([value for role in ROLES for value in ARCHETYPES[role][field]], dtype=object)
+        tables[field] = (values, np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return tables
+
+
+TABLES = _tables()
+
+
+def _sample_lists(rng, field, roles):
+    """
+    ", "-joined samples without replacement from each row's archetype list,
+    as random.sample picks them: the order of a random permutation.
+    """
+    values, offsets, lengths = TABLES[field]
+    low, high = COUNT_RANGES[field]
+    counts = np.minimum(rng.integers(low, high + 1, size=len(roles)), lengths[roles])
+    # Sorting random keys permutes each row; padding past the role's list sorts last
+    keys = rng.random((len(roles), lengths.max()))
+    keys[np.arange(lengths.max()) >= lengths[roles][:, None]] = np.inf
+    order = np.argsort(keys, axis=1)[:, :high]
+    # Positions past count are dropped below; clamped so they stay in the role's list
+    picks = values[offsets[roles][:, None] + np.minimum(order, lengths[roles][:, None] - 1)]
+    return [", ".join(row[:count]) for row, count in zip(picks.tolist(), counts.tolist())]
+
+
+def generate_batch(seed, index, size):
+    """
+    Rows (degree, specialization, skills, certifications, role) of batch
+    index. Each batch has its own stream spawned from seed, so the data
+    depends only on the seed and batch size, not on the worker count.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+    roles = rng.integers(len(ROLES), size=size)
+    columns = []
+    for field in ('degrees', 'specializations'):
+        values, offsets, lengths = TABLES[field]
+        columns.append(values[offsets[roles] + rng.integers(lengths[roles])].tolist())
+    columns.append(_sample_lists(rng, 'skills', roles))
+    columns.append(_sample_lists(rng, 'certifications', roles))
+    columns.append(np.array(ROLES, dtype=object)[roles].tolist())
+    return list(zip(*columns))
+
+
+def _batches(total, batch_size, seed, workers):
+    """
+    Generated batches in order, at most two per worker in flight so a slow
+    database does not let them pile up in memory.
+    """
+    sizes = [min(batch_size, total - start) for start in range(0, total, batch_size)]
+    if workers <= 1:
+        for index, size in enumerate(sizes):
+            yield generate_batch(seed, index, size)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for index, size in enumerate(sizes):
+            pending.append(pool.submit(generate_batch, seed, index, size))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _insert_sql():
+    # Plain executemany: the MySQL driver sends each batch as one multi-row INSERT
+    qn = connection.ops.quote_name
+    columns = ['degree', 'specialization', 'skills', 'certifications', 'target_job_role', 'created_at']
+    return (f"INSERT INTO {qn(TrainingData._meta.db_table)} ({', '.join(qn(c) for c in columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})")
+
+
+def populate_data(total=1000000, seed=None, workers=None, batch_size=10000):
+    workers = workers or os.cpu_count() or 1
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    print(f"Generating {total} realistic training records with diverse roles "
+          f"(seed {seed}, {workers} workers)...")
+
+    sql = _insert_sql()
+    created_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    start = time.perf_counter()
+    inserted = 0
+    for rows in _batches(total, batch_size, seed, workers):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, [row + (created_at,) for row in rows])
+        inserted += len(rows)
+        if inserted % 50000 < batch_size or inserted == total:
+            print(f"Inserted {inserted} records...")
+
+    print(f"Successfully added {inserted} records in {time.perf_counter() - start:.1f}s. "
+          f"Rerun with --seed {seed} to reproduce them.")
 
-def populate_data():
-    TOTAL_RECORDS = 1000000 # Targeted 1 Million for high accuracy without crashing
-    BATCH_SIZE = 5000
-    print(f"Generating {TOTAL_RECORDS} realistic training records with diverse roles...")
-    
-    # Define archetypes for realistic data generation
-    archetypes = {
-        "Frontend Developer": {
-            "degrees": ["B.Tech", "B.Sc", "BCA", "M.Tech", "MCA"],
-            "specializations": ["Computer Science", "Information Technology", "Computer Applications"],
-            "skills": ["HTML", "CSS", "JavaScript", "React", "Angular", "Vue.js", "Redux", "TypeScript", "Bootstrap", "Tailwind CSS", "Figma", "Git", "Webpack"],
-            "certifications": ["Meta Frontend Developer", "Certified React Developer", "Google UX Design", "Adobe Certified Expert"]
-        },
-        "Backend Developer": {
-            "degrees": ["B.Tech", "M.Tech", "MCA", "B.E"],
-            "specializations": ["Computer Science", "Information Technology", "Electronics"],
-            "skills": ["Python", "Java", "Node.js", "Django", "Spring Boot", "Express.js", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Docker", "AWS", "Go", "Rust"],
-            "certifications": ["AWS Certified Developer", "Oracle Certified Professional: Java", "MongoDB Certified Developer", "Microsoft Certified: Azure Developer"]
-        },
-        "Full Stack Developer": {
-            "degrees": ["B.Tech", "M.Tech", "MCA"],
-            "specializations": ["Computer Science", "Information Technology"],
-            "skills": ["HTML", "CSS", "JavaScript", "React", "Node.js", "Express.js", "MongoDB", "SQL", "Git", "AWS", "Docker", "GraphQL", "Next.js"],
-            "certifications": ["AWS Certified Developer", "Meta Full Stack Developer", "IBM Full Stack Software Developer"]
-        },
-        "Data Scientist": {
-            "degrees": ["M.Tech", "M.Sc", "PhD", "B.Tech"],
-            "specializations": ["Data Science", "Computer Science", "Statistics", "Mathematics"],
-            "skills": ["Python", "R", "SQL", "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch", "Matplotlib", "Tableau", "Power BI", "Big Data", "Spark"],
-            "certifications": ["Google Data Analytics", "IBM Data Science", "Microsoft Certified: Azure Data Scientist", "AWS Certified Machine Learning"]
-        },
-        "Data Analyst": {
-            "degrees": ["B.Sc", "B.Com", "B.Tech", "MBA"],
-            "specializations": ["Statistics", "Mathematics", "Economics", "Computer Science"],
-            "skills": ["Excel", "SQL", "Tableau", "Power BI", "Python", "R", "Google Analytics", "SAS", "Data Visualization"],
-            "certifications": ["Google Data Analytics", "Microsoft Certified: Power BI Data Analyst", "IBM Data Analyst"]
-        },
-        "DevOps Engineer": {
-            "degrees": ["B.Tech", "M.Tech", "MCA"],
-            "specializations": ["Computer Science", "Information Technology", "Electronics"],
-            "skills": ["Linux", "Python", "Bash", "Docker", "Kubernetes", "Jenkins", "Ansible", "Terraform", "AWS", "Azure", "Git", "CI/CD", "Prometheus", "Grafana"],
-            "certifications": ["CKA (Certified Kubernetes Administrator)", "AWS Certified DevOps Engineer", "Microsoft Certified: DevOps Engineer", "HashiCorp Certified: Terraform Associate"]
-        },
-        "Cloud Developer": {
-            "degrees": ["B.Tech", "M.Tech", "BCA"],
-            "specializations": ["Computer Science", "Information Technology"],
-            "skills": ["AWS", "Azure", "Google Cloud", "Python", "Java", "Node.js", "Serverless", "Lambda", "Docker", "Kubernetes", "Microservices"],
-            "certifications": ["AWS Certified Developer", "Microsoft Certified: Azure Developer", "Google Professional Cloud Developer"]
-        },
-        "Mobile App Developer": {
-            "degrees": ["B.Tech", "BCA", "MCA"],
-            "specializations": ["Computer Science", "Information Technology"],
-            "skills": ["Java", "Kotlin", "Swift", "Flutter", "React Native", "Dart", "Firebase", "Android Studio", "Xcode", "Git"],
-            "certifications": ["Google Associate Android Developer", "Meta iOS Developer", "Flutter Certified Application Developer"]
-        },
-        "UI/UX Designer": {
-            "degrees": ["B.Des", "B.Sc", "B.A", "B.Tech"],
-            "specializations": ["Design", "Multimedia", "Computer Science", "Arts"],
-            "skills": ["Figma", "Adobe XD", "Sketch", "Photoshop", "Illustrator", "InVision", "HTML", "CSS", "User Research", "Wireframing", "Prototyping"],
-            "certifications": ["Google UX Design", "CalArts UI/UX Design", "Interaction Design Foundation Certification"]
-        },
-        "Cyber Security Analyst": {
-            "degrees": ["B.Tech", "M.Tech", "B.Sc"],
-            "specializations": ["Cyber Security", "Computer Science", "Information Technology"],
-            "skills": ["Network Security", "Ethical Hacking", "Python", "Linux", "Wireshark", "Metasploit", "SIEM", "Firewalls", "Cryptography", "Risk Assessment", "Penetration Testing"],
-            "certifications": ["CEH (Certified Ethical Hacker)", "CompTIA Security+", "CISSP", "CISM", "OSCP"]
-        },
-        "AI/ML Engineer": {
-            "degrees": ["M.Tech", "B.Tech", "PhD"],
-            "specializations": ["Artificial Intelligence", "Computer Science", "Robotics"],
-            "skills": ["Python", "TensorFlow", "PyTorch", "Keras", "OpenCV", "NLP", "Deep Learning", "Reinforcement Learning", "Scikit-learn", "MLOps"],
-            "certifications": ["DeepLearning.AI TensorFlow Developer", "AWS Certified Machine Learning", "Google Professional Machine Learning Engineer"]
-        },
-        "Blockchain Developer": {
-            "degrees": ["B.Tech", "M.Tech"],
-            "specializations": ["Computer Science", "Information Technology"],
-            "skills": ["Solidity", "Ethereum", "Smart Contracts", "Web3.js", "Rust", "Hyperledger", "Cryptography", "Go", "Truffle"],
-            "certifications": ["Certified Blockchain Developer", "Ethereum Developer Certification"]
-        },
-        "Game Developer": {
-            "degrees": ["B.Tech", "BCA", "B.Sc"],
-            "specializations": ["Computer Science", "Game Design", "Animation"],
-            "skills": ["C++", "C#", "Unity", "Unreal Engine", "3D Math", "OpenGL", "DirectX", "Blender", "Game Physics"],
-            "certifications": ["Unity Certified Programmer", "Unreal Engine Certification"]
-        },
-        "Software Developer": {
-            "degrees": ["B.Tech", "BCA", "MCA", "B.Sc"],
-            "specializations": ["Computer Science", "Information Technology"],
-            "skills": ["Java", "Python", "C++", "C#", "SQL", "Git", "Data Structures", "Algorithms", "OOP", "System Design"],
-            "certifications": ["Oracle Certified Professional", "Microsoft Certified: Azure Fundamentals"]
-        },
-        "QA Engineer": {
-            "degrees": ["B.Tech", "BCA", "MCA"],
-            "specializations": ["Computer Science", "Information Technology"],
-            "skills": ["Selenium", "Java", "Python", "JIRA", "TestNG", "Cucumber", "Manual Testing", "Automation Testing", "API Testing", "Postman"],
-            "certifications": ["ISTQB Certified Tester", "Selenium Certification"]
-        }
-    }
-
-    records_to_create = []
-    
-    for i in range(TOTAL_RECORDS):
-        # Pick a random role
-        role = random.choice(list(archetypes.keys()))
-        archetype = archetypes[role]
-        
-        # Generate random attributes based on archetype
-        degree = random.choice(archetype["degrees"])
-        specialization = random.choice(archetype["specializations"])
-        
-        # Pick 3-8 random skills (increased variety)
-        num_skills = random.randint(3, 8)
-        skills = ", ".join(random.sample(archetype["skills"], min(num_skills, len(archetype["skills"]))))
-        
-        # Pick 0-3 random certifications
-        num_certs = random.randint(0, 3)
-        if num_certs > 0:
-            certifications = ", ".join(random.sample(archetype["certifications"], min(num_certs, len(archetype["certifications"]))))
-        else:
-            certifications = ""
-            
-        records_to_create.append(TrainingData(
-            degree=degree,
-            specialization=specialization,
-            skills=skills,
-            certifications=certifications,
-            target_job_role=role
-        ))
-
-        # Batch Insert
-        if len(records_to_create) >= BATCH_SIZE:
-            TrainingData.objects.bulk_create(records_to_create)
-            if (i + 1) % 50000 == 0:
-                print(f"Inserted {i+1} records...")
-            records_to_create = []
-
-    # Insert remaining records
-    if records_to_create:
-        TrainingData.objects.bulk_create(records_to_create)
-        print(f"Inserted final batch of {len(records_to_create)} records.")
-
-    print(f"Successfully added {TOTAL_RECORDS} records.")
 
 if __name__ == '__main__':
-    populate_data()
+    parser = argparse.ArgumentParser(description="Fill TrainingData with synthetic records")
+    parser.add_argument('--rows', type=int, default=1000000, help="records to add")  # 1 Million for high accuracy
+    parser.add_argument('--seed', type=int, help="same seed and batch size, same records (default: random)")
+    parser.add_argument('--workers', type=int, help="generator processes (default: one per CPU)")
+    parser.add_argument('--batch-size', type=int, default=10000, help="records per generated batch and transaction")
+    args = parser.parse_args()
+    populate_data(args.rows, args.seed, args.workers, args.batch_size)
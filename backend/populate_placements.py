@@ -8,14 +8,9 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 django.setup()
 
 from users.models import User, JobPlacement
+from users.seed_data import COMPANIES
 
 # Data for random generation
-COMPANIES = [
-    "Google", "Microsoft", "Amazon", "Infosys", "TCS", "Wipro", "Accenture", 
-    "IBM", "Deloitte", "Capgemini", "HCL", "Tech Mahindra", "Oracle", 
-    "Adobe", "Salesforce", "Flipkart", "Uber", "Ola", "Zomato", "Swiggy"
-]
-
 ROLES = [
     "Software Engineer", "Data Analyst", "System Engineer", "Web Developer", 
     "Full Stack Developer", "Backend Developer", "Frontend Developer", 
@@ -1,31 +1,45 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import User, Adminlogs, Education, Predictionhistory, TrainingData, Feedback
+from .models import User, Adminlogs, Education, Predictionhistory, TrainingData, Feedback, TrainingJob, TrainingUpload
 from .serializers import UserSerializer
 from django.db.models import Count
 import datetime
 from .permissions import IsAdmin
-import csv
+from .pagination import KeysetPagination
 import os
 from django.conf import settings
+from django.utils import timezone
 import json
+from ml_service.registry import registry, list_versions, publish_version
+from ml_service.cache import prediction_cache
+from ml_service.predict import micro_batcher
+from ml_service.materialize import prediction_refresher
+from ml_service.timing import stage_timings
+from ml_service.jobs import start_training_job, cancel_training_job, job_status
+from ml_service.ingest import ingest_csv, read_header, store_training_upload, start_training_upload, upload_status
 
 class AdminUserListView(APIView):
     """
-    GET: List all users (with optional search)
+    GET: List all users (with optional search, ?fields= and ?expand=)
     DELETE: Bulk delete users
     """
     permission_classes = [IsAdmin]
     def get(self, request):
         query = request.query_params.get('search', '')
+        try:
+            fields, expand = UserSerializer.sparse_fields(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         users = User.objects.all()
         
         if query:
             users = users.filter(name__icontains=query) | users.filter(email__icontains=query)
             
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
+        users = UserSerializer.for_fields(users, fields, expand)
+        # One serializer for the page, as many=True would use
+        serializer = UserSerializer(fields=fields, expand=expand)
+        return KeysetPagination(['user_id']).paginate(request, users, serializer.to_representation)
 
     def delete(self, request):
         user_ids = request.data.get('user_ids', [])
@@ -123,8 +137,9 @@ class AdminLogsView(APIView):
             # Filter by target user name or admin name or action
             logs = logs.filter(target_user__name__icontains=query) | logs.filter(admin__name__icontains=query) | logs.filter(action_type__icontains=query)
             
-        logs = logs.values('log_id', 'action_type', 'timestamp', 'admin__name', 'target_user__name').order_by('-timestamp')
-        return Response(list(logs))
+        logs = logs.values('log_id', 'action_type', 'timestamp', 'admin__name', 'target_user__name')
+        # Newest first by id: adminlogs is unmanaged and its timestamp nullable, the key is neither
+        return KeysetPagination(['-log_id']).paginate(request, logs)
 
     def delete(self, request):
         log_ids = request.data.get('log_ids', [])
@@ -193,7 +208,7 @@ class AdminAnalyticsView(APIView):
             trained_count = TrainingData.objects.filter(created_at__lte=last_training_log.timestamp).count()
         else:
             # Fallback: Check model file modification time
-            model_path = os.path.join(settings.BASE_DIR, 'ml_models', 'job_predictor.pkl')
+            model_path = registry.model_path
             if os.path.exists(model_path):
                 # Get file modification time
                 mod_timestamp = os.path.getmtime(model_path)
@@ -218,7 +233,7 @@ class AdminAnalyticsView(APIView):
             system_health = 'Critical'
         
         # Check ML model existence
-        model_path = os.path.join(settings.BASE_DIR, 'ml_models', 'job_predictor.pkl')
+        model_path = registry.model_path
         if not os.path.exists(model_path):
              if system_health == 'Good': system_health = 'Degraded'
 
@@ -245,34 +260,63 @@ class AdminAnalyticsView(APIView):
 
 class AdminModelView(APIView):
     """
-    POST: Upload training data or Retrain model
+    GET: Model status (version loaded by this worker), published versions, training jobs, uploads or stage timings
+    POST: Upload training data, Retrain model or Roll back to a previous version
     """
     permission_classes = [IsAdmin]
 
+    def get(self, request, action):
+        if action == 'status':
+            return Response(dict(
+                registry.info(),
+                cache=prediction_cache.stats(),
+                batching=micro_batcher.stats() if settings.ML_MICRO_BATCHING else None,
+                materialized=prediction_refresher.stats() if settings.ML_MATERIALIZE_PREDICTIONS else None
+            ))
+        if action == 'versions':
+            return Response({'versions': list_versions(registry.model_dir)})
+        if action == 'jobs':
+            # Most recent training jobs, the running one first if any
+            jobs = TrainingJob.objects.order_by('-job_id')[:20]
+            return Response({'jobs': [job_status(job) for job in jobs]})
+        if action == 'uploads':
+            uploads = TrainingUpload.objects.order_by('-upload_id')[:20]
+            return Response({'uploads': [upload_status(upload) for upload in uploads]})
+        if action == 'timings':
+            # Stage latency histograms of this worker; ?reset=1 starts a new window
+            timings = stage_timings.snapshot()
+            if request.query_params.get('reset'):
+                stage_timings.reset()
+            return Response({'pid': os.getpid(), 'enabled': settings.ML_STAGE_TIMING, 'stages': timings})
+        return Response({'error': 'Invalid action'}, status=status.HTTP_400_BAD_REQUEST)
+
     def post(self, request, action):
         if action == 'upload':
             file = request.FILES.get('file')
             if not file:
                 return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Save file logic (Keep CSV for bulk upload if needed, or parse and save to DB)
-            # For now, let's keep CSV upload as is, or better: Parse CSV and save to TrainingData model
+            # The CSV is parsed as a stream and inserted in chunks (see ml_service/ingest.py);
+            # large files are handed to a background worker
             try:
-                decoded_file = file.read().decode('utf-8').splitlines()
-                reader = csv.DictReader(decoded_file)
-                
-                training_objects = []
-                for row in reader:
-                    training_objects.append(TrainingData(
-                        degree=row.get('Degree', ''),
-                        specialization=row.get('Specialization', ''),
-                        skills=row.get('Skills', ''),
-                        certifications=row.get('Certifications', ''),
-                        target_job_role=row.get('Job_Role', '')
-                    ))
-                
-                TrainingData.objects.bulk_create(training_objects)
-                return Response({'message': f'File {file.name} processed and {len(training_objects)} records added to DB'}, status=status.HTTP_200_OK)
+                if file.size <= settings.ML_UPLOAD_SYNC_MAX_BYTES:
+                    result = ingest_csv(file, file.size)
+                    message = f"File {file.name} processed and {result['rows_inserted']} records added to DB"
+                    if result['rows_rejected']:
+                        message += f"; {result['rows_rejected']} rows rejected"
+                    return Response(dict(result, message=message), status=status.HTTP_200_OK)
+
+                # A file without the expected columns is refused now rather than by the worker
+                read_header(file)
+                file.seek(0)
+                admin_user = User.objects.filter(email=request.user.email).first()
+                upload = store_training_upload(file, requested_by=admin_user)
+                start_training_upload(upload)
+                return Response({
+                    'status': 'queued',
+                    'message': f'File {file.name} queued as upload #{upload.upload_id}. Track it under admin/model/uploads/{upload.upload_id}/.',
+                    'upload': upload_status(upload)
+                }, status=status.HTTP_202_ACCEPTED)
             except Exception as e:
                 return Response({'error': f'Failed to process CSV: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -297,15 +341,23 @@ class AdminModelView(APIView):
                 return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         elif action == 'retrain':
+            # 'full' rebuilds the random forest; 'incremental' learns only new rows
+            mode = request.data.get('mode', 'full')
+            if mode not in ('full', 'incremental'):
+                return Response({'error': "mode must be 'full' or 'incremental'"}, status=status.HTTP_400_BAD_REQUEST)
             try:
-                # Trigger ML script logic in background
-                import threading
-                from ml_service.train import train_model
-                from django.utils import timezone
-                
                 # Get the admin user performing the action
                 admin_user = User.objects.get(email=request.user.email) # Assuming request.user is authenticated via JWT
-                
+
+                # Single-flight: a click while a job is queued or running returns that job
+                job, created = start_training_job(mode, requested_by=admin_user)
+                if not created:
+                    return Response({
+                        'status': 'running',
+                        'message': f'Training job #{job.job_id} is already {job.status} ({job.progress}%).',
+                        'job': job_status(job)
+                    }, status=status.HTTP_409_CONFLICT)
+
                 # Log Start
                 Adminlogs.objects.create(
                     admin=admin_user,
@@ -313,48 +365,46 @@ class AdminModelView(APIView):
                     action_type='TRAINING_STARTED',
                     timestamp=timezone.now()
                 )
-
-                def run_training_background(admin_id):
-                    try:
-                        print("Starting background training...")
-                        result = train_model()
-                        print(f"Background training completed: {result}")
-                        
-                        # Log Success
-                        # Re-fetch admin user in thread context if needed, or pass ID
-                        admin = User.objects.get(user_id=admin_id)
-                        Adminlogs.objects.create(
-                            admin=admin,
-                            target_user=admin,
-                            action_type='TRAINING_COMPLETED',
-                            timestamp=timezone.now()
-                        )
-                        
-                    except Exception as e:
-                        print(f"Background training failed: {e}")
-                        # Log Failure
-                        try:
-                            admin = User.objects.get(user_id=admin_id)
-                            Adminlogs.objects.create(
-                                admin=admin,
-                                target_user=admin,
-                                action_type='TRAINING_FAILED',
-                                timestamp=timezone.now()
-                            )
-                        except:
-                            pass
-
-                thread = threading.Thread(target=run_training_background, args=(admin_user.user_id,))
-                thread.start()
-                
                 return Response({
                     'status': 'success', 
-                    'message': 'Training started in background. You will receive a notification in System Logs when complete.'
+                    'message': f'{mode.capitalize()} training job #{job.job_id} started in background. Track it under admin/model/jobs/{job.job_id}/.',
+                    'job': job_status(job)
                 }, status=status.HTTP_202_ACCEPTED)
 
             except Exception as e:
                 print(f"Retrain Error: {str(e)}")
                 return Response({'error': f"Retrain failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        elif action == 'rollback':
+            # Re-publish an earlier version; defaults to the one before the current
+            versions = list_versions(registry.model_dir)
+            version = request.data.get('version')
+            if not version:
+                current = [i for i, info in enumerate(versions) if info['current']]
+                if not current or current[0] + 1 >= len(versions):
+                    return Response({'error': 'No previous model version to roll back to'}, status=status.HTTP_400_BAD_REQUEST)
+                version = versions[current[0] + 1]['version']
+            elif version not in [info['version'] for info in versions]:
+                return Response({'error': f'Model version {version} not found'}, status=status.HTTP_404_NOT_FOUND)
+
+            try:
+                publish_version(registry.model_dir, version)
+                admin_user = User.objects.get(email=request.user.email)
+                Adminlogs.objects.create(
+                    admin=admin_user,
+                    target_user=admin_user,
+                    action_type='MODEL_ROLLBACK',
+                    timestamp=timezone.now()
+                )
+            except Exception as e:
+                print(f"Rollback Error: {str(e)}")
+                return Response({'error': f"Rollback failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            return Response({
+                'status': 'success',
+                'message': f'Model version {version} published. Workers switch within {settings.ML_MODEL_CHECK_INTERVAL:g} seconds.',
+                'version': version
+            }, status=status.HTTP_200_OK)
         
         return Response({'error': 'Invalid action'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -406,7 +456,7 @@ class AdminPredictionLogListView(APIView):
 
     def get(self, request):
         query = request.query_params.get('search', '')
-        logs = Predictionhistory.objects.all().select_related('user').order_by('-timestamp')
+        logs = Predictionhistory.objects.all().select_related('user')
         
         if query:
             from django.db.models import Q
@@ -416,8 +466,7 @@ class AdminPredictionLogListView(APIView):
                 Q(predicted_roles__icontains=query)
             )
 
-        data = []
-        for log in logs:
+        def log_entry(log):
             try:
                 # Robust parsing for confidence scores
                 if isinstance(log.confidence_scores, str):
@@ -434,7 +483,7 @@ class AdminPredictionLogListView(APIView):
                 print(f"Error parsing scores for log {log.prediction_id}: {e}")
                 scores = []
 
-            data.append({
+            return {
                 'id': log.prediction_id,
                 'user_name': log.user.name,
                 'user_email': log.user.email,
@@ -443,9 +492,11 @@ class AdminPredictionLogListView(APIView):
                 'timestamp': log.timestamp,
                 'is_flagged': log.is_flagged,
                 'corrected_role': log.corrected_role,
-                'admin_notes': log.admin_notes
-            })
-        return Response(data)
+                'admin_notes': log.admin_notes,
+                'model_version': log.model_version
+            }
+
+        return KeysetPagination(['-timestamp', '-prediction_id']).paginate(request, logs, log_entry)
 
     def delete(self, request):
         """
@@ -478,12 +529,50 @@ class AdminPredictionLogListView(APIView):
 
         try:
             is_flagged = True if action == 'flag' else False
-            updated_count = Predictionhistory.objects.filter(prediction_id__in=log_ids).update(is_flagged=is_flagged)
+            updated_count = Predictionhistory.objects.filter(prediction_id__in=log_ids).update(is_flagged=is_flagged, corrected_at=timezone.now())
             
             return Response({'message': f'{updated_count} logs updated successfully'}, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class AdminTrainingJobView(APIView):
+    """
+    GET: Status and progress of one training job
+    POST cancel: Stop it at its next checkpoint
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request, job_id):
+        try:
+            job = TrainingJob.objects.get(pk=job_id)
+        except TrainingJob.DoesNotExist:
+            return Response({'error': 'Training job not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job_status(job))
+
+    def post(self, request, job_id, action):
+        if action != 'cancel':
+            return Response({'error': 'Invalid action'}, status=status.HTTP_400_BAD_REQUEST)
+        if not TrainingJob.objects.filter(pk=job_id).exists():
+            return Response({'error': 'Training job not found'}, status=status.HTTP_404_NOT_FOUND)
+        if not cancel_training_job(job_id):
+            return Response({'error': 'Training job has already finished'}, status=status.HTTP_409_CONFLICT)
+        return Response({'message': 'Cancellation requested; the job stops at its next checkpoint.'}, status=status.HTTP_202_ACCEPTED)
+
+
+class AdminTrainingUploadView(APIView):
+    """
+    GET: Progress and rejected rows of one training data upload
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request, upload_id):
+        try:
+            upload = TrainingUpload.objects.get(pk=upload_id)
+        except TrainingUpload.DoesNotExist:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(upload_status(upload))
+
+
 class AdminPredictionLogDetailView(APIView):
     """
     PATCH: Flag incorrect prediction or Add correction
@@ -503,6 +592,10 @@ class AdminPredictionLogDetailView(APIView):
         corrected_role = request.data.get('corrected_role')
         if corrected_role is not None:
              log.corrected_role = corrected_role
+
+        if 'is_flagged' in request.data or corrected_role is not None:
+            # Incremental training picks up corrections made since its last run
+            log.corrected_at = timezone.now()
             
         admin_notes = request.data.get('admin_notes')
         if admin_notes is not None:
@@ -521,7 +614,7 @@ class AdminFeedbackView(APIView):
         try:
             query = request.query_params.get('search', '')
             # Select related to optimize queries
-            feedbacks = Feedback.objects.all().select_related('user', 'prediction').order_by('-created_at')
+            feedbacks = Feedback.objects.all().select_related('user', 'prediction')
             
             if query:
                 from django.db.models import Q
@@ -531,10 +624,9 @@ class AdminFeedbackView(APIView):
                     Q(prediction__predicted_roles__icontains=query)
                 )
 
-            data = []
-            for f in feedbacks:
+            def feedback_entry(f):
                 try:
-                    data.append({
+                    return {
                         'feedback_id': f.feedback_id,
                         'user_name': f.user.name if f.user else 'Unknown',
                         'user_email': f.user.email if f.user else 'Unknown',
@@ -543,12 +635,12 @@ class AdminFeedbackView(APIView):
                         'created_at': f.created_at,
                         'predicted_role': f.prediction.predicted_roles if f.prediction else 'N/A',
                         'prediction_id': f.prediction.prediction_id if f.prediction else None
-                    })
+                    }
                 except Exception as inner_e:
                     print(f"Error processing feedback row {f.feedback_id}: {inner_e}")
-                    continue
+                    return None
 
-            return Response(data)
+            return KeysetPagination(['-created_at', '-feedback_id']).paginate(request, feedbacks, feedback_entry)
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -0,0 +1,91 @@
+import json
+import shutil
+import tempfile
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from django.core.management.base import BaseCommand, CommandError
+from sklearn.model_selection import train_test_split
+from ml_service.benchmark import FAMILIES, FEATURE_COLUMNS, candidate_grid, fit_candidate, inference_latency
+from ml_service.dataset import concat_training_frames, duplicate_groups, load_training_frame
+from ml_service.train import FEATURE_CONFIG, FOREST_TREES, _deduplicate
+from users.models import TrainingData
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',')]
+
+
+def _depth_list(value):
+    return [None if item in ('none', 'max') else int(item) for item in value.split(',')]
+
+
+class Command(BaseCommand):
+    help = (
+        "Trains a grid of candidate models on a fixed split of TrainingData and reports fit time, "
+        "artifact size, inference latency and accuracy of each"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help="first N TrainingData rows to use")
+        parser.add_argument('--families', default=','.join(FAMILIES), help="comma separated: " + ', '.join(FAMILIES))
+        parser.add_argument('--trees', type=_int_list, default=[25, 50, 100, 200], help="forest sizes")
+        parser.add_argument('--depths', type=_depth_list, default=[None, 20], help="depth limits, 'none' for unlimited")
+        parser.add_argument('--max-features', type=_int_list, default=[FEATURE_CONFIG['tfidf']['max_features']],
+                            help="TF-IDF vocabulary sizes")
+        parser.add_argument('--jobs', type=int, default=-1, help="candidates fitted in parallel")
+        parser.add_argument('--latency-rows', type=int, default=200, help="held-out rows timed one at a time")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--artifact-dir', help="keep the fitted candidates here")
+        parser.add_argument('--output', help="also write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        specs = candidate_grid(options['families'].split(','), options['trees'], options['depths'], options['max_features'])
+
+        # The same split train_model holds out, over the first --rows rows
+        last_id = TrainingData.objects.order_by('training_id').values_list('training_id', flat=True)[options['rows'] - 1:options['rows']].first()
+        df = concat_training_frames([load_training_frame(up_to_id=last_id)])
+        if df.empty:
+            raise CommandError("No TrainingData to benchmark on.")
+        groups = duplicate_groups(df)
+        train_index, test_index = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+        train_rows, train_weights = _deduplicate(groups, train_index)
+        test_rows, test_weights = _deduplicate(groups, test_index)
+        X = df[FEATURE_COLUMNS]
+        y = np.asarray(df['target_job_role'], dtype=object)
+        self.stdout.write(f"{len(specs)} candidates on {len(train_index)} training rows ({len(train_rows)} distinct), "
+                          f"{len(test_index)} held out")
+
+        artifact_dir = options['artifact_dir'] or tempfile.mkdtemp(prefix='benchmark_models_')
+        try:
+            # Fitted side by side; latency is timed afterwards, one candidate at a time
+            results = Parallel(n_jobs=options['jobs'], verbose=0)(
+                delayed(fit_candidate)(spec, FEATURE_CONFIG, X.iloc[train_rows], y[train_rows], train_weights,
+                                       X.iloc[test_rows], y[test_rows], test_weights, artifact_dir)
+                for spec in specs
+            )
+            profiles = X.iloc[test_rows[:options['latency_rows']]]
+            for result in results:
+                result['single_p50'], result['single_p99'], result['batch_per_row'] = inference_latency(
+                    joblib.load(result['path']), profiles, options['batch_size']
+                )
+        finally:
+            if not options['artifact_dir']:
+                shutil.rmtree(artifact_dir, ignore_errors=True)
+
+        self.stdout.write(f"{'candidate':32s} {'fit s':>8s} {'size MB':>8s} {'1-row p50 ms':>12s} {'1-row p99 ms':>12s} "
+                          f"{'batch us/row':>12s} {'accuracy':>9s}")
+        for result in results:
+            current = (result['family'] == 'forest' and result['trees'] == FOREST_TREES and result['depth'] is None
+                       and result['max_features'] == FEATURE_CONFIG['tfidf']['max_features'])
+            self.stdout.write(
+                f"{result['name'] + (' *' if current else ''):32s} {result['fit_seconds']:8.1f} "
+                f"{result['artifact_bytes'] / 2 ** 20:8.1f} {result['single_p50'] * 1000:12.2f} "
+                f"{result['single_p99'] * 1000:12.2f} {result['batch_per_row'] * 1e6:12.1f} {result['accuracy'] * 100:8.2f}%"
+            )
+        self.stdout.write("* the configuration train_model uses")
+        if options['output']:
+            for result in results:
+                result.pop('path')
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
@@ -0,0 +1,21 @@
+import os
+import time
+from django.core.management.base import BaseCommand
+from ml_service.snapshot import export_snapshot
+
+
+class Command(BaseCommand):
+    help = "Writes TrainingData to a compressed columnar snapshot file (see ml_service/snapshot.py)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--chunk-size', type=int, help="rows read and written at a time (default ML_TRAINING_CHUNK_SIZE)")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        manifest = export_snapshot(options['path'], options['chunk_size'])
+        self.stdout.write(
+            f"Exported {manifest['rows']} TrainingData rows (up to id {manifest['training_id']}) in "
+            f"{len(manifest['chunks'])} chunks to {options['path']}: "
+            f"{os.path.getsize(options['path']) / 2 ** 20:.1f} MB in {time.perf_counter() - start:.1f}s"
+        )
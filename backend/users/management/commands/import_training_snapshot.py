@@ -0,0 +1,69 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from ml_service.snapshot import SnapshotError, TrainingSnapshot
+from users.models import TrainingData
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads a TrainingData snapshot written by export_training_snapshot. Rows are appended with new ids, "
+        "or with --replace replace the table and keep their ids"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--replace', action='store_true', help="delete every TrainingData row first")
+        parser.add_argument('--batch-size', type=int, default=5000, help="rows per INSERT")
+        parser.add_argument('--transaction-rows', type=int, default=100000, help="rows committed at a time")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            with TrainingSnapshot(options['path']) as snapshot:
+                # Nothing is written unless the whole file is intact
+                snapshot.verify()
+                imported = self.load(snapshot, options)
+        except SnapshotError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"Imported {imported} TrainingData rows in {time.perf_counter() - start:.1f}s")
+
+    def load(self, snapshot, options):
+        imported = 0
+        for n, rows in enumerate(_transactions(snapshot.rows(), options['transaction_rows'])):
+            with transaction.atomic():
+                if options['replace'] and n == 0:
+                    TrainingData.objects.all().delete()
+                TrainingData.objects.bulk_create([
+                    TrainingData(
+                        training_id=training_id if options['replace'] else None, degree=degree,
+                        specialization=specialization, skills=skills, certifications=certifications,
+                        target_job_role=target_job_role
+                    )
+                    for training_id, degree, specialization, skills, certifications, target_job_role in rows
+                ], batch_size=options['batch_size'])
+            imported += len(rows)
+            self.stdout.write(f"{imported} / {snapshot.manifest['rows']} rows")
+        if options['replace']:
+            # Explicit ids do not advance the primary key sequence on every backend
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [TrainingData]):
+                    cursor.execute(sql)
+        return imported
+
+
+def _transactions(chunks, size):
+    """
+    Row chunks regrouped into lists of about size rows; one empty list if
+    there are no rows, so --replace still empties the table.
+    """
+    group = []
+    yielded = False
+    for rows in chunks:
+        group.extend(rows)
+        if len(group) >= size:
+            yield group
+            group, yielded = [], True
+    if group or not yielded:
+        yield group
@@ -0,0 +1,225 @@
+import json
+import time
+import random
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from ml_service.predict import ROLE_SKILLS_MAPPING
+from users.models import (
+    Certification, Education, Feedback, JobPlacement, Predictionhistory, Skill, User
+)
+from users.seed_data import ARCHETYPES, COMPANIES
+from users.utils import EncryptionUtil
+
+# Students generated from one random stream; the data depends on the seed only
+CHUNK = 1000
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Akash", "Ananya", "Arjun", "Diya", "Farhan", "Gauri", "Harsh", "Ishita", "Karan", "Kavya",
+    "Manish", "Meera", "Neha", "Nikhil", "Pooja", "Priya", "Rahul", "Riya", "Rohan", "Sana", "Siddharth", "Sneha",
+    "Tanvi", "Varun", "Vikram", "Yash", "Zoya", "Aditya",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Gupta", "Iyer", "Nair", "Reddy", "Patel", "Shah", "Mehta", "Khan", "Singh", "Kumar",
+    "Das", "Bose", "Rao", "Menon", "Joshi", "Kulkarni", "Pillai", "Chopra",
+]
+UNIVERSITIES = [
+    "IIT Bombay", "IIT Delhi", "IIT Madras", "NIT Trichy", "BITS Pilani", "VIT Vellore", "Anna University",
+    "University of Delhi", "Jadavpur University", "Manipal University", "SRM University", "Amity University",
+    "Pune University", "Osmania University", "Christ University",
+]
+# Issuer of a certification, by the first keyword found in its name
+ISSUERS = [
+    ("AWS", "Amazon Web Services"), ("Microsoft", "Microsoft"), ("Google", "Google"), ("Meta", "Meta"),
+    ("IBM", "IBM"), ("Oracle", "Oracle"), ("MongoDB", "MongoDB"), ("CompTIA", "CompTIA"), ("Kubernetes", "CNCF"),
+    ("HashiCorp", "HashiCorp"), ("Unity", "Unity"), ("Unreal", "Epic Games"), ("Adobe", "Adobe"),
+    ("ISTQB", "ISTQB"), ("DeepLearning.AI", "DeepLearning.AI"),
+]
+FEEDBACK_COMMENTS = [
+    None, "Spot on!", "Pretty accurate.", "Not what I expected.", "Helpful skill suggestions.",
+    "The missing skills list was useful.", "I was hoping for a different role.",
+]
+SEED_MODEL_VERSION = 'seed-scale'
+
+
+def _issuer(cert_name):
+    return next((issuer for keyword, issuer in ISSUERS if keyword in cert_name), "Coursera")
+
+
+# Ciphertext per plaintext: each distinct value is encrypted once and the token
+# reused, so the rows stay equal for a seed and decrypt to the same dataset
+_CIPHERTEXTS = {}
+
+
+def _encrypt(value):
+    if value not in _CIPHERTEXTS:
+        _CIPHERTEXTS[value] = EncryptionUtil.encrypt(value)
+    return _CIPHERTEXTS[value]
+
+
+def _top_roles(rng, role, skills):
+    """
+    A predict_job style top 3, led by the student's archetype role most of the time.
+    """
+    roles = [role if rng.random() < 0.8 else rng.choice(list(ARCHETYPES))]
+    roles += rng.sample([other for other in ARCHETYPES if other != roles[0]], 2)
+    first = rng.uniform(45, 95)
+    second = rng.uniform(0, 100 - first)
+    confidences = [first, second, rng.uniform(0, min(second, 100 - first - second))]
+    known = {skill.lower() for skill in skills}
+    return [
+        {"role": name, "confidence": round(confidence, 2),
+         "missing_skills": [skill for skill in ROLE_SKILLS_MAPPING.get(name, []) if skill.lower() not in known]}
+        for name, confidence in zip(roles, confidences)
+    ]
+
+
+def generate_chunk(seed, chunk, count, options):
+    """
+    The rows of students chunk * CHUNK .. + count, per model. Rows refer to
+    their user by email and feedback to its prediction by position, since
+    ids are only known once inserted.
+    """
+    rng = random.Random(f"seed_scale:{seed}:{chunk}")
+    as_of = options['as_of']
+    rows = {model: [] for model in (User, Education, Skill, Certification, JobPlacement, Predictionhistory, Feedback)}
+    roles = list(ARCHETYPES)
+
+    for index in range(chunk * CHUNK, chunk * CHUNK + count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        email = f"{first}.{last}.{index}@{options['domain']}".lower()
+        rows[User].append((f"{first} {last}", email, options['password'], 'student'))
+
+        role = rng.choice(roles)
+        archetype = ARCHETYPES[role]
+        year = as_of.year - rng.randint(0, 6)
+        rows[Education].append((
+            email, rng.choice(archetype["degrees"]),
+            _encrypt(rng.choice(archetype["specializations"])),
+            _encrypt(rng.choice(UNIVERSITIES)),
+            _encrypt(f"{rng.uniform(6.0, 9.8):.2f}"),
+            year,
+        ))
+
+        skills = rng.sample(archetype["skills"], min(rng.randint(3, 8), len(archetype["skills"])))
+        rows[Skill].extend((email, skill) for skill in skills)
+        for cert_name in rng.sample(archetype["certifications"], min(rng.randint(0, 3), len(archetype["certifications"]))):
+            rows[Certification].append((
+                email, cert_name, _issuer(cert_name), as_of.date() - datetime.timedelta(days=rng.randrange(3 * 365))
+            ))
+
+        if rng.random() < options['placement_rate']:
+            rows[JobPlacement].append((
+                email, role, rng.choice(COMPANIES), rng.choice(['Job', 'Job', 'Job', 'Internship']),
+                as_of.date() - datetime.timedelta(days=rng.randrange(-180, 2 * 365)),
+            ))
+
+        for _ in range(rng.randint(0, options['max_predictions'])):
+            top_roles = _top_roles(rng, role, skills)
+            timestamp = as_of - datetime.timedelta(seconds=rng.randrange(365 * 86400))
+            flagged = rng.random() < 0.02
+            rows[Predictionhistory].append((
+                email, top_roles[0]["role"], json.dumps(top_roles), timestamp, flagged,
+                role if flagged and top_roles[0]["role"] != role else None,
+                timestamp + datetime.timedelta(days=1) if flagged else None,
+                None, SEED_MODEL_VERSION,
+            ))
+            if rng.random() < options['feedback_rate']:
+                rating = rng.choice([5, 5, 4, 4, 4, 3, 2, 1]) if top_roles[0]["role"] == role else rng.randint(1, 3)
+                rows[Feedback].append((
+                    email, len(rows[Predictionhistory]) - 1, rating, rng.choice(FEEDBACK_COMMENTS),
+                    timestamp + datetime.timedelta(minutes=rng.randint(1, 120)),
+                ))
+    return rows
+
+
+FIELDS = {
+    User: ['name', 'email', 'password_hash', 'role'],
+    Education: ['user', 'degree', 'specialization', 'university', 'cgpa', 'year_of_completion'],
+    Skill: ['user', 'skill_name'],
+    Certification: ['user', 'cert_name', 'issuing_organization', 'issue_date'],
+    JobPlacement: ['user', 'role', 'company', 'placement_type', 'date_of_joining'],
+    Predictionhistory: ['user', 'predicted_roles', 'confidence_scores', 'timestamp', 'is_flagged', 'corrected_role',
+                        'corrected_at', 'admin_notes', 'model_version'],
+    Feedback: ['user', 'prediction', 'rating', 'comments', 'created_at'],
+}
+
+
+def _insert(model, rows):
+    """
+    Rows as one executemany INSERT, without building model instances.
+    """
+    if not rows:
+        return
+    fields = [model._meta.get_field(name) for name in FIELDS[model]]
+    qn = connection.ops.quote_name
+    sql = (f"INSERT INTO {qn(model._meta.db_table)} ({', '.join(qn(field.column) for field in fields)}) "
+           f"VALUES ({', '.join(['%s'] * len(fields))})")
+    # Only dates need the backend's conversion; other values go to the driver as they are
+    dates = [i for i, field in enumerate(fields) if field.get_internal_type() in ('DateField', 'DateTimeField')]
+    if dates:
+        rows = [list(row) for row in rows]
+        for row in rows:
+            for i in dates:
+                row[i] = fields[i].get_db_prep_save(row[i], connection)
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def insert_chunk(rows):
+    """
+    Inserts a generate_chunk result, resolving emails and prediction
+    positions to the ids the database assigned.
+    """
+    _insert(User, rows[User])
+    user_ids = dict(User.objects.filter(email__in=[row[1] for row in rows[User]]).values_list('email', 'user_id'))
+    for model in (Education, Skill, Certification, JobPlacement, Predictionhistory):
+        _insert(model, [(user_ids[row[0]],) + row[1:] for row in rows[model]])
+    # The students are new, so their predictions in id order are the ones just inserted
+    prediction_ids = list(
+        Predictionhistory.objects.filter(user_id__in=user_ids.values()).order_by('prediction_id')
+        .values_list('prediction_id', flat=True)
+    )
+    _insert(Feedback, [(user_ids[row[0]], prediction_ids[row[1]]) + row[2:] for row in rows[Feedback]])
+    return {model: len(model_rows) for model, model_rows in rows.items()}
+
+
+class Command(BaseCommand):
+    help = (
+        "Adds synthetic students with education, skills, certifications, placements, predictions and "
+        "feedback for load testing. Offline, and the same --seed gives the same data"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--domain', default='seed.edu2job.test', help="email domain of the generated students")
+        parser.add_argument('--password', default='Student@123', help="password of every generated student")
+        parser.add_argument('--placement-rate', type=float, default=0.4, help="share of students with a placement")
+        parser.add_argument('--max-predictions', type=int, default=5, help="predictions per student, 0 to N")
+        parser.add_argument('--feedback-rate', type=float, default=0.2, help="share of predictions with feedback")
+        parser.add_argument('--as-of', type=datetime.date.fromisoformat, default=datetime.date(2025, 6, 30),
+                            help="dates are generated up to this day (YYYY-MM-DD)")
+        parser.add_argument('--clear', action='store_true', help="first delete the students of --domain")
+
+    def handle(self, *args, **options):
+        options['as_of'] = datetime.datetime.combine(options['as_of'], datetime.time(), datetime.timezone.utc)
+        existing = User.objects.filter(email__endswith=f"@{options['domain']}")
+        if options['clear']:
+            deleted, _ = existing.delete()
+            self.stdout.write(f"Deleted {deleted} rows of earlier seeded students")
+        elif existing.exists():
+            raise CommandError(f"Students of {options['domain']} already exist; use --clear to replace them")
+
+        start = time.perf_counter()
+        totals = {}
+        for chunk in range((options['students'] + CHUNK - 1) // CHUNK):
+            count = min(CHUNK, options['students'] - chunk * CHUNK)
+            rows = generate_chunk(options['seed'], chunk, count, options)
+            with transaction.atomic():
+                for model, inserted in insert_chunk(rows).items():
+                    totals[model.__name__] = totals.get(model.__name__, 0) + inserted
+            self.stdout.write(f"{chunk * CHUNK + count} / {options['students']} students")
+        self.stdout.write(
+            f"Seeded in {time.perf_counter() - start:.1f}s: " + ", ".join(f"{n} {name}" for name, n in totals.items())
+        )
@@ -0,0 +1,29 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from ml_service.jobs import claim_training_job, lower_priority, run_training_job
+from ml_service.ingest import claim_training_upload, run_training_upload
+
+
+class Command(BaseCommand):
+    help = "Runs queued training jobs and training data uploads in this process instead of a web worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="exit once nothing is queued")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="seconds between queue checks")
+
+    def handle(self, *args, **options):
+        lower_priority()
+        while True:
+            job = claim_training_job()
+            upload = claim_training_upload() if job is None else None
+            if job is not None:
+                run_training_job(job.job_id, n_jobs=settings.ML_TRAINING_N_JOBS)
+            elif upload is not None:
+                run_training_upload(upload)
+            elif options['once']:
+                return
+            else:
+                time.sleep(options['poll_interval'])
+            close_old_connections()
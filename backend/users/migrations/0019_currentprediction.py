@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0018_manual_fix_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrentPrediction',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='current_prediction', serialize=False, to='users.user')),
+                ('predictions', models.TextField(help_text='JSON list of top roles, as returned by predict_job')),
+                ('model_version', models.CharField(max_length=64)),
+                ('is_stale', models.BooleanField(default=False, help_text='Profile changed since the prediction was computed')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'current_prediction',
+                'managed': True,
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='adminlogs',
+            options={'managed': False},
+        ),
+        migrations.AlterModelOptions(
+            name='certification',
+            options={'managed': False},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0020_predictionhistory_model_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='predictionhistory',
+            name='corrected_at',
+            field=models.DateTimeField(blank=True, help_text='Last change to is_flagged or corrected_role', null=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0021_predictionhistory_corrected_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingJob',
+            fields=[
+                ('job_id', models.AutoField(primary_key=True, serialize=False)),
+                ('mode', models.CharField(default='full', max_length=20)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('loading', 'Loading'), ('fitting', 'Fitting'), ('evaluating', 'Evaluating'), ('publishing', 'Publishing'), ('done', 'Done'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='queued', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Percent complete')),
+                ('active', models.BooleanField(null=True, unique=True)),
+                ('cancel_requested', models.BooleanField(default=False)),
+                ('worker', models.CharField(blank=True, help_text='host:pid running the job', max_length=100)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('version', models.CharField(blank=True, max_length=64, null=True)),
+                ('accuracy', models.FloatField(blank=True, null=True)),
+                ('message', models.TextField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='training_jobs', to='users.user')),
+            ],
+            options={
+                'db_table': 'training_job',
+                'managed': True,
+            },
+        ),
+    ]
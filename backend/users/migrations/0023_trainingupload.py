@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0022_trainingjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingUpload',
+            fields=[
+                ('upload_id', models.AutoField(primary_key=True, serialize=False)),
+                ('file_name', models.CharField(max_length=255)),
+                ('stored_path', models.CharField(blank=True, max_length=500)),
+                ('size', models.BigIntegerField(default=0, help_text='Bytes')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Percent of the file read')),
+                ('rows_inserted', models.PositiveIntegerField(default=0)),
+                ('rows_rejected', models.PositiveIntegerField(default=0)),
+                ('rejects', models.JSONField(blank=True, default=list)),
+                ('worker', models.CharField(blank=True, help_text='host:pid ingesting the file', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('message', models.TextField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='training_uploads', to='users.user')),
+            ],
+            options={
+                'db_table': 'training_upload',
+                'managed': True,
+            },
+        ),
+    ]
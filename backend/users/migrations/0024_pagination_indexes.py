@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0023_trainingupload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['created_at', 'feedback_id'], name='feedback_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionhistory',
+            index=models.Index(fields=['timestamp', 'prediction_id'], name='prediction_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='predictionhistory',
+            index=models.Index(fields=['user', 'timestamp', 'prediction_id'], name='prediction_user_time_idx'),
+        ),
+    ]
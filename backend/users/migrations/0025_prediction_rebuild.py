@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0024_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionRebuild',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(blank=True, max_length=64)),
+                ('worker', models.CharField(blank=True, help_text='host:pid running the rebuild', max_length=100)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'prediction_rebuild',
+                'managed': True,
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0025_prediction_rebuild'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingupload',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -53,11 +53,44 @@ class Predictionhistory(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     is_flagged = models.BooleanField(default=False)
     corrected_role = models.CharField(max_length=100, blank=True, null=True)
+    corrected_at = models.DateTimeField(blank=True, null=True, help_text="Last change to is_flagged or corrected_role")
     admin_notes = models.TextField(blank=True, null=True)
+    model_version = models.CharField(max_length=64, blank=True, null=True)
 
     class Meta:
         managed = True
         db_table = 'predictionhistory'
+        # Keyset pagination orders by (timestamp, prediction_id), overall and per user
+        indexes = [
+            models.Index(fields=['timestamp', 'prediction_id'], name='prediction_time_idx'),
+            models.Index(fields=['user', 'timestamp', 'prediction_id'], name='prediction_user_time_idx'),
+        ]
+
+
+class CurrentPrediction(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='current_prediction')
+    predictions = models.TextField(help_text="JSON list of top roles, as returned by predict_job")
+    model_version = models.CharField(max_length=64)
+    is_stale = models.BooleanField(default=False, help_text="Profile changed since the prediction was computed")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = True
+        db_table = 'current_prediction'
+
+
+class PredictionRebuild(models.Model):
+    # A single row naming the model version whose CurrentPrediction rebuild
+    # was claimed last: one process recomputes the rows of a new version while
+    # the other workers only read them
+    version = models.CharField(max_length=64, blank=True)
+    worker = models.CharField(max_length=100, blank=True, help_text="host:pid running the rebuild")
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        managed = True
+        db_table = 'prediction_rebuild'
 
 
 class Adminlogs(models.Model):
@@ -130,3 +163,71 @@ class Feedback(models.Model):
     class Meta:
         managed = True
         db_table = 'feedback'
+        indexes = [models.Index(fields=['created_at', 'feedback_id'], name='feedback_created_idx')]
+
+
+class TrainingJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('loading', 'Loading'),
+        ('fitting', 'Fitting'),
+        ('evaluating', 'Evaluating'),
+        ('publishing', 'Publishing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ]
+    FINISHED_STATUSES = ('done', 'failed', 'cancelled')
+
+    job_id = models.AutoField(primary_key=True)
+    mode = models.CharField(max_length=20, default='full')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    # True while the job is queued or running, NULL once finished: the unique
+    # constraint is the lock that lets only one job run across all processes
+    active = models.BooleanField(null=True, unique=True)
+    cancel_requested = models.BooleanField(default=False)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='training_jobs')
+    worker = models.CharField(max_length=100, blank=True, help_text="host:pid running the job")
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    version = models.CharField(max_length=64, blank=True, null=True)
+    accuracy = models.FloatField(blank=True, null=True)
+    message = models.TextField(blank=True, null=True)
+
+    class Meta:
+        managed = True
+        db_table = 'training_job'
+
+class TrainingUpload(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    upload_id = models.AutoField(primary_key=True)
+    file_name = models.CharField(max_length=255)
+    # Copy of the uploaded CSV read by the background worker, removed once ingested
+    stored_path = models.CharField(max_length=500, blank=True)
+    size = models.BigIntegerField(default=0, help_text="Bytes")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent of the file read")
+    rows_inserted = models.PositiveIntegerField(default=0)
+    rows_rejected = models.PositiveIntegerField(default=0)
+    # {'line': CSV line number, 'error': reason}, the first ML_UPLOAD_MAX_REJECTS only
+    rejects = models.JSONField(default=list, blank=True)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='training_uploads')
+    worker = models.CharField(max_length=100, blank=True, help_text="host:pid ingesting the file")
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    message = models.TextField(blank=True, null=True)
+
+    class Meta:
+        managed = True
+        db_table = 'training_upload'
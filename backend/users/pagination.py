@@ -0,0 +1,137 @@
+import json
+import base64
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class InvalidCursor(ValueError):
+    """
+    A ?cursor= value that was not issued for this list.
+    """
+
+
+class KeysetPagination:
+    """
+    Keyset (seek) pagination for list endpoints. A page continues from the
+    ordering key of the last row of the previous page instead of an OFFSET,
+    so every page is one index range scan however deep it is, and rows
+    added in between neither shift nor repeat pages.
+
+    ordering lists the fields rows are sorted by ('-' for descending),
+    non-null and indexed together, ending with a unique one such as the
+    primary key so the order is total.
+
+    The body stays a plain list, as before pagination. The opaque cursors
+    of the next and previous pages are sent in a Link header:
+        Link: <...?cursor=...>; rel="next", <...?cursor=...>; rel="prev"
+    ?page_size= picks the page length, capped at API_MAX_PAGE_SIZE.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def __init__(self, ordering, page_size=None):
+        self.ordering = list(ordering)
+        self.page_size = page_size or settings.API_PAGE_SIZE
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            size = self.page_size
+        return max(1, min(size, settings.API_MAX_PAGE_SIZE))
+
+    def encode_cursor(self, key, reverse):
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in key]
+        data = json.dumps({'k': values, 'r': int(reverse)}, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+    def decode_cursor(self, token, model):
+        """
+        (ordering key, reverse) of a cursor, or InvalidCursor.
+        """
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            if len(data['k']) != len(self.ordering):
+                raise ValueError("cursor does not match the ordering")
+            fields = [model._meta.get_field(name.lstrip('-')) for name in self.ordering]
+            return [field.to_python(value) for field, value in zip(fields, data['k'])], bool(data['r'])
+        except (ValueError, TypeError, KeyError, AttributeError, ValidationError) as e:
+            raise InvalidCursor(str(e))
+
+    def _ordering(self, reverse):
+        if not reverse:
+            return self.ordering
+        return [name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering]
+
+    def _after(self, key, reverse):
+        """
+        Rows past key in the (reversed) ordering: (a, b) > (x, y) as
+        a > x OR (a = x AND b > y), with < for descending fields.
+        """
+        condition = Q()
+        equal = {}
+        for name, value in zip(self._ordering(reverse), key):
+            field = name.lstrip('-')
+            condition |= Q(**equal, **{f"{field}__{'lt' if name.startswith('-') else 'gt'}": value})
+            equal[field] = value
+        return condition
+
+    def _key(self, row):
+        names = [name.lstrip('-') for name in self.ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, row._meta.get_field(name).attname) for name in names]
+
+    def _link(self, request, key, reverse):
+        return replace_query_param(
+            request.build_absolute_uri(), self.cursor_query_param, self.encode_cursor(key, reverse)
+        )
+
+    def paginate(self, request, queryset, serialize=None):
+        """
+        The Response for one page of queryset. Rows are read with
+        .iterator(), so none are cached on the queryset, and serialize
+        turns each into its output as it is read. A row that serializes
+        to None is left out but still advances the cursor.
+        """
+        size = self.get_page_size(request)
+        token = request.query_params.get(self.cursor_query_param)
+        reverse = False
+        if token:
+            try:
+                key, reverse = self.decode_cursor(token, queryset.model)
+            except InvalidCursor:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(self._after(key, reverse))
+
+        page = []
+        first = last = None
+        more = False
+        rows = queryset.order_by(*self._ordering(reverse))[:size + 1]
+        for count, row in enumerate(rows.iterator(chunk_size=size + 1)):
+            if count == size:
+                more = True
+                break
+            if first is None:
+                first = self._key(row)
+            last = self._key(row)
+            item = serialize(row) if serialize else row
+            if item is not None:
+                page.append(item)
+
+        links = []
+        if first is not None:
+            if reverse:
+                # Read backwards from a later page: flip into display order
+                page.reverse()
+                first, last = last, first
+            has_next, has_prev = (True, more) if reverse else (more, bool(token))
+            if has_next:
+                links.append(f'<{self._link(request, last, False)}>; rel="next"')
+            if has_prev:
+                links.append(f'<{self._link(request, first, True)}>; rel="prev"')
+        return Response(page, headers={'Link': ', '.join(links)} if links else None)
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from .models import User, Education, Certification, Predictionhistory, Skill, JobPlacement
 
 # 1. Serializer for Education Data
@@ -105,6 +107,10 @@ class JobPlacementSerializer(serializers.ModelSerializer):
 
 # 6. Main User Serializer (Combines everything)
 class UserSerializer(serializers.ModelSerializer):
+    """
+    All fields by default. fields= and expand= (see sparse_fields) keep
+    only the requested ones; for_fields then trims the queryset to match.
+    """
     # This fetches the related data automatically!
     # Note: 'education_set' is the default name Django gives to the reverse link
     education = EducationSerializer(many=True, source='education_set', read_only=True)
@@ -113,7 +119,108 @@ class UserSerializer(serializers.ModelSerializer):
     skills = SkillSerializer(many=True, read_only=True)
     placements = JobPlacementSerializer(many=True, read_only=True)
 
+    # Nested fields and the relation each one prefetches
+    RELATIONS = {
+        'education': 'education_set',
+        'certifications': 'certification_set',
+        'predictions': 'predictionhistory_set',
+        'skills': 'skills',
+        'placements': 'placements',
+    }
+
     class Meta:
         model = User
         fields = ['user_id', 'name', 'email', 'role', 'education', 'certifications', 'predictions', 'skills', 'placements', 'profile_picture', 'banner_image']
 
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.selected_fields(fields, expand)
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def selected_fields(cls, fields=None, expand=None):
+        """
+        Field names to output: everything when neither is given, otherwise
+        fields (default: every non-nested field) plus the nested ones in expand.
+        """
+        if fields is None and expand is None:
+            return list(cls.Meta.fields)
+        if fields is None:
+            fields = [name for name in cls.Meta.fields if name not in cls.RELATIONS]
+        return [name for name in cls.Meta.fields if name in fields or name in (expand or [])]
+
+    @classmethod
+    def sparse_fields(cls, query_params):
+        """
+        (fields, expand) from ?fields=a,b and ?expand=c,d, each None when
+        absent. Raises ValueError naming any unknown field.
+        """
+        requested = {}
+        for param in ('fields', 'expand'):
+            value = query_params.get(param)
+            requested[param] = None if value is None else [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in requested['fields'] or [] if name not in cls.Meta.fields]
+        unknown += [name for name in requested['expand'] or [] if name not in cls.RELATIONS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return requested['fields'], requested['expand']
+
+    @classmethod
+    def for_fields(cls, queryset, fields=None, expand=None):
+        """
+        queryset loading only the columns and prefetching only the
+        relations that the selected fields output.
+        """
+        selected = cls.selected_fields(fields, expand)
+        columns = [name for name in selected if name not in cls.RELATIONS and name != 'user_id']
+        return queryset.only('user_id', *columns).prefetch_related(
+            *[cls.RELATIONS[name] for name in selected if name in cls.RELATIONS]
+        )
+
+
+# 7. Compact User Serializer for login/register responses
+class SessionUserSerializer(serializers.ModelSerializer):
+    """
+    Identity, role, the number of rows in each related list and the latest
+    prediction: a payload that does not grow with the user's history and
+    decrypts nothing. Full details come from the dashboard and
+    prediction-history endpoints.
+
+    Serializes users loaded through for_session, which counts the related
+    rows in the same query.
+    """
+    counts = serializers.SerializerMethodField()
+    latest_prediction = serializers.SerializerMethodField()
+
+    COUNTED = {
+        'education': Education,
+        'certifications': Certification,
+        'predictions': Predictionhistory,
+        'skills': Skill,
+        'placements': JobPlacement,
+    }
+
+    class Meta:
+        model = User
+        fields = ['user_id', 'name', 'email', 'role', 'profile_picture', 'banner_image', 'counts', 'latest_prediction']
+
+    @classmethod
+    def for_session(cls, queryset):
+        # One correlated COUNT per list, answered from the user_id index of each table
+        return queryset.annotate(**{
+            f'{name}_count': Coalesce(Subquery(
+                model.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(n=Count('pk')).values('n')
+            ), 0)
+            for name, model in cls.COUNTED.items()
+        })
+
+    def get_counts(self, obj):
+        return {name: getattr(obj, f'{name}_count') for name in self.COUNTED}
+
+    def get_latest_prediction(self, obj):
+        if not obj.predictions_count:
+            return None
+        latest = Predictionhistory.objects.filter(user=obj).order_by('-timestamp', '-prediction_id').first()
+        return PredictionSerializer(latest).data if latest else None
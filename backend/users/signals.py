@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Education, Certification, Skill
+
+
+@receiver([post_save, post_delete], sender=Education)
+@receiver([post_save, post_delete], sender=Certification)
+@receiver([post_save, post_delete], sender=Skill)
+def refresh_current_prediction(sender, instance, **kwargs):
+    """
+    A change to any row the predictor reads invalidates the user's
+    materialized prediction. Bulk operations bypass signals.
+    """
+    if not settings.ML_MATERIALIZE_PREDICTIONS:
+        return
+    from ml_service.materialize import mark_stale
+    mark_stale(instance.user_id)
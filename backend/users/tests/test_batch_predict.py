@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import joblib
+import pandas as pd
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import OneHotEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+from ml_service.predict import predict_job, predict_jobs
+from ml_service.registry import registry, MODEL_FILENAME, write_version_stamp
+from users.views import BatchPredictJobView
+from unittest.mock import MagicMock, patch
+
+PROFILES = [
+    {'degree': 'B.Tech', 'specialization': 'Computer Science', 'skills': 'Python, Django, SQL', 'certifications': 'AWS Certified Developer'},
+    {'degree': 'B.Des', 'specialization': 'Design', 'skills': 'Figma, Sketch', 'certifications': ''},
+    {'degree': 'M.Sc', 'specialization': 'Statistics', 'skills': 'Python, Pandas, NumPy', 'certifications': 'IBM Data Science'},
+    {'degree': 'B.Tech', 'specialization': 'Electronics', 'skills': 'Docker, Kubernetes, Linux', 'certifications': 'CKA'},
+]
+ROLES = ['Backend Developer', 'UI/UX Designer', 'Data Scientist', 'DevOps Engineer']
+
+
+def train_small_pipeline():
+    rows = []
+    for i in range(12):
+        for profile, role in zip(PROFILES, ROLES):
+            rows.append(dict(profile, target_job_role=role if i % 4 else ROLES[i % len(ROLES)]))
+    df = pd.DataFrame(rows)
+    df['text_features'] = df['skills'] + " " + df['certifications']
+    preprocessor = ColumnTransformer(transformers=[
+        ('cat', OneHotEncoder(handle_unknown='ignore'), ['degree', 'specialization']),
+        ('text', TfidfVectorizer(stop_words='english', max_features=1000), 'text_features')
+    ])
+    clf = Pipeline(steps=[('preprocessor', preprocessor),
+                          ('classifier', RandomForestClassifier(n_estimators=10, random_state=42))])
+    clf.fit(df[['degree', 'specialization', 'text_features']], df['target_job_role'])
+    return clf
+
+
+class BatchPredictTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.model_dir = tempfile.mkdtemp()
+        joblib.dump(train_small_pipeline(), os.path.join(cls.model_dir, MODEL_FILENAME))
+        write_version_stamp(cls.model_dir, 'batch-test')
+        cls.settings_override = override_settings(ML_MODEL_DIR=cls.model_dir)
+        cls.settings_override.enable()
+        registry.reset()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        registry.reset()
+        shutil.rmtree(cls.model_dir)
+        super().tearDownClass()
+
+    def test_batch_matches_single_predictions(self):
+        batch = predict_jobs(PROFILES)
+        self.assertNotIn('error', batch)
+        for profile, result in zip(PROFILES, batch['results']):
+            self.assertEqual(result['predictions'], predict_job(profile)['predictions'])
+
+    def test_empty_batch(self):
+        self.assertEqual(predict_jobs([])['results'], [])
+
+    @patch('users.views.load_user_profiles')
+    @patch('users.views.User.objects.filter')
+    def test_view_reports_row_errors_inline(self, mock_filter, mock_profiles):
+        mock_filter.return_value.values_list.return_value = [1, 2]
+        mock_profiles.return_value = {1: PROFILES[0]}
+
+        request = APIRequestFactory().post('/api/predict/batch/', {'user_ids': [1, 2, 3]}, format='json')
+        force_authenticate(request, user=MagicMock(role='admin', is_authenticated=True))
+        response = BatchPredictJobView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual(results[0]['predictions'], predict_job(PROFILES[0])['predictions'])
+        self.assertEqual(results[1], {'user_id': 2, 'error': 'Education details are required for prediction'})
+        self.assertEqual(results[2], {'user_id': 3, 'error': 'User not found'})
+        self.assertEqual(response.data['failed'], 2)
+
+    def test_view_scores_good_profiles_next_to_bad_ones(self):
+        profiles = [
+            PROFILES[0],
+            {'degree': 'B.Tech', 'specialization': 'Computer Science', 'skills': ['Python', 'Django', 'SQL'],
+             'certifications': None},
+            {'degree': 'B.Des', 'specialization': 'Design', 'skills': {'name': 'Figma'}},
+            {'degree': ['B.Tech'], 'specialization': 'Electronics'},
+            {'degree': 'M.Sc', 'specialization': 'Statistics', 'skills': 42, 'certifications': ''},
+            'B.Tech',
+            {'specialization': 'Design', 'skills': 'Figma'},
+        ]
+        request = APIRequestFactory().post('/api/predict/batch/', {'profiles': profiles}, format='json')
+        force_authenticate(request, user=MagicMock(role='admin', is_authenticated=True))
+        response = BatchPredictJobView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual(results[0]['predictions'], predict_job(PROFILES[0])['predictions'])
+        self.assertEqual(results[1]['predictions'], predict_job(dict(PROFILES[0], certifications=''))['predictions'])
+        self.assertEqual(results[2], {'index': 2, 'error': 'skills must be text'})
+        self.assertEqual(results[3], {'index': 3, 'error': 'degree must be text'})
+        self.assertIn('predictions', results[4])
+        self.assertEqual(results[5], {'index': 5, 'error': 'Each profile must be an object'})
+        self.assertEqual(results[6], {'index': 6, 'error': 'Education details are required for prediction'})
+        self.assertEqual((response.data['scored'], response.data['failed']), (3, 4))
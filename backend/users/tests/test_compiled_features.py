@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from django.test import SimpleTestCase
+from sklearn.pipeline import Pipeline
+from sklearn.linear_model import LogisticRegression
+from ml_service.features import CompiledFeatures
+from ml_service.predict import _input_row
+from users.tests.test_batch_predict import PROFILES, train_small_pipeline
+
+EDGE_PROFILES = [
+    # Unseen categories and tokens, stop words, repeated and mixed-case terms
+    {'degree': 'PhD', 'specialization': 'Astronomy', 'skills': 'The Python, PYTHON and python, C++', 'certifications': 'Unknown Cert'},
+    {'degree': 'B.Tech', 'specialization': 'Computer Science', 'skills': '', 'certifications': ''},
+    {},
+]
+
+
+class CompiledFeaturesTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pipeline = train_small_pipeline()
+        cls.features = CompiledFeatures.from_pipeline(cls.pipeline)
+        cls.profiles = PROFILES + EDGE_PROFILES
+
+    def test_rows_identical_to_column_transformer(self):
+        expected = self.pipeline.named_steps['preprocessor'].transform(pd.DataFrame([_input_row(p) for p in self.profiles]))
+        expected = sp.csr_matrix(expected)
+        actual = self.features.transform(self.profiles)
+        self.assertEqual(actual.shape, expected.shape)
+        self.assertEqual((actual != expected).nnz, 0)
+
+    def test_probabilities_identical_to_pipeline(self):
+        expected = self.pipeline.predict_proba(pd.DataFrame([_input_row(p) for p in self.profiles]))
+        actual = self.pipeline.named_steps['classifier'].predict_proba(self.features.transform(self.profiles))
+        self.assertTrue(np.array_equal(actual, expected))
+
+    def test_unsupported_pipeline_is_not_compiled(self):
+        self.assertIsNone(CompiledFeatures.from_pipeline(Pipeline([('classifier', LogisticRegression())])))
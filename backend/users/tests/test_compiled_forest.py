@@ -0,0 +1,45 @@
+import shutil
+import tempfile
+import numpy as np
+from django.test import SimpleTestCase
+from sklearn.linear_model import LogisticRegression
+from ml_service.features import CompiledFeatures
+from ml_service.forest import CompiledForest, export_forest, load_forest
+from users.tests.test_batch_predict import PROFILES, train_small_pipeline
+from users.tests.test_compiled_features import EDGE_PROFILES
+
+
+class CompiledForestTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        pipeline = train_small_pipeline()
+        cls.classifier = pipeline.named_steps['classifier']
+        cls.forest = CompiledForest.from_classifier(cls.classifier, 'forest-test')
+        cls.X = CompiledFeatures.from_pipeline(pipeline).transform(PROFILES + EDGE_PROFILES)
+
+    def test_probabilities_identical_to_sklearn(self):
+        self.assertTrue(np.array_equal(self.forest.predict_proba(self.X), self.classifier.predict_proba(self.X)))
+        self.assertTrue(np.array_equal(self.forest.predict_proba(self.X[:1]), self.classifier.predict_proba(self.X[:1])))
+        self.assertEqual(list(self.forest.classes_), list(self.classifier.classes_))
+
+    def test_leaves_match_sklearn_apply(self):
+        leaves = self.forest.apply(self.X.toarray().astype(np.float32))
+        expected = self.classifier.apply(self.X)
+        for tree, root in enumerate(self.forest.roots):
+            self.assertTrue(np.array_equal(leaves[:, tree] - root, expected[:, tree]))
+
+    def test_export_round_trip_is_memory_mapped(self):
+        model_dir = tempfile.mkdtemp()
+        try:
+            export_forest(self.classifier, model_dir, 'forest-test')
+            forest = load_forest(model_dir, 'forest-test', self.classifier, mmap_mode='r')
+            self.assertIsInstance(forest.threshold, np.memmap)
+            self.assertTrue(np.array_equal(forest.predict_proba(self.X), self.classifier.predict_proba(self.X)))
+            # A stale export is ignored in favour of the classifier itself
+            self.assertEqual(load_forest(model_dir, 'other-version', self.classifier).version, 'other-version')
+        finally:
+            shutil.rmtree(model_dir)
+
+    def test_unsupported_classifier_is_not_compiled(self):
+        self.assertIsNone(CompiledForest.from_classifier(LogisticRegression()))
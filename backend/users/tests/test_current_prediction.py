@@ -0,0 +1,94 @@
+import json
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+from ml_service.materialize import PredictionRefresher, claim_rebuild, refresh_user_predictions
+from users.models import CurrentPrediction, PredictionRebuild, Skill
+from users.signals import refresh_current_prediction
+from users.views import PredictJobView
+from users.tests.test_batch_predict import PROFILES
+from unittest.mock import MagicMock, patch
+
+TOP_ROLES = [{'role': 'Backend Developer', 'confidence': 80.0, 'missing_skills': ['Docker']}]
+
+
+class CurrentPredictionTests(SimpleTestCase):
+    @patch('ml_service.materialize.prediction_refresher')
+    @patch('ml_service.materialize.transaction.on_commit', side_effect=lambda func: func())
+    @patch.object(CurrentPrediction, 'objects')
+    def test_profile_change_marks_stale_and_queues_refresh(self, mock_objects, mock_on_commit, mock_refresher):
+        refresh_current_prediction(sender=Skill, instance=MagicMock(user_id=5))
+        mock_objects.filter.assert_called_once_with(user_id=5)
+        mock_objects.filter.return_value.update.assert_called_once_with(is_stale=True)
+        mock_refresher.enqueue.assert_called_once_with([5])
+
+    @patch('ml_service.materialize.predict_jobs')
+    @patch('ml_service.materialize.load_user_profiles')
+    @patch.object(CurrentPrediction, 'objects')
+    def test_refresh_upserts_rows_and_drops_users_without_education(self, mock_objects, mock_profiles, mock_predict):
+        mock_profiles.return_value = {1: PROFILES[0]}
+        mock_predict.return_value = {'results': [{'predictions': TOP_ROLES}], 'model_version': 'v2'}
+
+        self.assertEqual(refresh_user_predictions([1, 2]), 1)
+        mock_objects.filter.assert_called_once_with(user_id__in=[2])
+        mock_predict.assert_called_once_with([PROFILES[0]])
+        rows = mock_objects.bulk_create.call_args.args[0]
+        self.assertEqual([(row.user_id, row.model_version, row.is_stale) for row in rows], [(1, 'v2', False)])
+        self.assertEqual(json.loads(rows[0].predictions), TOP_ROLES)
+
+    @patch('users.views.Predictionhistory.objects.create', return_value=MagicMock(prediction_id=9))
+    @patch('users.views.predict_job')
+    @patch('users.views.current_prediction', return_value={'predictions': TOP_ROLES, 'model_version': 'v2'})
+    def test_predict_view_serves_materialized_prediction(self, mock_current, mock_predict, mock_history):
+        request = APIRequestFactory().post('/api/predict/', {'user_id': 1}, format='json')
+        response = PredictJobView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['predictions'], TOP_ROLES)
+        self.assertEqual(response.data['prediction_id'], 9)
+        mock_predict.assert_not_called()
+        self.assertEqual(mock_history.call_args.kwargs['user_id'], 1)
+
+
+@patch.object(PredictionRebuild, 'objects')
+class PredictionRebuildTests(SimpleTestCase):
+    def test_first_process_to_see_a_version_claims_the_rebuild(self, mock_objects):
+        rebuild = mock_objects.filter.return_value
+        rebuild.exclude.return_value.update.return_value = 1
+        self.assertTrue(claim_rebuild('v2'))
+        rebuild.exclude.assert_called_once_with(version='v2')
+
+        # Claimed elsewhere and its heartbeat is recent
+        rebuild.exclude.return_value.update.return_value = 0
+        rebuild.filter.return_value.update.return_value = 0
+        self.assertFalse(claim_rebuild('v2'))
+
+    @patch('ml_service.materialize.refresh_user_predictions')
+    @patch('ml_service.materialize.rebuild_pending', return_value=True)
+    @patch('ml_service.materialize.claim_rebuild', return_value=False)
+    @patch.object(CurrentPrediction, 'objects')
+    def test_other_workers_only_watch(self, mock_current, mock_claim, mock_pending, mock_refresh, mock_objects):
+        refresher = PredictionRefresher()
+        refresher._version = 'v2'
+        refresher._refresh_outdated('v2')
+
+        mock_current.filter.assert_not_called()
+        mock_refresh.assert_not_called()
+        self.assertEqual(refresher._watching, 'v2')
+
+    @patch('ml_service.materialize.refresh_user_predictions', return_value=2)
+    @patch('ml_service.materialize.claim_rebuild', return_value=True)
+    @patch.object(CurrentPrediction, 'objects')
+    def test_claimant_rebuilds_and_finishes(self, mock_current, mock_claim, mock_refresh, mock_objects):
+        outdated = mock_current.filter.return_value.exclude.return_value.order_by.return_value.values_list.return_value
+        outdated.__getitem__.side_effect = [[1, 2], []]
+        claim = mock_objects.filter.return_value
+        claim.update.return_value = 1
+
+        refresher = PredictionRefresher(batch_size=2)
+        refresher._version = 'v2'
+        refresher._refresh_outdated('v2')
+
+        mock_refresh.assert_called_once_with([1, 2])
+        self.assertEqual(refresher.refreshed, 2)
+        self.assertIn('heartbeat_at', claim.update.call_args_list[0].kwargs)
+        self.assertIn('finished_at', claim.update.call_args_list[1].kwargs)
@@ -0,0 +1,76 @@
+import tempfile
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from django.test import SimpleTestCase
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import OneHotEncoder
+from ml_service.dataset import concat_training_frames
+from ml_service.feature_cache import TrainingFeatureCache, fit_cached_features
+from users.tests.test_batch_predict import PROFILES, ROLES
+from unittest.mock import patch
+
+CONFIG = {'categorical_features': ['degree', 'specialization'], 'tfidf': {'stop_words': 'english', 'max_features': 6}}
+FEATURES = ['degree', 'specialization', 'text_features']
+
+
+def dense(X):
+    return X.toarray() if sp.issparse(X) else X
+
+
+def synthetic_frame(rows):
+    return concat_training_frames([pd.DataFrame([
+        dict(profile, skills=f"{profile['skills']}, Skill{i % 5}", target_job_role=role)
+        for i in range(rows) for profile, role in zip(PROFILES, ROLES)
+    ])]).drop(columns=['text_features'])
+
+
+class FeatureCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.frame = synthetic_frame(5)
+        self.loaded = []
+
+    def update(self, config, up_to_id, cached_rows):
+        """cache.update with TrainingData standing in for rows 1..len(self.frame)"""
+        def load_frame(after_id, up_to_id):
+            self.loaded.append((after_id, up_to_id))
+            return self.frame.iloc[after_id:up_to_id].reset_index(drop=True)
+        cache = TrainingFeatureCache(self.cache_dir, config)
+        with patch('ml_service.feature_cache.load_training_frame', side_effect=load_frame), \
+                patch('ml_service.feature_cache.TrainingData.objects') as mock_objects:
+            mock_objects.filter.return_value.count.return_value = cached_rows
+            return cache, cache.update(up_to_id)
+
+    def test_matches_fitted_column_transformer(self):
+        self.update(CONFIG, 12, 0)
+        cache, (frame, counts) = self.update(CONFIG, 20, 12)
+        self.assertEqual(self.loaded, [(0, 12), (12, 20)])
+        df = concat_training_frames([frame])
+        fit_rows = np.arange(0, 20, 2)
+
+        preprocessor, X = fit_cached_features(df, counts, cache.terms, CONFIG, fit_rows)
+
+        expected = ColumnTransformer(transformers=[
+            ('cat', OneHotEncoder(handle_unknown='ignore'), CONFIG['categorical_features']),
+            ('text', TfidfVectorizer(**CONFIG['tfidf']), 'text_features')
+        ]).fit(df[FEATURES].iloc[fit_rows])
+        self.assertEqual(preprocessor.sparse_output_, expected.sparse_output_)
+        np.testing.assert_array_equal(dense(X), dense(expected.transform(df[FEATURES])))
+        self.assertEqual(preprocessor.named_transformers_['text'].vocabulary_, expected.named_transformers_['text'].vocabulary_)
+        # Transforming only some rows leaves the fitted features unchanged
+        _, X_rows = fit_cached_features(df, counts, cache.terms, CONFIG, fit_rows, rows=np.array([7, 3]))
+        np.testing.assert_array_equal(dense(X_rows), dense(X)[[7, 3]])
+        # New profiles go through the preprocessor as through the fitted one
+        profiles = pd.DataFrame([dict(profile, text_features=f"{profile['skills']} Skill9") for profile in PROFILES])
+        np.testing.assert_array_equal(
+            dense(preprocessor.transform(profiles[FEATURES])), dense(expected.transform(profiles[FEATURES]))
+        )
+
+    def test_reencodes_when_config_changes_or_rows_are_deleted(self):
+        self.update(CONFIG, 20, 0)
+        self.update(CONFIG, 20, 20)
+        self.update(dict(CONFIG, tfidf={'stop_words': 'english', 'max_features': 100}), 20, 20)
+        self.update(CONFIG, 20, 19)
+        self.assertEqual(self.loaded, [(0, 20), (20, 20), (0, 20), (0, 20)])
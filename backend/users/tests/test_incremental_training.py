@@ -0,0 +1,83 @@
+import pickle
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from ml_service.dataset import concat_training_frames
+from ml_service.incremental import (
+    INCREMENTAL_LEARNER, build_incremental_pipeline, partial_fit_frame, frame_accuracy, unknown_roles
+)
+from ml_service import train
+from users.tests.test_batch_predict import PROFILES, ROLES
+from unittest.mock import patch
+
+CLASSES = np.array(sorted(set(ROLES)), dtype=object)
+WATERMARK = {'training_id': 20, 'placement_id': 3, 'corrected_at': '2026-01-02T00:00:00+00:00'}
+PREVIOUS = {'training_id': 12, 'placement_id': 3, 'corrected_at': '2026-01-01T00:00:00+00:00'}
+
+
+def training_frame(rows=4):
+    return concat_training_frames([pd.DataFrame([
+        dict(profile, target_job_role=role) for profile, role in zip(PROFILES, ROLES)
+    ] * rows)])
+
+
+class IncrementalPipelineTests(SimpleTestCase):
+    def test_learns_in_increments_with_unseen_values(self):
+        clf = build_incremental_pipeline()
+        df = training_frame()
+        for _ in range(5):
+            partial_fit_frame(clf, df, CLASSES, chunk_rows=4)
+        self.assertEqual(frame_accuracy(clf, df, chunk_rows=3), 1.0)
+
+        # A specialization and skills never seen before still encode, no refit needed
+        new_rows = concat_training_frames([pd.DataFrame([
+            dict(PROFILES[0], specialization='Robotics', skills='ROS, Rust', target_job_role=ROLES[0])
+        ])])
+        partial_fit_frame(clf, new_rows, clf.named_steps['classifier'].classes_, chunk_rows=4)
+        self.assertEqual(unknown_roles(clf, new_rows), [])
+        self.assertEqual(unknown_roles(clf, training_frame().assign(target_job_role='Astronaut')), ['Astronaut'])
+
+        restored = pickle.loads(pickle.dumps(clf))
+        np.testing.assert_array_equal(restored.predict_proba(df), clf.predict_proba(df))
+
+
+@patch.object(train, 'training_watermark', return_value=WATERMARK)
+@patch.object(train, 'publish_model', return_value=('v3', '/models/versions/v3/job_predictor.pkl'))
+@patch.object(train, 'read_current_version', return_value='v2')
+class TrainIncrementalTests(SimpleTestCase):
+    def fitted_pipeline(self):
+        clf = build_incremental_pipeline()
+        for _ in range(5):
+            partial_fit_frame(clf, training_frame(), CLASSES, chunk_rows=4)
+        return clf
+
+    @patch.object(train, 'load_warm_profiles', return_value=[PROFILES[0]])
+    @patch.object(train, 'load_training_rows')
+    @patch.object(train, 'read_metadata')
+    def test_learns_only_rows_after_watermark(self, mock_metadata, mock_rows, mock_warm, mock_current, mock_publish, mock_watermark):
+        mock_metadata.return_value = {
+            'learner': INCREMENTAL_LEARNER, 'watermark': PREVIOUS, 'base_accuracy': 0.9,
+            'rebuilt_at': '2026-01-01T00:00:00+00:00', 'increments': 2, 'records': 100,
+        }
+        mock_rows.return_value = (training_frame(rows=1), {'synthetic_records': 4, 'real_records': 0, 'feedback_records': 0})
+        with patch.object(train.joblib, 'load', return_value=self.fitted_pipeline()):
+            result = train.train_incremental()
+
+        mock_rows.assert_called_once_with(WATERMARK, PREVIOUS)
+        metadata = mock_publish.call_args.kwargs
+        self.assertEqual((metadata['mode'], metadata['increments'], metadata['records']), ('incremental', 3, 104))
+        self.assertEqual(metadata['watermark'], WATERMARK)
+        self.assertEqual(mock_publish.call_args.args[1], [PROFILES[0]])
+        self.assertEqual((result['version'], result['accuracy'], result['base_accuracy']), ('v3', 1.0, 0.9))
+
+    @patch.object(train, 'load_training_rows')
+    @patch.object(train, 'read_metadata', return_value={'learner': 'random_forest', 'watermark': PREVIOUS})
+    def test_rebuilds_from_all_rows_after_full_training(self, mock_metadata, mock_rows, mock_current, mock_publish, mock_watermark):
+        mock_rows.return_value = (training_frame(rows=5), {'synthetic_records': 20, 'real_records': 0, 'feedback_records': 0})
+        train.train_incremental()
+
+        mock_rows.assert_called_once_with(WATERMARK)
+        metadata = mock_publish.call_args.kwargs
+        self.assertEqual((metadata['mode'], metadata['learner'], metadata['increments']), ('rebuild', INCREMENTAL_LEARNER, 0))
+        self.assertEqual(metadata['records'], 20)
+        self.assertEqual(metadata['accuracy'], metadata['base_accuracy'])
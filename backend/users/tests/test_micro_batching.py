@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.test import SimpleTestCase
+from ml_service.batching import MicroBatcher
+
+
+class MicroBatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.calls = []
+        self.release = threading.Event()
+
+        def predict_rows(loaded, profiles):
+            self.release.wait(5)
+            self.calls.append(len(profiles))
+            return [f"{loaded}:{profile['skills']}" for profile in profiles]
+
+        self.batcher = MicroBatcher(predict_rows, window_ms=200, max_rows=8)
+
+    def submit_all(self, requests):
+        with ThreadPoolExecutor(max_workers=len(requests)) as pool:
+            futures = [pool.submit(self.batcher.predict, loaded, key, {'skills': key}) for loaded, key in requests]
+            self.release.set()
+            return [future.result() for future in futures]
+
+    def test_concurrent_requests_share_a_batch(self):
+        results = self.submit_all([('v1', f'skill{i}') for i in range(5)])
+        self.assertEqual(results, [f'v1:skill{i}' for i in range(5)])
+        self.assertEqual(self.calls, [5])
+
+    def test_duplicate_requests_are_coalesced(self):
+        results = self.submit_all([('v1', 'python')] * 4)
+        self.assertEqual(results, ['v1:python'] * 4)
+        self.assertEqual(sum(self.calls), 1)
+        self.assertEqual(self.batcher.stats()['coalesced'], 3)
+
+    def test_batch_is_capped_at_max_rows(self):
+        self.submit_all([('v1', f'skill{i}') for i in range(12)])
+        self.assertEqual(sum(self.calls), 12)
+        self.assertLessEqual(max(self.calls), 8)
@@ -0,0 +1,34 @@
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from ml_service.benchmark import FEATURE_COLUMNS, candidate_grid, fit_candidate, inference_latency
+from ml_service.dataset import concat_training_frames
+from ml_service.train import FEATURE_CONFIG
+from users.tests.test_batch_predict import PROFILES, ROLES
+
+
+class ModelBenchmarkTests(SimpleTestCase):
+    def test_grid_crosses_only_the_parameters_a_family_has(self):
+        specs = candidate_grid(['forest', 'logistic', 'hgb'], [10, 100], [None, 8], [1000])
+        self.assertEqual([spec['name'] for spec in specs], [
+            'forest-10t-dmax-tfidf1000', 'forest-10t-d8-tfidf1000', 'forest-100t-dmax-tfidf1000',
+            'forest-100t-d8-tfidf1000', 'logistic-tfidf1000', 'hgb-dmax-tfidf1000', 'hgb-d8-tfidf1000',
+        ])
+        with self.assertRaises(ValueError):
+            candidate_grid(['svm'], [10], [None], [1000])
+
+    def test_every_family_fits_and_is_timed(self):
+        df = concat_training_frames([pd.DataFrame([
+            dict(profile, target_job_role=role) for profile, role in zip(PROFILES, ROLES)
+        ] * 4)])
+        X, y = df[FEATURE_COLUMNS], np.asarray(df['target_job_role'], dtype=object)
+        weights = np.ones(len(df))
+        artifact_dir = tempfile.mkdtemp()
+        for spec in candidate_grid(['forest', 'logistic', 'sgd', 'hgb'], [5], [None], [50]):
+            result = fit_candidate(spec, FEATURE_CONFIG, X, y, weights, X, y, weights, artifact_dir)
+            self.assertGreater(result['artifact_bytes'], 0)
+            self.assertTrue(0 <= result['accuracy'] <= 1)
+            p50, p99, per_row = inference_latency(joblib.load(result['path']), X, 8)
+            self.assertTrue(0 < p50 <= p99 and per_row > 0)
@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+import joblib
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from ml_service.registry import (
+    ModelRegistry, MODEL_FILENAME, write_version_stamp, staging_dir, write_metadata,
+    publish_version, list_versions, prune_versions, new_model_version
+)
+from users.admin_views import AdminModelView
+from unittest.mock import MagicMock, patch
+
+class ModelRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.model_dir)
+        # check_interval=0 so every get() looks at the artifact on disk
+        self.registry = ModelRegistry(model_dir=self.model_dir, check_interval=0)
+
+    def publish(self, artifact, version):
+        joblib.dump(artifact, os.path.join(self.model_dir, MODEL_FILENAME))
+        write_version_stamp(self.model_dir, version)
+
+    def test_returns_none_without_model(self):
+        self.assertIsNone(self.registry.get())
+        self.assertFalse(self.registry.info()['loaded'])
+
+    def test_loads_once_per_version(self):
+        self.publish({'model': 1}, 'v1')
+        with patch.object(ModelRegistry, '_load', autospec=True, side_effect=ModelRegistry._load) as mock_load:
+            first = self.registry.get()
+            second = self.registry.get()
+        self.assertIs(first, second)
+        self.assertEqual(mock_load.call_count, 1)
+        self.assertEqual(first.version, 'v1')
+        self.assertEqual(self.registry.info()['version'], 'v1')
+
+    def test_picks_up_new_version(self):
+        self.publish({'model': 1}, 'v1')
+        old = self.registry.get()
+        self.publish({'model': 2}, 'v2')
+        new = self.registry.get()
+        self.assertEqual(new.version, 'v2')
+        self.assertEqual(new.pipeline, {'model': 2})
+        # A request holding the old snapshot still sees the old pipeline
+        self.assertEqual(old.pipeline, {'model': 1})
+
+    def test_failed_reload_keeps_serving_current(self):
+        self.publish({'model': 1}, 'v1')
+        self.registry.get()
+        with open(os.path.join(self.model_dir, MODEL_FILENAME), 'wb') as f:
+            f.write(b'truncated')
+        write_version_stamp(self.model_dir, 'v2')
+        self.assertEqual(self.registry.get().version, 'v1')
+
+    def test_check_interval_skips_stat(self):
+        self.publish({'model': 1}, 'v1')
+        registry = ModelRegistry(model_dir=self.model_dir, check_interval=3600)
+        registry.get()
+        self.publish({'model': 2}, 'v2')
+        self.assertEqual(registry.get().version, 'v1')
+
+
+class VersionedModelTests(SimpleTestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.model_dir)
+        self.registry = ModelRegistry(model_dir=self.model_dir, check_interval=0)
+
+    def train(self, artifact, version, **metadata):
+        artifact_dir = staging_dir(self.model_dir, version)
+        joblib.dump(artifact, os.path.join(artifact_dir, MODEL_FILENAME))
+        write_metadata(artifact_dir, version, **metadata)
+        publish_version(self.model_dir, version, artifact_dir)
+
+    def test_serves_current_pointer_and_rolls_back(self):
+        self.train({'model': 1}, 'v1', accuracy=0.8)
+        self.train({'model': 2}, 'v2', accuracy=0.7)
+        self.assertEqual(self.registry.get().pipeline, {'model': 2})
+
+        publish_version(self.model_dir, 'v1')
+        loaded = self.registry.get()
+        self.assertEqual((loaded.version, loaded.pipeline), ('v1', {'model': 1}))
+        self.assertEqual([(v['version'], v['current'], v['accuracy']) for v in list_versions(self.model_dir)],
+                         [('v2', False, 0.7), ('v1', True, 0.8)])
+
+    def test_unpublished_staging_is_invisible(self):
+        self.train({'model': 1}, 'v1')
+        staged = staging_dir(self.model_dir, 'v2')
+        joblib.dump({'model': 2}, os.path.join(staged, MODEL_FILENAME))
+        self.assertEqual([v['version'] for v in list_versions(self.model_dir)], ['v1'])
+        self.assertEqual(self.registry.get().version, 'v1')
+        with self.assertRaises(ValueError):
+            publish_version(self.model_dir, 'v3')
+
+    def test_version_names_do_not_collide(self):
+        self.train({'model': 1}, 'v1')
+        staged = staging_dir(self.model_dir, 'v1')
+        with self.assertRaisesMessage(ValueError, 'already exists'):
+            publish_version(self.model_dir, 'v1', staged)
+        self.assertEqual(self.registry.get().pipeline, {'model': 1})
+        # Sub-second stamps: versions trained in the same second differ
+        self.assertRegex(new_model_version(), r'^\d{8}T\d{6}\.\d{6}Z$')
+
+    def test_prune_keeps_current(self):
+        for version in ['v1', 'v2', 'v3']:
+            self.train({'model': version}, version)
+        publish_version(self.model_dir, 'v1')
+        self.assertEqual(prune_versions(self.model_dir, keep=1), ['v2'])
+        self.assertEqual([v['version'] for v in list_versions(self.model_dir)], ['v3', 'v1'])
+
+    @patch('users.admin_views.Adminlogs.objects.create')
+    @patch('users.admin_views.User.objects.get')
+    def test_rollback_action_defaults_to_previous_version(self, mock_get_user, mock_log):
+        self.train({'model': 1}, 'v1')
+        self.train({'model': 2}, 'v2')
+        request = APIRequestFactory().post('/api/admin/model/rollback/', {}, format='json')
+        force_authenticate(request, user=MagicMock(role='admin', is_authenticated=True))
+        with override_settings(ML_MODEL_DIR=self.model_dir):
+            response = AdminModelView.as_view()(request, action='rollback')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['version'], 'v1')
+        self.assertEqual(self.registry.get().version, 'v1')
+        self.assertEqual(mock_log.call_args.kwargs['action_type'], 'MODEL_ROLLBACK')
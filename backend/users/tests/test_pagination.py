@@ -0,0 +1,77 @@
+import re
+import datetime
+from django.db.models import Q
+from django.test import SimpleTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from users.models import Predictionhistory
+from users.pagination import InvalidCursor, KeysetPagination
+from unittest.mock import MagicMock
+
+T1 = datetime.datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc)
+T2 = T1 - datetime.timedelta(hours=1)
+
+
+def request(url):
+    return Request(APIRequestFactory().get(url))
+
+
+def queryset(rows):
+    qs = MagicMock()
+    qs.model = Predictionhistory
+    qs.filter.return_value = qs
+    qs.order_by.return_value = qs
+    qs.__getitem__.return_value = qs
+    qs.iterator.return_value = iter(rows)
+    return qs
+
+
+class KeysetPaginationTests(SimpleTestCase):
+    def setUp(self):
+        self.paginator = KeysetPagination(['-timestamp', '-prediction_id'], page_size=2)
+
+    def test_cursor_round_trip(self):
+        token = self.paginator.encode_cursor([T1, 7], True)
+        self.assertEqual(self.paginator.decode_cursor(token, Predictionhistory), ([T1, 7], True))
+        for token in ['garbage', self.paginator.encode_cursor([7], False), self.paginator.encode_cursor(['x', 7], False)]:
+            with self.assertRaises(InvalidCursor):
+                self.paginator.decode_cursor(token, Predictionhistory)
+
+    def test_rows_after_the_key(self):
+        self.assertEqual(
+            self.paginator._after([T1, 7], False),
+            Q(timestamp__lt=T1) | Q(timestamp=T1, prediction_id__lt=7)
+        )
+        self.assertEqual(
+            self.paginator._after([T1, 7], True),
+            Q(timestamp__gt=T1) | Q(timestamp=T1, prediction_id__gt=7)
+        )
+
+    def test_first_page_links_the_next(self):
+        rows = [{'timestamp': T1, 'prediction_id': 9}, {'timestamp': T1, 'prediction_id': 8},
+                {'timestamp': T2, 'prediction_id': 5}]
+        qs = queryset(rows)
+        response = self.paginator.paginate(request('/api/admin/prediction-logs/?search=x'), qs, lambda row: row['prediction_id'])
+        self.assertEqual(response.data, [9, 8])
+        qs.order_by.assert_called_once_with('-timestamp', '-prediction_id')
+        qs.__getitem__.assert_called_once_with(slice(None, 3))
+        links = dict((rel, url) for url, rel in re.findall(r'<([^>]+)>; rel="(\w+)"', response['Link']))
+        self.assertEqual(list(links), ['next'])
+        self.assertIn('search=x', links['next'])
+        token = re.search(r'cursor=([\w-]+)', links['next']).group(1)
+        self.assertEqual(self.paginator.decode_cursor(token, Predictionhistory), ([T1, 8], False))
+
+    def test_previous_page_is_read_backwards(self):
+        qs = queryset([{'timestamp': T1, 'prediction_id': 9}, {'timestamp': T1, 'prediction_id': 10}])
+        token = self.paginator.encode_cursor([T1, 8], True)
+        response = self.paginator.paginate(request(f'/api/x/?cursor={token}'), qs, lambda row: row['prediction_id'])
+        self.assertEqual(response.data, [10, 9])
+        qs.order_by.assert_called_once_with('timestamp', 'prediction_id')
+        self.assertEqual(re.findall(r'rel="(\w+)"', response['Link']), ['next'])
+
+    def test_page_size_is_capped_and_bad_cursors_rejected(self):
+        with self.settings(API_MAX_PAGE_SIZE=5):
+            self.assertEqual(self.paginator.get_page_size(request('/api/x/?page_size=50')), 5)
+            self.assertEqual(self.paginator.get_page_size(request('/api/x/?page_size=abc')), 2)
+        response = self.paginator.paginate(request('/api/x/?cursor=abc'), queryset([]))
+        self.assertEqual((response.status_code, response.data), (400, {'error': 'Invalid cursor'}))
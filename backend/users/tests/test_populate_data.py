@@ -0,0 +1,25 @@
+from django.test import SimpleTestCase
+from populate_data import _batches, generate_batch
+from users.seed_data import ARCHETYPES
+
+
+class PopulateDataTests(SimpleTestCase):
+    def test_rows_follow_their_archetype(self):
+        for degree, specialization, skills, certifications, role in generate_batch(1, 0, 2000):
+            archetype = ARCHETYPES[role]
+            skills = skills.split(', ')
+            certifications = certifications.split(', ') if certifications else []
+            self.assertIn(degree, archetype['degrees'])
+            self.assertIn(specialization, archetype['specializations'])
+            self.assertTrue(min(3, len(archetype['skills'])) <= len(skills) <= 8)
+            self.assertEqual(len(set(skills)), len(skills))
+            self.assertLessEqual(set(skills), set(archetype['skills']))
+            self.assertLessEqual(len(certifications), 3)
+            self.assertEqual(len(set(certifications)), len(certifications))
+            self.assertLessEqual(set(certifications), set(archetype['certifications']))
+
+    def test_seed_fixes_the_data(self):
+        rows = [row for batch in _batches(2500, 1000, 42, 1) for row in batch]
+        self.assertEqual([len(batch) for batch in _batches(2500, 1000, 42, 1)], [1000, 1000, 500])
+        self.assertEqual(rows[1000:2000], generate_batch(42, 1, 1000))
+        self.assertNotEqual(rows[:1000], generate_batch(43, 0, 1000))
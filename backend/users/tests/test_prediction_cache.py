@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import joblib
+import pandas as pd
+from django.test import SimpleTestCase, override_settings
+from ml_service.cache import PredictionCache, frequent_profiles
+from ml_service.predict import predict_job
+from ml_service.registry import registry, MODEL_FILENAME, write_version_stamp
+from ml_service.cache import prediction_cache
+from ml_service.profiles import load_user_profiles
+from users.utils import EncryptionUtil
+from users.tests.test_batch_predict import train_small_pipeline
+from unittest.mock import patch
+
+PROFILE = {'degree': 'B.Tech', 'specialization': 'Computer Science', 'skills': 'Python, Django, SQL', 'certifications': 'AWS Certified Developer'}
+
+
+class PredictionCacheTests(SimpleTestCase):
+    def test_key_ignores_skill_order_and_case(self):
+        reordered = dict(PROFILE, skills='sql,  DJANGO, python')
+        self.assertEqual(PredictionCache.key(PROFILE, 'v1'), PredictionCache.key(reordered, 'v1'))
+        self.assertNotEqual(PredictionCache.key(PROFILE, 'v1'), PredictionCache.key(PROFILE, 'v2'))
+        # The one-hot encoder is case sensitive, so degree is not normalized
+        self.assertNotEqual(PredictionCache.key(PROFILE, 'v1'), PredictionCache.key(dict(PROFILE, degree='b.tech'), 'v1'))
+
+    def test_evicts_least_recently_used(self):
+        cache = PredictionCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_new_version_clears_entries(self):
+        cache = PredictionCache(maxsize=10)
+        self.assertTrue(cache.sync('v1'))
+        cache.put('a', 1)
+        self.assertFalse(cache.sync('v1'))
+        self.assertTrue(cache.sync('v2'))
+        self.assertIsNone(cache.get('a'))
+
+    def test_frequent_profiles(self):
+        df = pd.DataFrame([
+            {'degree': 'B.Tech', 'specialization': 'CS', 'skills': 'Python, SQL', 'certifications': ''},
+            {'degree': 'B.Tech', 'specialization': 'CS', 'skills': 'sql, python', 'certifications': ''},
+            {'degree': 'BCA', 'specialization': 'IT', 'skills': 'Java', 'certifications': 'OCP'},
+        ])
+        profiles = frequent_profiles(df, 1)
+        self.assertEqual(profiles, [{'degree': 'B.Tech', 'specialization': 'CS', 'skills': 'python, sql', 'certifications': ''}])
+
+
+class PredictJobCacheTests(SimpleTestCase):
+    def setUp(self):
+        model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, model_dir)
+        joblib.dump(train_small_pipeline(), os.path.join(model_dir, MODEL_FILENAME))
+        write_version_stamp(model_dir, 'cache-test')
+        override = override_settings(ML_MODEL_DIR=model_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        registry.reset()
+        self.addCleanup(registry.reset)
+        prediction_cache.clear()
+
+    def test_equivalent_profile_hits_cache(self):
+        first = predict_job(PROFILE)
+        second = predict_job(dict(PROFILE, skills='SQL, Python, Django'))
+        self.assertEqual(first, second)
+        stats = prediction_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['version'], 'cache-test')
+
+    @patch('ml_service.profiles.Certification.objects')
+    @patch('ml_service.profiles.Skill.objects')
+    @patch('ml_service.profiles.Education.objects')
+    def test_encrypted_specialization_hits_cache(self, mock_education, mock_skills, mock_certifications):
+        # Same specialization, different ciphertext: each encryption draws a new IV
+        ciphertexts = [EncryptionUtil.encrypt('Computer Science') for _ in range(2)]
+        self.assertNotEqual(*ciphertexts)
+        mock_education.filter.return_value.order_by.return_value.values_list.return_value = [
+            (user_id, 'B.Tech', ciphertext) for user_id, ciphertext in zip([1, 2], ciphertexts)
+        ]
+        mock_skills.filter.return_value.order_by.return_value.values_list.return_value = [
+            (1, 'Python'), (1, 'Django'), (2, 'Django'), (2, 'Python'),
+        ]
+        mock_certifications.filter.return_value.order_by.return_value.values_list.return_value = []
+
+        profiles = load_user_profiles([1, 2])
+        self.assertEqual(profiles[1]['specialization'], 'Computer Science')
+        self.assertEqual(predict_job(profiles[1]), predict_job(profiles[2]))
+        stats = prediction_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
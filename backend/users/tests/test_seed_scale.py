@@ -0,0 +1,36 @@
+import datetime
+from django.test import SimpleTestCase
+from users.management.commands.seed_scale import generate_chunk
+from users.models import Education, Feedback, Predictionhistory, User
+from users.utils import EncryptionUtil
+
+OPTIONS = {
+    'domain': 'seed.test', 'password': 'secret', 'placement_rate': 0.4, 'max_predictions': 5, 'feedback_rate': 0.5,
+    'as_of': datetime.datetime(2025, 6, 30, tzinfo=datetime.timezone.utc),
+}
+
+
+class SeedScaleTests(SimpleTestCase):
+    def test_same_seed_same_rows(self):
+        rows = generate_chunk(7, 2, 50, OPTIONS)
+        self.assertEqual(rows, generate_chunk(7, 2, 50, OPTIONS))
+        self.assertNotEqual(rows[User], generate_chunk(8, 2, 50, OPTIONS)[User])
+        self.assertTrue(rows[User][0][1].endswith('.2000@seed.test'))
+
+    def test_rows_reference_their_student(self):
+        rows = generate_chunk(7, 0, 50, OPTIONS)
+        emails = [row[1] for row in rows[User]]
+        self.assertEqual([row[0] for row in rows[Education]], emails)
+        self.assertTrue(rows[Feedback])
+        for email, prediction, *_ in rows[Feedback]:
+            self.assertEqual(rows[Predictionhistory][prediction][0], email)
+        _, degree, specialization, university, cgpa, year = rows[Education][0]
+        self.assertTrue(6.0 <= float(EncryptionUtil.decrypt(cgpa)) <= 9.8)
+        self.assertNotEqual(EncryptionUtil.decrypt(university), university)
+
+    def test_equal_values_share_a_ciphertext(self):
+        universities = {}
+        for row in generate_chunk(7, 0, 200, OPTIONS)[Education]:
+            universities.setdefault(EncryptionUtil.decrypt(row[3]), set()).add(row[3])
+        self.assertGreater(len(universities), 1)
+        self.assertTrue(all(len(tokens) == 1 for tokens in universities.values()))
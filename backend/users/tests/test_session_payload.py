@@ -0,0 +1,37 @@
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+from users.models import User
+from users.serializers import SessionUserSerializer
+from users.views import LoginView
+from unittest.mock import MagicMock, patch
+
+
+def session_user(**counts):
+    user = User(user_id=4, name='Asha', email='asha@example.com', password_hash='secret', role='student')
+    for name in SessionUserSerializer.COUNTED:
+        setattr(user, f'{name}_count', counts.get(name, 0))
+    return user
+
+
+class SessionPayloadTests(SimpleTestCase):
+    def test_counts_are_annotated_in_one_query(self):
+        queryset = MagicMock()
+        SessionUserSerializer.for_session(queryset)
+        self.assertEqual(sorted(queryset.annotate.call_args.kwargs), [
+            'certifications_count', 'education_count', 'placements_count', 'predictions_count', 'skills_count'
+        ])
+
+    def test_login_returns_the_summary(self):
+        user = session_user(skills=3)
+        with patch.object(SessionUserSerializer, 'for_session') as for_session:
+            for_session.return_value.get.return_value = user
+            response = LoginView.as_view()(APIRequestFactory().post(
+                '/api/login/', {'email': 'asha@example.com', 'password': 'secret'}, format='json'
+            ))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user'], {
+            'user_id': 4, 'name': 'Asha', 'email': 'asha@example.com', 'role': 'student', 'profile_picture': None,
+            'banner_image': None, 'latest_prediction': None,
+            'counts': {'education': 0, 'certifications': 0, 'predictions': 0, 'skills': 3, 'placements': 0},
+        })
+        for_session.return_value.get.assert_called_once_with(email='asha@example.com')
@@ -0,0 +1,34 @@
+from django.http import QueryDict
+from django.test import SimpleTestCase
+from users.models import User
+from users.serializers import UserSerializer
+from unittest.mock import MagicMock
+
+
+class SparseFieldsTests(SimpleTestCase):
+    def test_fields_and_expand_select_the_output(self):
+        self.assertEqual(UserSerializer.selected_fields(), UserSerializer.Meta.fields)
+        self.assertEqual(UserSerializer.selected_fields(['email', 'name']), ['name', 'email'])
+        self.assertEqual(UserSerializer.selected_fields(None, ['skills']),
+                         ['user_id', 'name', 'email', 'role', 'skills', 'profile_picture', 'banner_image'])
+        self.assertEqual(UserSerializer.selected_fields(['name'], ['education']), ['name', 'education'])
+
+    def test_query_params(self):
+        self.assertEqual(UserSerializer.sparse_fields(QueryDict('')), (None, None))
+        self.assertEqual(UserSerializer.sparse_fields(QueryDict('fields=name, email&expand=')), (['name', 'email'], []))
+        with self.assertRaisesMessage(ValueError, 'Unknown fields: password_hash, name'):
+            UserSerializer.sparse_fields(QueryDict('fields=password_hash&expand=name'))
+
+    def test_queryset_loads_only_what_is_output(self):
+        queryset = MagicMock()
+        UserSerializer.for_fields(queryset, ['name', 'role'])
+        queryset.only.assert_called_once_with('user_id', 'name', 'role')
+        queryset.only.return_value.prefetch_related.assert_called_once_with()
+        UserSerializer.for_fields(queryset, ['name'], ['education', 'predictions'])
+        queryset.only.assert_called_with('user_id', 'name')
+        queryset.only.return_value.prefetch_related.assert_called_with('education_set', 'predictionhistory_set')
+
+    def test_representation_has_only_the_selected_fields(self):
+        user = User(user_id=1, name='Asha', email='asha@example.com', role='student')
+        self.assertEqual(UserSerializer(user, fields=['name', 'role']).data, {'name': 'Asha', 'role': 'student'})
+        self.assertEqual(UserSerializer(fields=['user_id']).to_representation(user), {'user_id': 1})
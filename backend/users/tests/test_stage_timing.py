@@ -0,0 +1,46 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase, RequestFactory, override_settings
+from core.middleware import ServerTimingMiddleware
+from ml_service.timing import StageHistograms, span, stage_timings, server_timing_header, untimed
+
+
+class StageTimingTests(SimpleTestCase):
+    def setUp(self):
+        stage_timings.reset()
+        self.addCleanup(stage_timings.reset)
+
+    def test_histogram_percentiles_use_bucket_bounds(self):
+        histograms = StageHistograms()
+        for elapsed_ms in [0.3] * 90 + [7.0] * 9 + [40.0]:
+            histograms.record('predict_proba', elapsed_ms)
+        stage = histograms.snapshot()['predict_proba']
+        self.assertEqual(stage['count'], 100)
+        self.assertEqual((stage['p50_ms'], stage['p90_ms'], stage['p99_ms'], stage['max_ms']), (0.5, 0.5, 10, 40.0))
+        self.assertEqual(stage['buckets']['le_50'], 1)
+
+    def test_middleware_reports_request_spans(self):
+        def view(request):
+            with span('db.user'):
+                pass
+            with span('predict_proba'):
+                pass
+            return HttpResponse()
+
+        with override_settings(ML_SERVER_TIMING=True):
+            response = ServerTimingMiddleware(view)(RequestFactory().post('/api/predict/'))
+        self.assertRegex(response['Server-Timing'], r'^db\.user;dur=[\d.]+, predict_proba;dur=[\d.]+$')
+        self.assertEqual(set(stage_timings.snapshot()), {'db.user', 'predict_proba'})
+
+    def test_untimed_spans_are_left_out(self):
+        # As in cache warm-up: one span for the whole job, none for its stages
+        with override_settings(ML_STAGE_TIMING=True), span('cache_warm'), untimed():
+            with span('predict_proba'):
+                pass
+        self.assertEqual(set(stage_timings.snapshot()), {'cache_warm'})
+
+    def test_header_off_by_default(self):
+        response = ServerTimingMiddleware(lambda request: HttpResponse())(RequestFactory().get('/'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_repeated_stages_are_summed(self):
+        self.assertEqual(server_timing_header([('rank', 1.0), ('rank', 0.5)]), 'rank;dur=1.500')
@@ -0,0 +1,102 @@
+import datetime
+import pandas as pd
+from django.test import SimpleTestCase, TestCase
+from ml_service.cache import frequent_profiles
+from ml_service.dataset import (
+    TRAINING_COLUMNS, load_training_frame, concat_training_frames, duplicate_groups, stream_training_rows,
+    labelled_profiles_frame, placement_labels
+)
+from users.models import TrainingData, Education, Skill, Certification, JobPlacement, User
+from users.utils import EncryptionUtil
+from users.tests.test_batch_predict import PROFILES, ROLES
+from unittest.mock import MagicMock, patch
+
+ROWS = [
+    (i + 1, profile['degree'], profile['specialization'], profile['skills'], profile['certifications'], role)
+    for i, (profile, role) in enumerate(list(zip(PROFILES, ROLES)) * 3)
+]
+
+
+def fake_queryset(training_id__gt):
+    """filter(training_id__gt=...).order_by(...).values_list(...)[:n] over ROWS"""
+    remaining = [row for row in ROWS if row[0] > training_id__gt]
+    queryset = MagicMock()
+    queryset.order_by.return_value.values_list.return_value.__getitem__.side_effect = lambda s: remaining[s]
+    return queryset
+
+
+@patch.object(TrainingData, 'objects')
+class TrainingDatasetTests(SimpleTestCase):
+    def test_streams_in_keyset_chunks(self, mock_objects):
+        mock_objects.filter.side_effect = fake_queryset
+        chunks = list(stream_training_rows(chunk_size=5))
+        self.assertEqual([len(chunk) for chunk in chunks], [5, 5, 2])
+        self.assertEqual([call.kwargs for call in mock_objects.filter.call_args_list],
+                         [{'training_id__gt': 0}, {'training_id__gt': 5}, {'training_id__gt': 10}, {'training_id__gt': 12}])
+
+    def test_frame_matches_values_dataframe(self, mock_objects):
+        mock_objects.filter.side_effect = fake_queryset
+        placements = pd.DataFrame([dict(PROFILES[0], skills='Go', target_job_role='Backend Developer')])
+
+        df = concat_training_frames([load_training_frame(chunk_size=5), placements, pd.DataFrame([])])
+
+        expected = pd.concat([pd.DataFrame([row[1:] for row in ROWS], columns=TRAINING_COLUMNS), placements], ignore_index=True)
+        expected['text_features'] = expected['skills'] + " " + expected['certifications']
+        self.assertTrue(all(isinstance(df[column].dtype, pd.CategoricalDtype) for column in df))
+        pd.testing.assert_frame_equal(df.astype(object), expected.astype(object))
+        self.assertEqual(frequent_profiles(df, 10), frequent_profiles(expected, 10))
+
+    def test_duplicates_ignore_list_order(self, mock_objects):
+        profile = dict(PROFILES[0], skills='Python, SQL, Docker', certifications='AWS, CKA', target_job_role='Backend Developer')
+        df = concat_training_frames([pd.DataFrame([
+            profile,
+            dict(profile, skills='Docker,Python, SQL', certifications='CKA, AWS'),
+            dict(profile, target_job_role='DevOps Engineer'),
+            dict(profile, skills='Python, SQL'),
+            profile,
+        ])])
+        groups = duplicate_groups(df)
+        self.assertEqual(len(set(groups)), 3)
+        self.assertTrue(groups[0] == groups[1] == groups[4])
+
+
+class LabelledProfilesTests(TestCase):
+    def add_students(self, roles):
+        """
+        A placed student per role, numbered on from the existing ones: even
+        ones have education, skills and certifications vary with the number.
+        """
+        for number, role in enumerate(roles, start=User.objects.count() + 1):
+            user = User.objects.create(name=f'Student {number}', email=f'student{number}@test.edu', password_hash='x', role='student')
+            if number % 2 == 0:
+                # Specializations are stored encrypted; the training rows get the text
+                Education.objects.create(user=user, degree='B.Tech', specialization=EncryptionUtil.encrypt(f'Spec{number}'),
+                                         university='', cgpa='', year_of_completion=2024)
+                # A second, later education row must not win
+                Education.objects.create(user=user, degree='M.Tech', specialization=EncryptionUtil.encrypt('Other'),
+                                         university='', cgpa='', year_of_completion=2026)
+            Skill.objects.bulk_create(Skill(user=user, skill_name=skill) for skill in ('Python', 'SQL')[:number % 3])
+            if number % 4 == 0:
+                Certification.objects.create(user=user, cert_name='AWS', issuing_organization='Amazon', issue_date=datetime.date(2024, 1, 1))
+            JobPlacement.objects.create(user=user, role=role, company='Acme', placement_type='Job', date_of_joining=datetime.date(2025, 1, 1))
+
+    def labels(self):
+        watermark = {'placement_id': JobPlacement.objects.order_by('-placement_id').values_list('placement_id', flat=True).first()}
+        return placement_labels(watermark).order_by('placement_id')
+
+    def test_rows_match_per_placement_lookups(self):
+        self.add_students(['Backend Developer', 'Data Analyst', 'Data Scientist', 'DevOps Engineer'])
+        self.assertEqual(labelled_profiles_frame(self.labels(), 'role').to_dict('records'), [
+            {'degree': 'B.Tech', 'specialization': 'Spec2', 'skills': 'Python, SQL', 'certifications': '', 'target_job_role': 'Data Analyst'},
+            {'degree': 'B.Tech', 'specialization': 'Spec4', 'skills': 'Python', 'certifications': 'AWS', 'target_job_role': 'DevOps Engineer'},
+        ])
+
+    def test_query_count_does_not_grow_with_placements(self):
+        self.add_students(['Backend Developer'] * 3)
+        labels = self.labels()
+        with self.assertNumQueries(4):
+            self.assertEqual(len(labelled_profiles_frame(labels, 'role')), 1)
+        self.add_students(['Backend Developer'] * 297)
+        labels = self.labels()
+        with self.assertNumQueries(4):
+            self.assertEqual(len(labelled_profiles_frame(labels, 'role')), 150)
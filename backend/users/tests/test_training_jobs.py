@@ -0,0 +1,132 @@
+from django.db import IntegrityError
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from ml_service.jobs import (
+    JobProgress, TrainingCancelled, claim_training_job, create_training_job, lower_priority, run_training_job,
+    start_training_job, _worker_name
+)
+from users.admin_views import AdminModelView
+from users.models import TrainingJob, User
+from unittest.mock import MagicMock, patch
+
+
+@patch('ml_service.jobs.transaction.atomic', MagicMock())
+@patch.object(TrainingJob, 'objects')
+class TrainingJobTests(SimpleTestCase):
+    def test_second_request_gets_the_running_job(self, mock_objects):
+        running = TrainingJob(job_id=3, status='fitting', progress=40, active=True)
+        mock_objects.create.side_effect = IntegrityError('Duplicate entry for key active')
+        mock_objects.filter.return_value.first.return_value = running
+
+        self.assertEqual(create_training_job('full'), (running, False))
+        mock_objects.filter.assert_called_with(active=True)
+
+    def test_progress_raises_once_cancelled(self, mock_objects):
+        progress = JobProgress(3)
+        mock_objects.filter.return_value.update.return_value = 1
+        progress('fitting', 40)
+        mock_objects.filter.assert_called_with(pk=3, active=True, cancel_requested=False)
+
+        mock_objects.filter.return_value.update.return_value = 0
+        with self.assertRaises(TrainingCancelled):
+            progress('fitting', 43)
+
+    @patch('users.models.Adminlogs.objects')
+    @patch('ml_service.train.train_model', side_effect=TrainingCancelled())
+    def test_cancelled_job_releases_the_lock(self, mock_train, mock_logs, mock_objects):
+        mock_objects.get.return_value = TrainingJob(job_id=3, mode='incremental', requested_by_id=1)
+
+        run_training_job(3)
+
+        self.assertEqual(mock_train.call_args.args, ('incremental',))
+        finish = mock_objects.filter.return_value.update.call_args_list[-1].kwargs
+        self.assertEqual((finish['active'], finish['status']), (None, 'cancelled'))
+        self.assertEqual(mock_logs.create.call_args.kwargs['action_type'], 'TRAINING_CANCELLED')
+
+    def test_claim_is_conditional_on_no_worker(self, mock_objects):
+        queued = TrainingJob(job_id=3, mode='full', status='queued', active=True)
+        mock_objects.filter.return_value.first.return_value = queued
+        mock_objects.filter.return_value.update.return_value = 1
+        self.assertIs(claim_training_job(), queued)
+        mock_objects.filter.assert_called_with(pk=3, worker='')
+
+        # Another worker took it between the SELECT and the UPDATE
+        mock_objects.filter.return_value.update.return_value = 0
+        self.assertIsNone(claim_training_job())
+
+    @patch('ml_service.train.train_model')
+    def test_job_claimed_by_another_worker_is_not_run(self, mock_train, mock_objects):
+        mock_objects.get.return_value = TrainingJob(job_id=3, mode='full', worker='other-host:42')
+        mock_objects.filter.return_value.update.return_value = 0
+
+        run_training_job(3)
+
+        mock_objects.filter.assert_called_once_with(pk=3, worker__in=['', _worker_name()])
+        mock_train.assert_not_called()
+
+    @patch('ml_service.jobs.threading.Thread')
+    def test_thread_executor_claims_before_starting(self, mock_thread, mock_objects):
+        mock_objects.filter.return_value.update.return_value = 1
+        mock_objects.create.return_value = TrainingJob(job_id=3, mode='full', active=True)
+
+        with self.settings(ML_TRAINING_EXECUTOR='thread'):
+            start_training_job('full')
+
+        mock_objects.filter.assert_called_with(pk=3, worker='')
+        self.assertEqual(mock_objects.filter.return_value.update.call_args.kwargs['worker'], _worker_name())
+        mock_thread.return_value.start.assert_called_once()
+
+        # A train_worker claimed it first
+        mock_thread.reset_mock()
+        mock_objects.filter.return_value.update.return_value = 0
+        with self.settings(ML_TRAINING_EXECUTOR='thread'):
+            start_training_job('full')
+        mock_thread.return_value.start.assert_not_called()
+
+    @patch('ml_service.jobs.subprocess.Popen')
+    @patch('ml_service.jobs.threading.Thread')
+    def test_subprocess_executor_starts_one_worker(self, mock_thread, mock_popen, mock_objects):
+        mock_objects.filter.return_value.update.return_value = 0
+        mock_objects.create.return_value = TrainingJob(job_id=3, mode='full', active=True)
+
+        with self.settings(ML_TRAINING_EXECUTOR='subprocess'):
+            job, created = start_training_job('full')
+
+        self.assertTrue(created)
+        self.assertEqual(mock_popen.call_args.args[0][-2:], ['train_worker', '--once'])
+        # Only the reaper thread: nothing is fitted in this process
+        self.assertEqual(mock_thread.call_args.kwargs['target'], mock_popen.return_value.wait)
+        self.assertNotIn('preexec_fn', mock_popen.call_args.kwargs)
+
+
+@patch('ml_service.jobs.open', create=True)
+@patch('ml_service.jobs.os.setpriority')
+class LowerPriorityTests(SimpleTestCase):
+    @patch('ml_service.jobs.os.getsid', return_value=1)
+    def test_leaves_autogroup_of_a_shared_session(self, mock_getsid, mock_setpriority, mock_open):
+        lower_priority()
+        mock_setpriority.assert_called_once()
+        mock_open.assert_not_called()
+
+    @patch('ml_service.jobs.os.getpid', return_value=7)
+    @patch('ml_service.jobs.os.getsid', return_value=7)
+    def test_session_leader_renices_its_autogroup(self, mock_getsid, mock_getpid, mock_setpriority, mock_open):
+        lower_priority()
+        mock_open.assert_called_once_with('/proc/self/autogroup', 'w')
+
+
+class RetrainViewTests(SimpleTestCase):
+    @patch('users.admin_views.Adminlogs.objects')
+    @patch('users.admin_views.start_training_job')
+    @patch('users.admin_views.User.objects')
+    def test_retrain_while_running_returns_conflict(self, mock_users, mock_start, mock_logs):
+        mock_start.return_value = (TrainingJob(job_id=3, mode='full', status='fitting', progress=40), False)
+        request = APIRequestFactory().post('/api/admin/model/retrain/', {'mode': 'full'}, format='json')
+        force_authenticate(request, user=MagicMock(email='admin@example.com', role='admin'))
+
+        with patch('users.admin_views.IsAdmin.has_permission', return_value=True):
+            response = AdminModelView.as_view()(request, action='retrain')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual((response.data['job']['job_id'], response.data['job']['progress']), (3, 40))
+        mock_logs.create.assert_not_called()
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import zipfile
+import pandas as pd
+from django.test import SimpleTestCase
+from ml_service.dataset import TRAINING_COLUMNS
+from ml_service.snapshot import SnapshotError, TrainingSnapshot, export_snapshot
+from users.management.commands.import_training_snapshot import _transactions
+from users.tests.test_training_dataset import ROWS
+from unittest.mock import patch
+
+
+class TrainingSnapshotTests(SimpleTestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'training.snapshot')
+        chunks = [ROWS[i:i + 5] for i in range(0, len(ROWS), 5)]
+        with patch('ml_service.snapshot.stream_training_rows', return_value=iter(chunks)):
+            self.manifest = export_snapshot(self.path)
+
+    def test_round_trip(self):
+        self.assertEqual((self.manifest['rows'], self.manifest['training_id'], len(self.manifest['chunks'])), (12, 12, 3))
+        with TrainingSnapshot(self.path) as snapshot:
+            self.assertEqual([row for rows in snapshot.rows() for row in rows], ROWS)
+            frame = snapshot.frame()
+        self.assertTrue(all(isinstance(frame[column].dtype, pd.CategoricalDtype) for column in frame))
+        pd.testing.assert_frame_equal(
+            frame.astype(object), pd.DataFrame([row[1:] for row in ROWS], columns=TRAINING_COLUMNS).astype(object)
+        )
+
+    def test_changed_member_fails_its_checksum(self):
+        tampered = self.path + '.tampered'
+        with zipfile.ZipFile(self.path) as source, zipfile.ZipFile(tampered, 'w') as target:
+            for info in source.infolist():
+                data = source.read(info)
+                if info.filename == 'dictionaries/skills.json':
+                    data = data.replace(b'Python', b'Pythom')
+                target.writestr(info, data)
+        with TrainingSnapshot(tampered) as snapshot, self.assertRaisesMessage(SnapshotError, 'dictionaries/skills.json'):
+            snapshot.verify()
+
+    def test_transactions_regroup_chunks(self):
+        self.assertEqual([len(rows) for rows in _transactions(iter([[1] * 5] * 5), 10)], [10, 10, 5])
+        self.assertEqual(list(_transactions(iter([]), 10)), [[]])
@@ -0,0 +1,95 @@
+import io
+from django.test import SimpleTestCase
+from ml_service.ingest import UploadError, _heartbeat, expire_stale_uploads, ingest_csv, run_training_upload
+from users.models import TrainingData, TrainingJob, TrainingUpload
+from unittest.mock import MagicMock, patch
+
+CSV = (
+    "Degree,Specialization,Skills,Certifications,Job_Role\n"
+    "B.Tech,Computer Science,\"Python,  SQL, python,,Docker\",,Backend Developer\n"
+    "B.Tech,Computer Science,Python,,\n"
+    "M.Tech,  Data   Science ,\"Python, Pandas\",\"IBM Data Science, \",Data Scientist\n"
+    "\n"
+    "B.Sc,Physics,Python,,Data Analyst,extra\n"
+).encode() + b"BCA,Computer Science,Pyth\xffon,,Data Analyst\n" + (
+    "MCA,Computer Science,\"Java,\nSpring Boot\",,Backend Developer\n"
+).encode()
+
+
+@patch('ml_service.ingest.transaction.atomic', MagicMock())
+@patch.object(TrainingData, 'objects')
+class TrainingUploadTests(SimpleTestCase):
+    def ingest(self, data, **kwargs):
+        progress = MagicMock()
+        result = ingest_csv(io.BytesIO(data), len(data), progress, **kwargs)
+        inserted = [
+            (row.degree, row.specialization, row.skills, row.certifications, row.target_job_role)
+            for call in TrainingData.objects.bulk_create.call_args_list for row in call.args[0]
+        ]
+        return result, inserted, progress
+
+    def test_rows_are_normalized_and_rejects_reported(self, mock_objects):
+        result, inserted, _ = self.ingest(CSV)
+        self.assertEqual(inserted, [
+            ('B.Tech', 'Computer Science', 'Python, SQL, Docker', '', 'Backend Developer'),
+            ('M.Tech', 'Data Science', 'Python, Pandas', 'IBM Data Science', 'Data Scientist'),
+            ('MCA', 'Computer Science', 'Java, Spring Boot', '', 'Backend Developer'),
+        ])
+        self.assertEqual((result['rows_inserted'], result['rows_rejected']), (3, 3))
+        self.assertEqual(result['rejects'], [
+            {'line': 3, 'error': 'target_job_role is empty'},
+            {'line': 6, 'error': '6 fields, the header has 5'},
+            {'line': 7, 'error': 'skills is not valid UTF-8'},
+        ])
+
+    def test_chunks_are_committed_with_progress(self, mock_objects):
+        header, row = b"degree,specialization,skills,job role\n", b"B.Tech,CS,Python,Backend Developer\n"
+        result, inserted, progress = self.ingest(header + row * 5, chunk_rows=2, max_rejects=0)
+        self.assertEqual([len(call.args[0]) for call in mock_objects.bulk_create.call_args_list], [2, 2, 1])
+        self.assertEqual([call.args[:2] for call in progress.call_args_list][-1], (100, 5))
+        self.assertEqual(len(inserted), 5)
+
+    def test_missing_column_fails_the_file(self, mock_objects):
+        with self.assertRaisesMessage(UploadError, 'target_job_role'):
+            self.ingest(b"Degree,Specialization,Skills\nB.Tech,CS,Python\n")
+        mock_objects.bulk_create.assert_not_called()
+
+
+@patch('ml_service.ingest.connection', MagicMock())
+@patch.object(TrainingJob, 'objects')
+@patch.object(TrainingUpload, 'objects')
+class TrainingUploadLeaseTests(SimpleTestCase):
+    @patch('ml_service.ingest.os.remove')
+    def test_stale_upload_is_failed_and_its_file_removed(self, mock_remove, mock_uploads, mock_jobs):
+        stale = mock_uploads.filter.return_value
+        stale.values_list.return_value = [(4, '/uploads/4.csv')]
+        stale.filter.return_value.update.return_value = 1
+
+        self.assertEqual(expire_stale_uploads(), 1)
+        self.assertEqual(mock_uploads.filter.call_args.kwargs['status'], 'processing')
+        self.assertEqual(stale.filter.return_value.update.call_args.kwargs['status'], 'failed')
+        mock_remove.assert_called_once_with('/uploads/4.csv')
+
+    def test_heartbeat_keeps_upload_and_queued_jobs_alive(self, mock_uploads, mock_jobs):
+        stop = MagicMock()
+        stop.wait.side_effect = [False, True]
+        _heartbeat(4, stop)
+        mock_uploads.filter.assert_called_once_with(pk=4, status='processing')
+        mock_jobs.filter.assert_called_once_with(active=True, status='queued', worker='')
+        self.assertIn('heartbeat_at', mock_jobs.filter.return_value.update.call_args.kwargs)
+
+    @patch('ml_service.ingest.os.remove')
+    @patch('ml_service.ingest.open', create=True)
+    @patch('ml_service.ingest.ingest_csv')
+    def test_expired_upload_stops_at_next_chunk(self, mock_ingest, mock_open, mock_remove, mock_uploads, mock_jobs):
+        current = mock_uploads.filter.return_value
+        current.update.return_value = 0
+        mock_ingest.side_effect = lambda lines, size, progress: progress(50, 1000, 0, [])
+        upload = TrainingUpload(upload_id=4, file_name='data.csv', stored_path='/uploads/4.csv', size=10)
+
+        with self.settings(ML_TRAINING_JOB_HEARTBEAT=60), self.assertLogs('ml_service.ingest') as logs:
+            run_training_upload(upload)
+
+        self.assertIn('Training upload 4 failed', logs.output[1])
+        self.assertEqual(current.update.call_args.kwargs['status'], 'failed')
+        mock_remove.assert_called_once_with('/uploads/4.csv')
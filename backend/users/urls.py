@@ -3,14 +3,15 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     RegisterView, LoginView, DashboardView, 
     GoogleLoginView, SetPasswordView, UserListView, PublicProfileView, UserProfileUpdateView,
-    PredictJobView, PlacedStudentsView, SubscribeView,
+    PredictJobView, BatchPredictJobView, PlacedStudentsView, SubscribeView,
     EducationViewSet, CertificationViewSet, SkillViewSet, JobPlacementViewSet,
     AutocompleteView, PredictionHistoryView, FeedbackView
 )
 
 from .admin_views import (
     AdminUserListView, AdminUserDetailView, AdminLogsView, AdminAnalyticsView, 
-    AdminModelView, AdminUniversityDetailView, AdminPredictionLogListView, AdminPredictionLogDetailView, AdminFeedbackView
+    AdminModelView, AdminUniversityDetailView, AdminPredictionLogListView, AdminPredictionLogDetailView, AdminFeedbackView,
+    AdminTrainingJobView, AdminTrainingUploadView
 )
 
 router = DefaultRouter()
@@ -28,6 +29,7 @@ urlpatterns = [
     path('dashboard/', DashboardView.as_view(), name='dashboard'),
     
     path('predict/', PredictJobView.as_view(), name='predict_job'),
+    path('predict/batch/', BatchPredictJobView.as_view(), name='predict_job_batch'),
     path('prediction-history/', PredictionHistoryView.as_view(), name='prediction_history'),
     path('placed-students/', PlacedStudentsView.as_view(), name='placed_students'),
     path('users/', UserListView.as_view(), name='user_list'),
@@ -41,6 +43,9 @@ urlpatterns = [
     path('admin/analytics/', AdminAnalyticsView.as_view(), name='admin_analytics'),
     path('admin/analytics/university/<str:category>/', AdminUniversityDetailView.as_view(), name='admin_university_detail'),
     path('admin/model/<str:action>/', AdminModelView.as_view(), name='admin_model'),
+    path('admin/model/jobs/<int:job_id>/', AdminTrainingJobView.as_view(), name='admin_training_job'),
+    path('admin/model/jobs/<int:job_id>/<str:action>/', AdminTrainingJobView.as_view(), name='admin_training_job_action'),
+    path('admin/model/uploads/<int:upload_id>/', AdminTrainingUploadView.as_view(), name='admin_training_upload'),
     path('admin/prediction-logs/', AdminPredictionLogListView.as_view(), name='admin_prediction_logs_list'),
     path('admin/prediction-logs/<int:pk>/', AdminPredictionLogDetailView.as_view(), name='admin_prediction_logs_detail'),
     path('subscribe/', SubscribeView.as_view(), name='subscribe'),
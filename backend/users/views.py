@@ -2,7 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, viewsets, permissions
 from .models import User, Education, Certification, Skill, JobPlacement, Predictionhistory, Feedback
-from .serializers import UserSerializer, EducationSerializer, CertificationSerializer, SkillSerializer, JobPlacementSerializer
+from .serializers import UserSerializer, SessionUserSerializer, EducationSerializer, CertificationSerializer, SkillSerializer, JobPlacementSerializer
 import jwt, datetime
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
@@ -13,7 +13,13 @@ import joblib
 import pandas as pd
 import os
 import json
-from ml_service.predict import predict_job
+from ml_service.predict import predict_job, predict_jobs
+from ml_service.profiles import load_user_profiles, clean_profile
+from ml_service.materialize import current_prediction, save_current_predictions
+from ml_service.timing import span
+from .permissions import IsAdmin
+from .utils import EncryptionUtil
+from .pagination import KeysetPagination
 
 # SECURITY WARNING: Move this to settings.py in production
 # SECRET_KEY moved to settings.py
@@ -44,7 +50,7 @@ class RegisterView(APIView):
                 'iat': datetime.datetime.utcnow()
             }
             token = jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
-            serializer = UserSerializer(user)
+            serializer = SessionUserSerializer(SessionUserSerializer.for_session(User.objects.all()).get(pk=user.pk))
             return Response({'message': 'Registration Successful', 'token': token, 'user': serializer.data}, status=status.HTTP_201_CREATED)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -55,7 +61,7 @@ class LoginView(APIView):
         password = request.data.get('password')
 
         try:
-            user = User.objects.get(email=email)
+            user = SessionUserSerializer.for_session(User.objects.all()).get(email=email)
         except User.DoesNotExist:
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -69,7 +75,8 @@ class LoginView(APIView):
         }
         
         token = jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
-        serializer = UserSerializer(user)
+        # Compact on purpose: the client fetches the full profile from the dashboard endpoint
+        serializer = SessionUserSerializer(user)
         return Response({'message': 'Login Successful', 'token': token, 'user': serializer.data}, status=status.HTTP_200_OK)
 
 class DashboardView(APIView):
@@ -78,35 +85,45 @@ class DashboardView(APIView):
         if not user_id:
              return Response({'error': 'User ID required'}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            user = User.objects.get(user_id=user_id)
-            serializer = UserSerializer(user)
-            return Response(serializer.data)
+            fields, expand = UserSerializer.sparse_fields(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user = UserSerializer.for_fields(User.objects.all(), fields, expand).get(user_id=user_id)
+            serializer = UserSerializer(user, fields=fields, expand=expand)
+            data = serializer.data
+            # Materialized only: never runs the model, null until the refresh lands
+            if settings.ML_MATERIALIZE_PREDICTIONS:
+                data['current_prediction'] = current_prediction(user.user_id)
+            return Response(data)
         except User.DoesNotExist:
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
 class UserListView(APIView):
     def get(self, request):
-        users = User.objects.all().prefetch_related(
-            'education_set',
-            'certification_set',
-            'skills',
-            'placements',
-            'predictionhistory_set'
-        )
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
+        query = request.query_params.get('search', '')
+        try:
+            fields, expand = UserSerializer.sparse_fields(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        users = User.objects.all()
+        # Name or role; universities are stored encrypted and cannot be matched in SQL
+        if query:
+            users = users.filter(name__icontains=query) | users.filter(role__icontains=query)
+        users = UserSerializer.for_fields(users, fields, expand)
+        # One serializer for the page, as many=True would use
+        serializer = UserSerializer(fields=fields, expand=expand)
+        return KeysetPagination(['user_id']).paginate(request, users, serializer.to_representation)
 
 class PublicProfileView(APIView):
     def get(self, request, user_id):
         try:
-            user = User.objects.prefetch_related(
-                'education_set',
-                'certification_set',
-                'skills',
-                'placements',
-                'predictionhistory_set'
-            ).get(user_id=user_id)
-            serializer = UserSerializer(user)
+            fields, expand = UserSerializer.sparse_fields(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            user = UserSerializer.for_fields(User.objects.all(), fields, expand).get(user_id=user_id)
+            serializer = UserSerializer(user, fields=fields, expand=expand)
             return Response(serializer.data)
         except User.DoesNotExist:
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -123,11 +140,11 @@ class GoogleLoginView(APIView):
             name = id_info.get('name', '')
             
             try:
-                user = User.objects.get(email=email)
+                user = SessionUserSerializer.for_session(User.objects.all()).get(email=email)
                 # Existing User - Login
                 payload = {'user_id': user.user_id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(days=1), 'iat': datetime.datetime.utcnow()}
                 token = jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
-                serializer = UserSerializer(user)
+                serializer = SessionUserSerializer(user)
                 return Response({'message': 'Google Login Successful', 'token': token, 'user': serializer.data, 'is_new_user': False}, status=status.HTTP_200_OK)
             except User.DoesNotExist:
                 # New User - Return details for registration
@@ -165,41 +182,63 @@ class PredictJobView(APIView):
         user_id = request.data.get('user_id')
         if not user_id:
             return Response({'error': 'User ID is required'}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            user = User.objects.get(user_id=user_id)
-        except User.DoesNotExist:
-            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-        
-        # Prepare User Profile Data
-        skills = [s.skill_name for s in user.skills.all()]
-        certifications = [c.cert_name for c in user.certification_set.all()]
-        education = user.education_set.first()
-        
-        if not education:
-                return Response({'error': 'Education details are required for prediction'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        user_profile = {
-            'degree': education.degree,
-            'specialization': education.specialization,
-            'skills': ", ".join(skills),
-            'certifications': ", ".join(certifications)
-        }
 
-        # Call the shared prediction function
-        result = predict_job(user_profile)
+        # Materialized prediction, refreshed in the background whenever the
+        # profile or the model changes. Only a miss runs the model here.
+        result = None
+        if settings.ML_MATERIALIZE_PREDICTIONS:
+            with span('db.current_prediction'):
+                result = current_prediction(user_id)
+        if result is None:
+            try:
+                with span('db.user'):
+                    user = User.objects.get(user_id=user_id)
+            except User.DoesNotExist:
+                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+
+            # Prepare User Profile Data
+            with span('db.skills'):
+                skills = [s.skill_name for s in user.skills.all()]
+            with span('db.certifications'):
+                certifications = [c.cert_name for c in user.certification_set.all()]
+            with span('db.education'):
+                education = user.education_set.first()
+
+            if not education:
+                    return Response({'error': 'Education details are required for prediction'}, status=status.HTTP_400_BAD_REQUEST)
+
+            user_profile = {
+                'degree': education.degree,
+                # Stored encrypted with a random IV: the model and the cache key need the text
+                'specialization': EncryptionUtil.decrypt(education.specialization) or '',
+                'skills': ", ".join(skills),
+                'certifications': ", ".join(certifications)
+            }
+
+            # Call the shared prediction function
+            result = predict_job(user_profile)
+
+            if 'error' in result:
+                return Response({'error': result['error']}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            if settings.ML_MATERIALIZE_PREDICTIONS:
+                try:
+                    with span('db.save_current_prediction'):
+                        save_current_predictions({user.user_id: result['predictions']}, result['model_version'])
+                except Exception as e:
+                    print(f"Error saving current prediction: {e}")
 
-        if 'error' in result:
-            return Response({'error': result['error']}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
         # Save Prediction History
         try:
             top_role = result['predictions'][0]['role']
             # Serialize the full result or just relevant parts
-            prediction_entry = Predictionhistory.objects.create(
-                user=user,
-                predicted_roles=top_role, 
-                confidence_scores=json.dumps(result['predictions']) # Storing full prediction object/list
-            )
+            with span('db.history_insert'):
+                prediction_entry = Predictionhistory.objects.create(
+                    user_id=user_id,
+                    predicted_roles=top_role, 
+                    confidence_scores=json.dumps(result['predictions']), # Storing full prediction object/list
+                    model_version=result.get('model_version')
+                )
             
             # Inject prediction_id into the response
             result['prediction_id'] = prediction_entry.prediction_id
@@ -210,6 +249,91 @@ class PredictJobView(APIView):
 
         return Response(result, status=status.HTTP_200_OK)
 
+class BatchPredictJobView(APIView):
+    """
+    POST: Predict job roles for a whole cohort in one pass.
+    Body: {"user_ids": [...]} or {"profiles": [{degree, specialization, skills, certifications}, ...]}
+    Rows that cannot be scored (unknown user, no education, fields that are not
+    text) carry an inline error.
+    """
+    permission_classes = [IsAdmin]
+
+    def post(self, request):
+        user_ids = request.data.get('user_ids')
+        profiles = request.data.get('profiles')
+        save_history = request.data.get('save_history', False)
+
+        rows = user_ids if user_ids else profiles
+        if not rows or not isinstance(rows, list):
+            return Response({'error': 'A list of user_ids or profiles is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.ML_BATCH_MAX_SIZE:
+            return Response({'error': f'At most {settings.ML_BATCH_MAX_SIZE} rows per batch'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = [None] * len(rows)
+        batch_profiles = []
+        batch_positions = []
+
+        if user_ids:
+            try:
+                user_ids = [int(user_id) for user_id in user_ids]
+            except (TypeError, ValueError):
+                return Response({'error': 'user_ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Constant number of queries for the whole cohort
+            known_ids = set(User.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+            user_profiles = load_user_profiles(user_ids)
+
+            for position, user_id in enumerate(user_ids):
+                if user_id not in known_ids:
+                    results[position] = {'user_id': user_id, 'error': 'User not found'}
+                elif user_id not in user_profiles:
+                    results[position] = {'user_id': user_id, 'error': 'Education details are required for prediction'}
+                else:
+                    results[position] = {'user_id': user_id}
+                    batch_profiles.append(user_profiles[user_id])
+                    batch_positions.append(position)
+        else:
+            for position, profile in enumerate(profiles):
+                try:
+                    profile = clean_profile(profile)
+                except ValueError as e:
+                    results[position] = {'index': position, 'error': str(e)}
+                    continue
+                if not profile['degree']:
+                    results[position] = {'index': position, 'error': 'Education details are required for prediction'}
+                else:
+                    results[position] = {'index': position}
+                    batch_profiles.append(profile)
+                    batch_positions.append(position)
+
+        prediction = predict_jobs(batch_profiles)
+        if 'error' in prediction:
+            return Response({'error': prediction['error']}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        for position, result in zip(batch_positions, prediction['results']):
+            results[position].update(result)
+
+        if save_history and user_ids:
+            try:
+                Predictionhistory.objects.bulk_create([
+                    Predictionhistory(
+                        user_id=results[position]['user_id'],
+                        predicted_roles=results[position]['predictions'][0]['role'],
+                        confidence_scores=json.dumps(results[position]['predictions']),
+                        model_version=prediction['model_version']
+                    )
+                    for position in batch_positions
+                ], batch_size=1000)
+            except Exception as e:
+                print(f"Error saving batch history: {e}")
+
+        return Response({
+            'results': results,
+            'model_version': prediction['model_version'],
+            'scored': len(batch_positions),
+            'failed': len(rows) - len(batch_positions)
+        }, status=status.HTTP_200_OK)
+
 from rest_framework import status, viewsets, permissions
 
 # ... (existing imports)
@@ -258,20 +382,17 @@ class PlacedStudentsView(APIView):
         if not role:
             return Response({'error': 'Role parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        placements = JobPlacement.objects.filter(role__icontains=role)
-        data = []
-        for p in placements:
-            data.append({
-                'name': p.user.name,
-                'email': p.user.email,
-                'company': p.company,
-                'role': p.role,
-                'type': p.placement_type,
-                'date': p.date_of_joining,
-                'user_id': p.user.user_id,
-                'profile_picture': p.user.profile_picture.url if p.user.profile_picture else None
-            })
-        return Response(data, status=status.HTTP_200_OK)
+        placements = JobPlacement.objects.filter(role__icontains=role).select_related('user')
+        return KeysetPagination(['placement_id']).paginate(request, placements, lambda p: {
+            'name': p.user.name,
+            'email': p.user.email,
+            'company': p.company,
+            'role': p.role,
+            'type': p.placement_type,
+            'date': p.date_of_joining,
+            'user_id': p.user.user_id,
+            'profile_picture': p.user.profile_picture.url if p.user.profile_picture else None
+        })
 
 class SubscribeView(APIView):
     def post(self, request):
@@ -377,30 +498,30 @@ class PredictionHistoryView(APIView):
         if not user_id:
             return Response({'error': 'User ID required'}, status=status.HTTP_400_BAD_REQUEST)
         
+        def history_entry(h):
+            try:
+                # Parse the stored JSON
+                details = json.loads(h.confidence_scores)
+                # If it's a list (new format), take top item. If old format? 
+                # We just implemented new format.
+                top_prediction = details[0] if isinstance(details, list) and len(details) > 0 else {}
+
+                return {
+                    'id': h.prediction_id,
+                    'role': top_prediction.get('role', 'Unknown'),
+                    'confidence': top_prediction.get('confidence', 0),
+                    'date': h.timestamp,
+                    'details': details,
+                    'is_flagged': h.is_flagged,
+                    'corrected_role': h.corrected_role,
+                    'admin_notes': h.admin_notes
+                }
+            except:
+                return None
+
         try:
-            history = Predictionhistory.objects.filter(user_id=user_id).order_by('-timestamp')
-            data = []
-            for h in history:
-                try:
-                    # Parse the stored JSON
-                    details = json.loads(h.confidence_scores)
-                    # If it's a list (new format), take top item. If old format? 
-                    # We just implemented new format.
-                    top_prediction = details[0] if isinstance(details, list) and len(details) > 0 else {}
-                    
-                    data.append({
-                        'id': h.prediction_id,
-                        'role': top_prediction.get('role', 'Unknown'),
-                        'confidence': top_prediction.get('confidence', 0),
-                        'date': h.timestamp,
-                        'details': details,
-                        'is_flagged': h.is_flagged,
-                        'corrected_role': h.corrected_role,
-                        'admin_notes': h.admin_notes
-                    })
-                except:
-                    continue
-            return Response(data, status=status.HTTP_200_OK)
+            history = Predictionhistory.objects.filter(user_id=user_id)
+            return KeysetPagination(['-timestamp', '-prediction_id']).paginate(request, history, history_entry)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -18,7 +18,8 @@ import {
     Alert
 } from '@mui/material';
 import { Search as SearchIcon } from '@mui/icons-material';
-import api from '../api';
+import { getPage, NO_CURSORS } from '../api';
+import PageNav from './PageNav';
 import { API_BASE_URL } from '../config';
 
 interface FeedbackData {
@@ -34,17 +35,20 @@ interface FeedbackData {
 
 const FeedbackTable: React.FC = () => {
     const [feedbacks, setFeedbacks] = useState<FeedbackData[]>([]);
+    const [cursors, setCursors] = useState(NO_CURSORS);
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState('');
     const [searchQuery, setSearchQuery] = useState('');
 
-    const fetchFeedback = async () => {
+    // First page for the search, or the page a Previous/Next cursor points at
+    const fetchFeedback = async (pageUrl?: string) => {
         setLoading(true);
         try {
-            const res = await api.get(`${API_BASE_URL}/api/admin/feedback/`, {
-                params: { search: searchQuery }
+            const page = await getPage<FeedbackData>(pageUrl ?? `${API_BASE_URL}/api/admin/feedback/`, {
+                params: pageUrl ? undefined : { search: searchQuery }
             });
-            setFeedbacks(res.data);
+            setFeedbacks(page.rows);
+            setCursors({ next: page.next, prev: page.prev });
             setError('');
         } catch (err) {
             console.error("Failed to fetch feedback", err);
@@ -173,6 +177,7 @@ const FeedbackTable: React.FC = () => {
                     </TableBody>
                 </Table>
             </TableContainer>
+            <PageNav page={cursors} onNavigate={fetchFeedback} disabled={loading} />
         </Paper>
     );
 };
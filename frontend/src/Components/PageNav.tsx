@@ -0,0 +1,29 @@
+import React from 'react';
+import { Box, Button } from '@mui/material';
+import { NavigateBefore as PrevIcon, NavigateNext as NextIcon } from '@mui/icons-material';
+import type { PageCursors } from '../api';
+
+interface Props {
+  page: PageCursors;
+  onNavigate: (url: string) => void;
+  disabled?: boolean;
+}
+
+// Previous / Next buttons for a paginated list, following the cursors of the page shown
+const PageNav: React.FC<Props> = ({ page, onNavigate, disabled = false }) => {
+  if (!page.prev && !page.next) return null;
+  return (
+    <Box sx={{ display: 'flex', justifyContent: 'flex-end', gap: 1, p: 2 }}>
+      <Button size="small" startIcon={<PrevIcon />} disabled={disabled || !page.prev}
+        onClick={() => page.prev && onNavigate(page.prev)}>
+        Previous
+      </Button>
+      <Button size="small" endIcon={<NextIcon />} disabled={disabled || !page.next}
+        onClick={() => page.next && onNavigate(page.next)}>
+        Next
+      </Button>
+    </Box>
+  );
+};
+
+export default PageNav;
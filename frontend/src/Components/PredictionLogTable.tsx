@@ -29,7 +29,8 @@ import {
     Warning as WarningIcon,
     Delete as DeleteIcon
 } from '@mui/icons-material';
-import api from '../api';
+import api, { getPage, NO_CURSORS } from '../api';
+import PageNav from './PageNav';
 import { API_BASE_URL } from '../config';
 
 interface PredictionLog {
@@ -46,6 +47,7 @@ interface PredictionLog {
 
 const PredictionLogTable: React.FC = () => {
     const [logs, setLogs] = useState<PredictionLog[]>([]);
+    const [cursors, setCursors] = useState(NO_CURSORS);
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState('');
     const [successMsg, setSuccessMsg] = useState('');
@@ -67,13 +69,16 @@ const PredictionLogTable: React.FC = () => {
         return () => clearTimeout(timeoutId);
     }, [searchTerm]);
 
-    const fetchLogs = async (query = '') => {
+    // First page for the query, or the page a Previous/Next cursor points at
+    const fetchLogs = async (query = '', pageUrl?: string) => {
         setLoading(true);
         try {
-            const res = await api.get(`${API_BASE_URL}/api/admin/prediction-logs/`, {
-                params: { search: query }
+            const page = await getPage<PredictionLog>(pageUrl ?? `${API_BASE_URL}/api/admin/prediction-logs/`, {
+                params: pageUrl ? undefined : { search: query }
             });
-            setLogs(res.data);
+            setLogs(page.rows);
+            setCursors({ next: page.next, prev: page.prev });
+            setSelectedIds([]);
         } catch (err) {
             setError('Failed to fetch prediction logs');
         } finally {
@@ -342,6 +347,7 @@ const PredictionLogTable: React.FC = () => {
                     </Table>
                 </TableContainer>
             )}
+            <PageNav page={cursors} onNavigate={(url) => fetchLogs(searchTerm, url)} disabled={loading} />
 
             {/* Correction Dialog */}
             <Dialog open={openDialog} onClose={() => setOpenDialog(false)} maxWidth="sm" fullWidth>
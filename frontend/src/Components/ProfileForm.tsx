@@ -22,6 +22,7 @@ import {
 } from '@mui/icons-material';
 import api from '../api';
 import { useAuth } from '../auth/AuthContext';
+import { useProfileDetails } from '../hooks/useProfileDetails';
 import { DEGREES, SPECIALIZATIONS, DEGREE_SPECIALIZATION_MAP } from '../data/profileOptions';
 
 import AsyncAutocomplete from './AsyncAutocomplete';
@@ -48,7 +49,8 @@ interface PlacementData {
 }
 
 const ProfileForm: React.FC = () => {
-  const { user, refreshUser } = useAuth();
+  const { user } = useAuth();
+  const { profile, reload: reloadProfile } = useProfileDetails();
   const theme = useTheme();
 
   // Tabs State
@@ -87,11 +89,6 @@ const ProfileForm: React.FC = () => {
     setPasswordData({ password: '', confirmPassword: '' });
   }, [activeSection]);
 
-  // Force refresh user data on mount
-  useEffect(() => {
-    refreshUser();
-  }, []);
-
   // Handle Input Changes
   const handleEduChange = (e: React.ChangeEvent<HTMLInputElement>) => setEduData({ ...eduData, [e.target.name]: e.target.value });
   const handleCertChange = (e: React.ChangeEvent<HTMLInputElement>) => setCertData({ ...certData, [e.target.name]: e.target.value });
@@ -137,7 +134,7 @@ const ProfileForm: React.FC = () => {
     try {
       await api.delete(`/api/${type}/${id}/`);
       setMessage({ type: 'success', text: 'Item deleted successfully!' });
-      refreshUser();
+      reloadProfile();
     } catch (err: any) {
       console.error('Delete Error:', err);
       const errorMessage = err.response?.data?.error || err.message || 'Failed to delete item.';
@@ -192,7 +189,7 @@ const ProfileForm: React.FC = () => {
         setSkillData({ skill_name: '' });
         setPlacementData({ role: '', company: '', placement_type: 'Job', date_of_joining: '' });
         setPasswordData({ password: '', confirmPassword: '' });
-        refreshUser();
+        reloadProfile();
       }
     } catch (err: any) {
       console.error('Error:', err);
@@ -310,7 +307,7 @@ const ProfileForm: React.FC = () => {
   const renderSkillChips = () => (
     <Paper variant="outlined" sx={{ p: 3, borderRadius: 3, textAlign: 'center' }}>
       <Box display="flex" justifyContent="center" flexWrap="wrap" gap={1.5}>
-        {user?.skills?.length > 0 ? user.skills.map((skill: any) => (
+        {profile?.skills?.length > 0 ? profile.skills.map((skill: any) => (
           <Chip
             key={skill.skill_id}
             label={skill.skill_name}
@@ -373,8 +370,8 @@ const ProfileForm: React.FC = () => {
       <Box sx={{ minHeight: 100 }}>
         {activeSection === 'education' && (
           <Grid container spacing={3}>
-            {user?.education?.map(renderEducationCard)}
-            {(!user?.education || user.education.length === 0) && (
+            {profile?.education?.map(renderEducationCard)}
+            {(!profile?.education || profile.education.length === 0) && (
               <Grid size={12} textAlign="center" py={5}>
                 <Typography color="text.secondary">No education details added yet.</Typography>
               </Grid>
@@ -383,8 +380,8 @@ const ProfileForm: React.FC = () => {
         )}
         {activeSection === 'certification' && (
           <Grid container spacing={3}>
-            {user?.certifications?.map(renderCertificationCard)}
-            {(!user?.certifications || user.certifications.length === 0) && (
+            {profile?.certifications?.map(renderCertificationCard)}
+            {(!profile?.certifications || profile.certifications.length === 0) && (
               <Grid size={12} textAlign="center" py={5}>
                 <Typography color="text.secondary">No certifications added yet.</Typography>
               </Grid>
@@ -393,8 +390,8 @@ const ProfileForm: React.FC = () => {
         )}
         {activeSection === 'placement' && (
           <Grid container spacing={3}>
-            {user?.placements?.map(renderPlacementCard)}
-            {(!user?.placements || user.placements.length === 0) && (
+            {profile?.placements?.map(renderPlacementCard)}
+            {(!profile?.placements || profile.placements.length === 0) && (
               <Grid size={12} textAlign="center" py={5}>
                 <Typography color="text.secondary">No placement details added yet.</Typography>
               </Grid>
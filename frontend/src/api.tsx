@@ -1,4 +1,5 @@
 import axios from 'axios';
+import type { AxiosInstance, AxiosRequestConfig } from 'axios';
 import { API_BASE_URL } from './config';
 
 const api = axios.create({
@@ -18,4 +19,29 @@ api.interceptors.request.use(
     }
 );
 
+// One page of a keyset-paginated list endpoint, with the URLs of the pages
+// around it from the Link header (null at either end)
+export interface Page<T> {
+    rows: T[];
+    next: string | null;
+    prev: string | null;
+}
+
+export type PageCursors = Pick<Page<any>, 'next' | 'prev'>;
+export const NO_CURSORS: PageCursors = { next: null, prev: null };
+
+const linkUrl = (link: string | undefined, rel: string): string | null => {
+    const match = link?.match(new RegExp(`<([^>]+)>;\\s*rel="${rel}"`));
+    return match ? match[1] : null;
+};
+
+// Fetches the first page (url and params) or the page a next/prev URL
+// points at; those already carry the query string and cursor
+export const getPage = async <T = any>(
+    url: string, config: AxiosRequestConfig = {}, client: AxiosInstance = api
+): Promise<Page<T>> => {
+    const res: any = await client.get(url, config);
+    return { rows: res.data, next: linkUrl(res.headers?.link, 'next'), prev: linkUrl(res.headers?.link, 'prev') };
+};
+
 export default api;
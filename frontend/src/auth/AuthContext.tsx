@@ -49,13 +49,16 @@ export const AuthProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
     localStorage.removeItem('token');
   };
 
-  // 4. Refresh User Function (Fetches latest data from backend)
+  // 4. Refresh User Function (Fetches the latest identity fields from backend).
+  // Education, skills and history are loaded by the pages that show them
   const refreshUser = async () => {
     if (!user?.user_id) return;
     try {
-      // Use the DashboardView endpoint which returns full user details
-      const response = await api.get(`/api/dashboard/?user_id=${user.user_id}`);
-      const updatedUser = response.data;
+      const response = await api.get('/api/dashboard/', {
+        params: { user_id: user.user_id, fields: 'user_id,name,email,role,profile_picture,banner_image' }
+      });
+      // Keeps counts and latest_prediction from the session payload
+      const updatedUser = { ...user, ...response.data };
 
       setUser(updatedUser);
       localStorage.setItem('user', JSON.stringify(updatedUser));
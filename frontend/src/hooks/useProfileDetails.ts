@@ -0,0 +1,33 @@
+import { useCallback, useEffect, useState } from 'react';
+import api from '../api';
+import { useAuth } from '../auth/AuthContext';
+
+// Education, certifications, skills and placements of the signed-in user.
+// The session user only carries identity and counts, so pages that list
+// these load them here when they mount (prediction history is not included)
+export const useProfileDetails = () => {
+    const { user } = useAuth();
+    const [profile, setProfile] = useState<any>(null);
+    const [loading, setLoading] = useState(false);
+
+    const reload = useCallback(async () => {
+        if (!user?.user_id) return;
+        setLoading(true);
+        try {
+            const res = await api.get('/api/dashboard/', {
+                params: { user_id: user.user_id, fields: 'user_id', expand: 'education,certifications,skills,placements' }
+            });
+            setProfile(res.data);
+        } catch (error) {
+            console.error("Failed to load profile details", error);
+        } finally {
+            setLoading(false);
+        }
+    }, [user?.user_id]);
+
+    useEffect(() => {
+        reload();
+    }, [reload]);
+
+    return { profile, loading, reload };
+};
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import {
     Box,
     AppBar,
@@ -65,10 +65,11 @@ import {
 import { motion, AnimatePresence, type Variants } from 'framer-motion';
 import PredictionLogTable from '../Components/PredictionLogTable';
 import FeedbackTable from '../Components/FeedbackTable';
+import PageNav from '../Components/PageNav';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../auth/AuthContext';
 import { useThemeContext } from '../theme/ThemeContext';
-import api from '../api';
+import api, { getPage, NO_CURSORS } from '../api';
 import { API_BASE_URL } from '../config';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
 import GlassCard from '../Components/GlassCard';
@@ -81,6 +82,16 @@ interface UserData {
     role: string;
 }
 
+interface TrainingJob {
+    job_id: number;
+    mode: string;
+    status: string;
+    progress: number;
+    message: string | null;
+}
+
+const FINISHED_TRAINING_STATUSES = ['done', 'failed', 'cancelled'];
+
 interface LogData {
     log_id: number;
     action_type: string;
@@ -145,7 +156,8 @@ const AdminDashboard: React.FC = () => {
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState('');
     const [successMsg, setSuccessMsg] = useState('');
-    const [isTraining, setIsTraining] = useState(false);
+    const [trainingJob, setTrainingJob] = useState<TrainingJob | null>(null);
+    const isTraining = !!trainingJob && !FINISHED_TRAINING_STATUSES.includes(trainingJob.status);
 
     const tabVariants: Variants = {
         hidden: { opacity: 0, x: 20 },
@@ -159,7 +171,11 @@ const AdminDashboard: React.FC = () => {
     // Data States
     const [users, setUsers] = useState<UserData[]>([]);
     const [selectedUserIds, setSelectedUserIds] = useState<number[]>([]);
+    const [userCursors, setUserCursors] = useState(NO_CURSORS);
     const [logs, setLogs] = useState<LogData[]>([]);
+    const [logCursors, setLogCursors] = useState(NO_CURSORS);
+    // Page the log auto-refresh reloads; undefined is the first page of the search
+    const logPageUrl = useRef<string | undefined>(undefined);
     const [analytics, setAnalytics] = useState<AnalyticsData | null>(null);
 
     // Search State
@@ -198,13 +214,14 @@ const AdminDashboard: React.FC = () => {
         }
     };
 
-    const fetchUsers = async () => {
+    const fetchUsers = async (pageUrl?: string) => {
         setLoading(true);
         try {
-            const res = await api.get(`${API_BASE_URL}/api/admin/users/`, {
-                params: { search: searchQuery }
+            const page = await getPage<UserData>(pageUrl ?? `${API_BASE_URL}/api/admin/users/`, {
+                params: pageUrl ? undefined : { search: searchQuery, fields: 'user_id,name,email,role' }
             });
-            setUsers(res.data);
+            setUsers(page.rows);
+            setUserCursors({ next: page.next, prev: page.prev });
         } catch (err) {
             setError("Failed to fetch users");
         } finally {
@@ -212,53 +229,64 @@ const AdminDashboard: React.FC = () => {
         }
     };
 
-    const fetchLogs = async () => {
+    const fetchLogs = async (pageUrl?: string) => {
         // Don't set loading true here to avoid flickering on auto-refresh
+        logPageUrl.current = pageUrl;
         try {
-            const res = await api.get(`${API_BASE_URL}/api/admin/logs/`, {
-                params: { search: logSearchQuery }
+            const page = await getPage<LogData>(pageUrl ?? `${API_BASE_URL}/api/admin/logs/`, {
+                params: pageUrl ? undefined : { search: logSearchQuery }
             });
-            const logsData = res.data;
-            setLogs(logsData);
-
-            // Check for recent completion or active training
-            const recentLog = logsData[0]; // Assuming sorted by latest
-
-            if (recentLog) {
-                if (recentLog.action_type === 'TRAINING_STARTED') {
-                    setIsTraining(true);
-                } else if (recentLog.action_type === 'TRAINING_COMPLETED') {
-                    if (isTraining) {
-                        setIsTraining(false);
-                        setSuccessMsg("Model training completed successfully!");
-                        fetchAnalytics();
-                    } else if (new Date(recentLog.timestamp).getTime() > Date.now() - 60000) {
-                        // Just in case we missed the transition but it's recent
-                        // setSuccessMsg("Model training completed successfully!"); // Optional: avoid spamming if already seen
-                        fetchAnalytics();
-                    }
-                } else if (recentLog.action_type === 'TRAINING_FAILED') {
-                    if (isTraining) {
-                        setIsTraining(false);
-                        setError("Model training failed. Check logs for details.");
-                    }
-                }
-            }
+            setLogs(page.rows);
+            setLogCursors({ next: page.next, prev: page.prev });
         } catch (err) {
             console.error("Failed to fetch logs");
         }
     };
 
-    // Auto-refresh logs every 5 seconds if on Logs tab or Model tab
+    // Auto-refresh logs every 5 seconds on the Logs tab
     useEffect(() => {
         let interval: NodeJS.Timeout;
-        if (tabValue === 2 || tabValue === 3) { // Model Governance or System Logs
+        if (tabValue === 3) { // System Logs
             fetchLogs(); // Initial fetch
-            interval = setInterval(fetchLogs, 5000);
+            interval = setInterval(() => fetchLogs(logPageUrl.current), 5000);
         }
         return () => clearInterval(interval);
     }, [tabValue]);
 
+    // On the Model tab, pick up a training job that is already queued or running
+    useEffect(() => {
+        if (tabValue !== 2) return;
+        api.get(`${API_BASE_URL}/api/admin/model/jobs/`)
+            .then(res => {
+                const latest: TrainingJob | undefined = res.data.jobs[0];
+                if (latest && !FINISHED_TRAINING_STATUSES.includes(latest.status)) setTrainingJob(latest);
+            })
+            .catch(() => console.error("Failed to fetch training jobs"));
+    }, [tabValue]);
+
+    // Poll the running job for its stage and progress until it finishes
+    useEffect(() => {
+        if (!trainingJob || !isTraining) return;
+        const interval = setInterval(async () => {
+            try {
+                const res = await api.get(`${API_BASE_URL}/api/admin/model/jobs/${trainingJob.job_id}/`);
+                const job: TrainingJob = res.data;
+                setTrainingJob(job);
+                if (job.status === 'done') {
+                    setSuccessMsg(job.message || "Model training completed successfully!");
+                    fetchAnalytics();
+                } else if (job.status === 'failed') {
+                    setError(`Model training failed: ${job.message || 'check logs for details.'}`);
+                } else if (job.status === 'cancelled') {
+                    setError("Model training was cancelled.");
+                }
+            } catch (err) {
+                console.error("Failed to fetch training job status");
+            }
+        }, 3000);
+        return () => clearInterval(interval);
+    }, [trainingJob?.job_id, isTraining]);
+
     const handleTabChange = (_event: React.SyntheticEvent, newValue: number) => {
         setTabValue(newValue);
         setError('');
@@ -366,11 +394,15 @@ const AdminDashboard: React.FC = () => {
         try {
             const res = await api.post(`${API_BASE_URL}/api/admin/model/retrain/`);
             setSuccessMsg(res.data.message || "Model retraining triggered successfully");
-            setIsTraining(true); // Optimistically set training state
-            // Immediately fetch logs to confirm start
-            setTimeout(fetchLogs, 1000);
-        } catch (err) {
-            setError("Failed to trigger retraining");
+            setTrainingJob(res.data.job);
+        } catch (err: any) {
+            if (err.response?.status === 409) {
+                // Single-flight: another admin (or an earlier click) already started one
+                setTrainingJob(err.response.data.job);
+                setError(`Training already running: ${err.response.data.message}`);
+            } else {
+                setError(err.response?.data?.error || "Failed to trigger retraining");
+            }
         } finally {
             setLoading(false);
         }
@@ -451,7 +483,7 @@ const AdminDashboard: React.FC = () => {
                 await api.delete(`${API_BASE_URL}/api/admin/logs/`, { data: { log_ids: selectedLogIds } });
                 setSuccessMsg("Logs deleted successfully");
                 setSelectedLogIds([]);
-                fetchLogs();
+                fetchLogs(logPageUrl.current);
             } catch (err) {
                 console.error("Failed to delete logs", err);
                 setError("Failed to delete logs");
@@ -740,7 +772,7 @@ const AdminDashboard: React.FC = () => {
                                                             ),
                                                         }}
                                                     />
-                                                    <Button startIcon={<RefreshIcon />} onClick={fetchUsers}>Refresh</Button>
+                                                    <Button startIcon={<RefreshIcon />} onClick={() => fetchUsers()}>Refresh</Button>
                                                 </Box>
                                             </Box>
                                             <TableContainer>
@@ -796,6 +828,11 @@ const AdminDashboard: React.FC = () => {
                                                     </TableBody>
                                                 </Table>
                                             </TableContainer>
+                                            <PageNav
+                                                page={userCursors}
+                                                onNavigate={(url) => { setSelectedUserIds([]); fetchUsers(url); }}
+                                                disabled={loading}
+                                            />
                                         </Paper>
                                     </motion.div>
                                 )}
@@ -966,9 +1003,9 @@ const AdminDashboard: React.FC = () => {
                                                     {isTraining && (
                                                         <Box sx={{ mt: 2, width: '100%' }}>
                                                             <Typography variant="caption" color="text.secondary" gutterBottom>
-                                                                Training model on latest data... This may take a few minutes.
+                                                                Training job #{trainingJob?.job_id}: {trainingJob?.status} ({trainingJob?.progress}%). This may take a few minutes.
                                                             </Typography>
-                                                            <LinearProgress color="secondary" />
+                                                            <LinearProgress color="secondary" variant="determinate" value={trainingJob?.progress ?? 0} />
                                                         </Box>
                                                     )}
                                                 </Paper>
@@ -1016,7 +1053,7 @@ const AdminDashboard: React.FC = () => {
                                                                 ),
                                                             }}
                                                         />
-                                                        <Button variant="outlined" startIcon={<RefreshIcon />} onClick={fetchLogs}>Refresh</Button>
+                                                        <Button variant="outlined" startIcon={<RefreshIcon />} onClick={() => fetchLogs()}>Refresh</Button>
                                                     </Box>
                                                 </Box>
                                                 <TableContainer sx={{ borderRadius: 1, border: `1px solid ${theme.palette.divider}` }}>
@@ -1076,7 +1113,7 @@ const AdminDashboard: React.FC = () => {
                                                                                     api.delete(`${API_BASE_URL}/api/admin/logs/`, { data: { log_ids: [log.log_id] } })
                                                                                         .then(() => {
                                                                                             setSuccessMsg("Log deleted");
-                                                                                            fetchLogs();
+                                                                                            fetchLogs(logPageUrl.current);
                                                                                         });
                                                                                 }
                                                                             }}
@@ -1095,6 +1132,10 @@ const AdminDashboard: React.FC = () => {
                                                         </TableBody>
                                                     </Table>
                                                 </TableContainer>
+                                                <PageNav
+                                                    page={logCursors}
+                                                    onNavigate={(url) => { setSelectedLogIds([]); fetchLogs(url); }}
+                                                />
                                             </Paper>
                                         </motion.div>
                                     )
@@ -1,12 +1,14 @@
 import React, { useEffect, useState } from 'react';
 import {
     Container, Card, CardContent, Typography, Avatar,
-    Box, Button, TextField, InputAdornment, CircularProgress, Alert, Chip, Pagination
+    Box, Button, TextField, InputAdornment, CircularProgress, Alert, Chip
 } from '@mui/material';
 import { Search as SearchIcon, ArrowBack as ArrowBackIcon, History as HistoryIcon, Star as StarIcon, Verified as VerifiedIcon } from '@mui/icons-material';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { API_BASE_URL } from '../config';
+import { getPage, NO_CURSORS } from '../api';
+import PageNav from '../Components/PageNav';
 
 interface User {
     user_id: number;
@@ -24,42 +26,49 @@ const CommunityPage: React.FC = () => {
     const [error, setError] = useState('');
     const [searchTerm, setSearchTerm] = useState('');
     const [recentUsers, setRecentUsers] = useState<User[]>([]);
+    const [featuredUsers, setFeaturedUsers] = useState<User[]>([]);
 
-    // Pagination State
-    const [page, setPage] = useState(1);
+    // Pagination State: only the page shown is held, with the cursors around it
+    const [cursors, setCursors] = useState(NO_CURSORS);
     const USERS_PER_PAGE = 9;
+    // Only what the cards show: skips predictions, skills and certifications
+    const CARD_FIELDS = { fields: 'user_id,name,role,profile_picture', expand: 'education,placements' };
 
-    useEffect(() => {
-        const fetchUsers = async () => {
-            try {
-                const response = await axios.get(`${API_BASE_URL}/api/users/`);
-                setUsers(response.data);
-            } catch (err) {
-                console.error('Failed to fetch users:', err);
-                setError('Failed to load community members.');
-            } finally {
-                setLoading(false);
-            }
-        };
-
-        fetchUsers();
-    }, []);
-
-    // Load recent users from local storage whenever 'users' changes
-    useEffect(() => {
-        if (users.length > 0) {
-            const storedRecentIds = JSON.parse(localStorage.getItem('recent_viewed_users') || '[]');
-            const recent = users.filter(u => storedRecentIds.includes(u.user_id));
-            recent.sort((a, b) => storedRecentIds.indexOf(a.user_id) - storedRecentIds.indexOf(b.user_id));
-            setRecentUsers(recent);
+    // First page for the search, or the page a Previous/Next cursor points at
+    const fetchUsers = async (pageUrl?: string) => {
+        setLoading(true);
+        try {
+            const result = await getPage<User>(pageUrl ?? `${API_BASE_URL}/api/users/`, {
+                params: pageUrl ? undefined : { ...CARD_FIELDS, search: searchTerm, page_size: USERS_PER_PAGE }
+            }, axios);
+            setUsers(result.rows);
+            setCursors({ next: result.next, prev: result.prev });
+            if (!pageUrl && !searchTerm) setFeaturedUsers(result.rows.slice(0, 3));
+            setError('');
+        } catch (err) {
+            console.error('Failed to fetch users:', err);
+            setError('Failed to load community members.');
+        } finally {
+            setLoading(false);
         }
-    }, [users]);
+    };
 
-    // Reset page when search term changes
+    // Debounced search; the first page is loaded on mount the same way
     useEffect(() => {
-        setPage(1);
+        const timeoutId = setTimeout(() => fetchUsers(), searchTerm ? 500 : 0);
+        return () => clearTimeout(timeoutId);
     }, [searchTerm]);
 
+    // Recently viewed members are fetched by id, not looked up in the page
+    useEffect(() => {
+        const storedRecentIds: number[] = JSON.parse(localStorage.getItem('recent_viewed_users') || '[]');
+        Promise.all(storedRecentIds.map(id =>
+            axios.get(`${API_BASE_URL}/api/users/${id}/`, { params: CARD_FIELDS })
+                .then(res => res.data as User)
+                .catch(() => null)
+        )).then(recent => setRecentUsers(recent.filter((user): user is User => user !== null)));
+    }, []);
+
     const handleViewProfile = (userId: number) => {
         const storedRecentIds = JSON.parse(localStorage.getItem('recent_viewed_users') || '[]');
         const newIds = [userId, ...storedRecentIds.filter((id: number) => id !== userId)].slice(0, 5);
@@ -67,8 +76,8 @@ const CommunityPage: React.FC = () => {
         navigate(`/profile/${userId}`);
     };
 
-    const handlePageChange = (_event: React.ChangeEvent<unknown>, value: number) => {
-        setPage(value);
+    const handlePageChange = (pageUrl: string) => {
+        fetchUsers(pageUrl);
         window.scrollTo({ top: 0, behavior: 'smooth' });
     };
 
@@ -76,14 +85,6 @@ const CommunityPage: React.FC = () => {
         return name ? name.split(' ').map(n => n[0]).join('').substring(0, 2).toUpperCase() : 'U';
     };
 
-    const featuredUsers = users.slice(0, 3);
-
-    const filteredUsers = users.filter(user =>
-        user.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        user.role.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        (user.education?.[0]?.university || '').toLowerCase().includes(searchTerm.toLowerCase())
-    );
-
     const UserCard = ({ user, featured = false }: { user: User, featured?: boolean }) => (
         <Card sx={{
             borderRadius: 3,
@@ -141,36 +142,21 @@ const CommunityPage: React.FC = () => {
         </Card>
     );
 
-    // Helper to render paginated grid
-    const renderPaginatedGrid = (data: User[]) => {
-        const count = Math.ceil(data.length / USERS_PER_PAGE);
-        const paginatedData = data.slice((page - 1) * USERS_PER_PAGE, page * USERS_PER_PAGE);
-
-        return (
-            <>
-                <Box sx={{ display: 'grid', gridTemplateColumns: { xs: '1fr', sm: '1fr 1fr', md: '1fr 1fr 1fr' }, gap: 3 }}>
-                    {paginatedData.map((user) => (
-                        <Box key={user.user_id}>
-                            <UserCard user={user} />
-                        </Box>
-                    ))}
-                </Box>
-                {count > 1 && (
-                    <Box sx={{ display: 'flex', justifyContent: 'center', mt: 6 }}>
-                        <Pagination
-                            count={count}
-                            page={page}
-                            onChange={handlePageChange}
-                            color="primary"
-                            size="large"
-                            showFirstButton
-                            showLastButton
-                        />
+    // Helper to render the current page of the grid
+    const renderPaginatedGrid = (data: User[]) => (
+        <>
+            <Box sx={{ display: 'grid', gridTemplateColumns: { xs: '1fr', sm: '1fr 1fr', md: '1fr 1fr 1fr' }, gap: 3 }}>
+                {data.map((user) => (
+                    <Box key={user.user_id}>
+                        <UserCard user={user} />
                     </Box>
-                )}
-            </>
-        );
-    };
+                ))}
+            </Box>
+            <Box sx={{ display: 'flex', justifyContent: 'center', mt: 4 }}>
+                <PageNav page={cursors} onNavigate={handlePageChange} disabled={loading} />
+            </Box>
+        </>
+    );
 
     return (
         <Container maxWidth="lg" sx={{ mt: 4, mb: 4 }}>
@@ -190,7 +176,7 @@ const CommunityPage: React.FC = () => {
             <Box sx={{ maxWidth: 600, mx: 'auto', mb: 5 }}>
                 <TextField
                     fullWidth
-                    placeholder="Search by name, university, or role..."
+                    placeholder="Search by name or role..."
                     value={searchTerm}
                     onChange={(e) => setSearchTerm(e.target.value)}
                     InputProps={{
@@ -215,8 +201,8 @@ const CommunityPage: React.FC = () => {
                     {/* If searching, show only results (Paginated) */}
                     {searchTerm ? (
                         <>
-                            {filteredUsers.length > 0 ? (
-                                renderPaginatedGrid(filteredUsers)
+                            {users.length > 0 ? (
+                                renderPaginatedGrid(users)
                             ) : (
                                 <Typography align="center" color="text.secondary" sx={{ mt: 4 }}>
                                     No users found matching "{searchTerm}"
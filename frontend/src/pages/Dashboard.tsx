@@ -12,6 +12,7 @@ import {
 } from '@mui/icons-material';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../auth/AuthContext';
+import { useProfileDetails } from '../hooks/useProfileDetails';
 import { API_BASE_URL } from '../config';
 import api from '../api';
 import { motion, type Variants } from 'framer-motion';
@@ -38,6 +39,7 @@ const itemVariants: Variants = {
 const Dashboard: React.FC = () => {
   const navigate = useNavigate();
   const { user, refreshUser } = useAuth();
+  const { profile } = useProfileDetails();
 
   const [loading, setLoading] = useState(false);
   const [message, setMessage] = useState<{ type: 'success' | 'error', text: string } | null>(null);
@@ -48,7 +50,7 @@ const Dashboard: React.FC = () => {
   const [previewProfile, setPreviewProfile] = useState<string | null>(null);
   const [previewBanner, setPreviewBanner] = useState<string | null>(null);
 
-  const primaryEdu = user?.education?.[0];
+  const primaryEdu = profile?.education?.[0];
 
   useEffect(() => {
     if (user?.role === 'admin') {
@@ -200,11 +202,11 @@ const Dashboard: React.FC = () => {
                 <Typography variant="h6" fontWeight="bold">Academic Profile</Typography>
               </Box>
               <Divider sx={{ mb: 2 }} />
-              {user?.education?.length ? (
+              {profile?.education?.length ? (
                 <Box>
-                  <Typography variant="subtitle1" fontWeight="bold">{user.education[0].university}</Typography>
-                  <Typography variant="body2" color="text.secondary">{user.education[0].degree} • {user.education[0].year_of_completion}</Typography>
-                  <Typography variant="body2" color="primary" fontWeight="bold" sx={{ mt: 1 }}>CGPA: {user.education[0].cgpa}</Typography>
+                  <Typography variant="subtitle1" fontWeight="bold">{profile.education[0].university}</Typography>
+                  <Typography variant="body2" color="text.secondary">{profile.education[0].degree} • {profile.education[0].year_of_completion}</Typography>
+                  <Typography variant="body2" color="primary" fontWeight="bold" sx={{ mt: 1 }}>CGPA: {profile.education[0].cgpa}</Typography>
                 </Box>
               ) : (
                 <Typography color="text.secondary">No details added yet.</Typography>
@@ -219,8 +221,8 @@ const Dashboard: React.FC = () => {
                 <Typography variant="h6" fontWeight="bold">Certifications</Typography>
               </Box>
               <Divider sx={{ mb: 2 }} />
-              {user?.certifications?.length ? (
-                user.certifications.map((cert: any, i: number) => (
+              {profile?.certifications?.length ? (
+                profile.certifications.map((cert: any, i: number) => (
                   <Box key={i} sx={{ mb: 2 }}>
                     <Typography variant="subtitle2" fontWeight="bold">{cert.cert_name}</Typography>
                     <Typography variant="caption" color="text.secondary">{cert.issuing_organization}</Typography>
@@ -238,15 +240,15 @@ const Dashboard: React.FC = () => {
                 <Typography variant="h6" fontWeight="bold">Placement Status</Typography>
               </Box>
               <Divider sx={{ mb: 2 }} />
-              {user?.placements?.length ? (
-                user.placements.map((placement: any, index: number) => (
+              {profile?.placements?.length ? (
+                profile.placements.map((placement: any, index: number) => (
                   <Box key={index} sx={{ mb: 2 }}>
                     <Typography variant="subtitle1" fontWeight="bold">{placement.role}</Typography>
                     <Typography variant="body2" color="text.secondary">at {placement.company}</Typography>
                     <Typography variant="caption" sx={{ display: 'block', color: 'text.secondary', mt: 0.5 }}>
                       {placement.placement_type} • Joined: {placement.date_of_joining}
                     </Typography>
-                    {index < user.placements.length - 1 && <Divider sx={{ my: 2 }} />}
+                    {index < profile.placements.length - 1 && <Divider sx={{ my: 2 }} />}
                   </Box>
                 ))
               ) : (
@@ -263,9 +265,9 @@ const Dashboard: React.FC = () => {
                 <Typography variant="h6" fontWeight="bold">Skills</Typography>
               </Box>
               <Divider sx={{ mb: 2 }} />
-              {user?.skills?.length ? (
+              {profile?.skills?.length ? (
                 <Box sx={{ display: 'flex', flexWrap: 'wrap', gap: 1 }}>
-                  {user.skills.map((skill: any, i: number) => (
+                  {profile.skills.map((skill: any, i: number) => (
                     <Box key={i} sx={{
                       bgcolor: 'rgba(255, 187, 40, 0.1)',
                       color: 'warning.dark',
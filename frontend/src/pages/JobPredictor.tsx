@@ -92,7 +92,8 @@ const HistoryItem = ({ item }: { item: any }) => {
 //         <HistoryItem key={index} item={item} />
 //     ))}
 // </List>
-import api from '../api';
+import api, { getPage, NO_CURSORS } from '../api';
+import PageNav from '../Components/PageNav';
 import { useAuth } from '../auth/AuthContext';
 import GlassCard from '../Components/GlassCard';
 import { useNavigate } from 'react-router-dom';
@@ -126,6 +127,7 @@ const JobPredictor: React.FC = () => {
     const [openModal, setOpenModal] = useState(false);
     const [modalLoading, setModalLoading] = useState(false);
     const [placedStudents, setPlacedStudents] = useState<PlacedStudent[]>([]);
+    const [placedCursors, setPlacedCursors] = useState(NO_CURSORS);
     const [selectedRole, setSelectedRole] = useState<string>('');
 
     // Missing Skills Modal State
@@ -136,6 +138,7 @@ const JobPredictor: React.FC = () => {
     const [openHistoryModal, setOpenHistoryModal] = useState(false);
     const [historyLoading, setHistoryLoading] = useState(false);
     const [historyData, setHistoryData] = useState<any[]>([]);
+    const [historyCursors, setHistoryCursors] = useState(NO_CURSORS);
 
     // Feedback State
     const [predictionId, setPredictionId] = useState<number | null>(null);
@@ -164,15 +167,17 @@ const JobPredictor: React.FC = () => {
     };
 
 
-    const handleOpenHistory = async () => {
+    // First page of the history, or the page a Previous/Next cursor points at
+    const handleOpenHistory = async (pageUrl?: string) => {
         setOpenHistoryModal(true);
         setHistoryLoading(true);
         try {
             if (!user?.user_id) return;
-            const response = await api.get(`/api/prediction-history/?user_id=${user.user_id}`);
-            if (response.status === 200) {
-                setHistoryData(response.data);
-            }
+            const page = await getPage(pageUrl ?? '/api/prediction-history/', {
+                params: pageUrl ? undefined : { user_id: user.user_id }
+            });
+            setHistoryData(page.rows);
+            setHistoryCursors({ next: page.next, prev: page.prev });
         } catch (err) {
             console.error("Failed to fetch history", err);
         } finally {
@@ -212,17 +217,18 @@ const JobPredictor: React.FC = () => {
         }
     };
 
-    const handleViewPlacedStudents = async (role: string) => {
+    const handleViewPlacedStudents = async (role: string, pageUrl?: string) => {
         setSelectedRole(role);
         setOpenModal(true);
         setModalLoading(true);
         setPlacedStudents([]);
 
         try {
-            const response = await api.get(`/api/placed-students/?role=${role}`);
-            if (response.status === 200) {
-                setPlacedStudents(response.data);
-            }
+            const page = await getPage<PlacedStudent>(pageUrl ?? '/api/placed-students/', {
+                params: pageUrl ? undefined : { role }
+            });
+            setPlacedStudents(page.rows);
+            setPlacedCursors({ next: page.next, prev: page.prev });
         } catch (err) {
             console.error("Error fetching placed students:", err);
         } finally {
@@ -284,7 +290,7 @@ const JobPredictor: React.FC = () => {
 
                 <Button
                     startIcon={<HistoryIcon />}
-                    onClick={handleOpenHistory}
+                    onClick={() => handleOpenHistory()}
                     sx={{ position: 'absolute', top: 20, right: 20, zIndex: 10 }}
                 >
                     History
@@ -657,6 +663,7 @@ const JobPredictor: React.FC = () => {
                             </Typography>
                         </Box>
                     )}
+                    <PageNav page={placedCursors} onNavigate={(url) => handleViewPlacedStudents(selectedRole, url)} disabled={modalLoading} />
                 </DialogContent>
                 <DialogActions>
                     <Button onClick={handleCloseModal}>Close</Button>
@@ -727,6 +734,7 @@ const JobPredictor: React.FC = () => {
                             <Typography color="text.secondary">No prediction history found.</Typography>
                         </Box>
                     )}
+                    <PageNav page={historyCursors} onNavigate={handleOpenHistory} disabled={historyLoading} />
                 </DialogContent>
                 <DialogActions>
                     <Button onClick={() => setOpenHistoryModal(false)}>Close</Button>